@@ -10,13 +10,17 @@ This script helps you get started with the Simply Plural CLI by:
 
 import sys
 import subprocess
+from importlib.util import find_spec
 from pathlib import Path
 
+# Import names of the packages in requirements.txt
+REQUIRED_MODULES = ("requests", "websockets")
+
 def run_command(cmd, description):
-    """Run a command and report results"""
+    """Run a command (argv list, no shell) and report results"""
     print(f"-> {description}...")
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
+        result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode == 0:
             print(f"  [OK] Success")
             return True
@@ -48,7 +52,11 @@ def main():
     
     # 2. Install dependencies
     print("\n2. Installing dependencies...")
-    if run_command("python -m pip install -r requirements.txt", "Installing dependencies from requirements.txt"):
+    if all(find_spec(name) is not None for name in REQUIRED_MODULES):
+        print("  [OK] Dependencies already installed")
+    elif run_command([sys.executable, "-m", "pip", "install",
+                      "--disable-pip-version-check", "--no-input", "--quiet",
+                      "-r", "requirements.txt"], "Installing dependencies from requirements.txt"):
         print("  [OK] Dependencies installed")
     else:
         print("  [WARN] Failed to install dependencies. Try manually:")
@@ -57,7 +65,7 @@ def main():
     
     # 3. Test basic functionality
     print("\n3. Testing CLI...")
-    if run_command("python sp.py --help", "Testing CLI help"):
+    if run_command([sys.executable, "sp.py", "--help"], "Testing CLI help"):
         print("  [OK] CLI is working")
     else:
         print("  [FAIL] CLI test failed")
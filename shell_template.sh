@@ -1,53 +1,62 @@
 # Simply Plural shell integration
 # Add this to your ~/.bashrc or ~/.zshrc
+# Generated by `sp shell generate`: run it again after changing
+# shell_update_interval, or with --profile to follow a different profile
 
+# Seconds the status file is shown as-is before it's refreshed in the background
+SP_REFRESH_INTERVAL=${SP_REFRESH_INTERVAL:-@SHELL_UPDATE_INTERVAL@}
+_SP_PROFILE=@PROFILE@
+_SP_STATUS_FILE="$HOME/.cache/"@STATUS_FILE_NAME@  # One per profile
+_SP_LAST_CHECK=0
+
+# zsh only provides $EPOCHSECONDS through this module
+[[ -n $ZSH_VERSION ]] && zmodload zsh/datetime 2>/dev/null
+
+# Load the status line ("[Member] ") into $SP_STATUS. `read` is a shell
+# builtin, so this costs no fork (~1ms less than cat in a subshell)
+_sp_read_status() {
+    SP_STATUS=""
+    IFS= read -r SP_STATUS 2>/dev/null < "$_SP_STATUS_FILE" || :
+}
+
+# Prompt hook: refresh $SP_STATUS, and at most once per interval check in
+# the background whether the status file needs updating. $EPOCHSECONDS
+# (bash 5+, zsh) keeps the common case free of forks; sp only runs when
+# the file is actually stale
+_sp_precmd() {
+    _sp_read_status
+    local now=${EPOCHSECONDS:-$(date +%s)}
+    if (( now - _SP_LAST_CHECK >= SP_REFRESH_INTERVAL )); then
+        _SP_LAST_CHECK=$now
+        (_sp_background_check >/dev/null 2>&1 & disown)
+    fi
+}
+
+# Print the status line (for use as $(_sp_prompt) inside a prompt string)
 _sp_prompt() {
-    local status_file="$HOME/.cache/sp_status"
-    
-    # Always show current content (fast - ~1ms)
-    cat "$status_file" 2>/dev/null || echo ""
-    
-    # Background check if refresh needed (slow stuff in background, no job control spam)
-    (_sp_background_check >/dev/null 2>&1 & disown)
+    _sp_precmd
+    printf '%s' "$SP_STATUS"
 }
 
 _sp_background_check() {
-    local lock_file="$HOME/.cache/sp_refresh.lock"
-    local status_file="$HOME/.cache/sp_status"
-    local cache_ttl=300      # 5 minutes
-    
-    # Quick mutex check - only one background worker at a time
-    if [[ -f "$lock_file" ]]; then
-        local lock_age=$(($(date +%s) - $(stat -c %Y "$lock_file" 2>/dev/null || echo 0)))
-        if [[ $lock_age -lt 120 ]]; then
-            return  # Another check is running
-        fi
-    fi
-    
-    # Check if we need to refresh
-    if [[ -f "$status_file" ]]; then
-        local file_age=$(($(date +%s) - $(stat -c %Y "$status_file" 2>/dev/null || echo 0)))
-        if [[ $file_age -lt $cache_ttl ]]; then
-            return  # Cache is still fresh
-        fi
+    local mtime
+    # GNU stat, then BSD/macOS stat; a missing file counts as stale
+    mtime=$(stat -c %Y "$_SP_STATUS_FILE" 2>/dev/null ||
+            stat -f %m "$_SP_STATUS_FILE" 2>/dev/null) || mtime=0
+    if (( $(date +%s) - mtime < SP_REFRESH_INTERVAL )); then
+        return  # Still fresh (another shell may have just updated it)
     fi
-    
-    # Do the slow work - update cache and status file
-    # Note: Using --profile=default - change this if you want shell integration to use a different profile
-    touch "$lock_file"
-    sp --profile=default _internal_update_status >/dev/null 2>&1 || true
-    rm -f "$lock_file" 2>/dev/null || true
-}
 
-# Initial cache population (run once on shell startup)
-_sp_background_check
+    # sp serialises its own API refreshes, so no lock is needed here
+    sp --profile="$_SP_PROFILE" _internal_update_status >/dev/null 2>&1 || true
+}
 
-# Hook into prompt (uncomment the one for your shell)
+# Hook into prompt (uncomment the lines for your shell)
 # For Bash:
-# PS1="$(_sp_prompt)$PS1"
-
-# For Zsh:  
-# PROMPT="$(_sp_prompt)$PROMPT"
+# PROMPT_COMMAND="_sp_precmd${PROMPT_COMMAND:+; $PROMPT_COMMAND}"
+# PS1='${SP_STATUS}'"$PS1"
 
-# Alternative: If you have existing PROMPT_COMMAND setup
-# PROMPT_COMMAND="_sp_prompt; $PROMPT_COMMAND"
+# For Zsh:
+# setopt PROMPT_SUBST
+# precmd_functions+=(_sp_precmd)
+# PROMPT='${SP_STATUS}'"$PROMPT"
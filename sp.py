@@ -6,5 +6,5 @@ from pathlib import Path
 # Add src/ to path for running without installing
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from simplyplural.cli import main
+from simplyplural.launcher import main
 sys.exit(main())
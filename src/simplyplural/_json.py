@@ -0,0 +1,39 @@
+"""
+JSON helpers for Simply Plural CLI
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Both paths take/return the same types so callers never need to
+care which backend is active:
+
+- dumps() always returns UTF-8 encoded bytes
+- loads() accepts bytes or str
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this regardless of backend
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes (2-space indented if indent is True)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
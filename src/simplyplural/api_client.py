@@ -9,16 +9,85 @@ Handles all communication with the Simply Plural API, including:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import hashlib
+import heapq
 import time
-import json
+import random
+import re
+import secrets
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
+from . import _json
+from .exceptions import APIError
 
-class APIError(Exception):
-    """Exception raised for API-related errors"""
-    pass
+
+# Max individual members kept in SimplyPluralAPI's in-process lookup memo
+MEMBER_MEMO_SIZE = 512
+
+# Upper bound on API requests run side by side: fronter name lookups, and
+# the session PATCH/POSTs of a switch (the connection pool holds 16)
+CONCURRENT_REQUESTS = 8
+
+# How long (seconds) register_switch may reuse the /fronters response from a
+# preceding get_fronters() instead of fetching it again
+RECENT_FRONTERS_TTL = 2.0
+
+# Upper bound on entries returned by get_switches()
+MAX_SWITCH_HISTORY = 1000
+
+# Responses that mean "try again later": retried like connection failures,
+# waiting as long as the server's Retry-After header asks
+RETRY_STATUSES = frozenset({429, 503})
+
+# Headers that should never be logged (lowercase)
+_SENSITIVE_HEADERS = frozenset({'authorization', 'x-api-key', 'x-auth-token', 'bearer'})
+# JSON keys whose values are redacted from debug output (matched anywhere in the key)
+_SENSITIVE_KEY_RE = re.compile(r'token|auth|password|secret', re.IGNORECASE)
+
+# Base64-like runs that look like tokens (44+ chars), replaced in debug output
+_TOKEN_RE = re.compile(r'[A-Za-z0-9+/]{44,}={0,2}')
+# The rest of such a run from a given position
+_TOKEN_TAIL_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+
+def _name_index(members: List[Dict[str, Any]],
+                custom_fronts: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, str]]]:
+    """Lowercased name -> every member/custom front with that name ({'id', 'type', 'name'}), members first"""
+    index = {}
+    for entities, entity_type in ((members, 'member'), (custom_fronts, 'custom_front')):
+        for entity in entities:
+            name = entity['content']['name']
+            index.setdefault(name.lower(), []).append(
+                {'id': entity['id'], 'type': entity_type, 'name': name})
+    return index
+
+
+def _map_concurrently(fn, items: List[Any]) -> List[Any]:
+    """[fn(item) for item in items], with the calls spread over a thread pool when there are several"""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(len(items), CONCURRENT_REQUESTS)) as pool:
+        return list(pool.map(fn, items))
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date), None if unusable"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class SimplyPluralAPI:
@@ -35,8 +104,28 @@ class SimplyPluralAPI:
         # Get timeout and retry settings from config
         self.timeout = config_manager.api_timeout if config_manager else 10
         self.max_retries = config_manager.max_retries if config_manager else 3
+        self.retry_base_delay = float(config_manager.retry_base_delay) if config_manager else 1.0
+        self.retry_max_delay = float(config_manager.retry_max_delay) if config_manager else 30.0
+        
+        # Per-process memo of individual member lookups, as
+        # (time.monotonic(), member), for clients without a cache manager.
+        # With one, its memory layer does this job and, unlike the memo,
+        # sees invalidate_member(). Bounded, oldest evicted first, and
+        # entries expire on the member cache TTL
+        self._member_memo: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._member_memo_ttl = config_manager.cache_members_ttl if config_manager else 3600
+        self._system_id: Optional[str] = None
+        # Last raw /fronters response, as (time.monotonic(), response)
+        self._last_fronters: Optional[tuple] = None
         
         self.session = requests.Session()
+        # Keep-alive pool sized for the concurrent lookups (fronter and history names).
+        # Every request goes to the one API host, so one host pool is enough;
+        # pool_block makes extra workers wait for a connection rather than
+        # opening throwaway ones. Retries stay in _request(), so the adapter
+        # itself doesn't retry.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16, pool_block=True)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'Authorization': api_token,
             'User-Agent': 'SimplyPlural-CLI/1.0',
@@ -45,12 +134,9 @@ class SimplyPluralAPI:
     
     def _filter_sensitive_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
         """Filter out any potentially sensitive headers from debug output"""
-        # Headers that should never be logged (case-insensitive)
-        sensitive_headers = {'authorization', 'x-api-key', 'x-auth-token', 'bearer'}
-        
         filtered = {}
         for key, value in headers.items():
-            if key.lower() in sensitive_headers:
+            if key.lower() in _SENSITIVE_HEADERS:
                 filtered[key] = "[REDACTED]"
             else:
                 filtered[key] = value
@@ -61,7 +147,7 @@ class SimplyPluralAPI:
         if isinstance(data, dict):
             sanitized = {}
             for key, value in data.items():
-                if any(sensitive in key.lower() for sensitive in ['token', 'auth', 'password', 'secret']):
+                if _SENSITIVE_KEY_RE.search(key):
                     sanitized[key] = "[REDACTED]"
                 else:
                     sanitized[key] = self._sanitize_debug_data(value)
@@ -71,13 +157,14 @@ class SimplyPluralAPI:
         else:
             return data
     
-    def _sanitize_debug_text(self, text: str) -> str:
-        """Remove tokens from debug text output"""
-        # Simple pattern to catch base64-like tokens (44+ chars of base64)
-        import re
-        # Replace what looks like long base64 tokens with [REDACTED]
-        sanitized = re.sub(r'[A-Za-z0-9+/]{44,}={0,2}', '[REDACTED_TOKEN]', text)
-        return sanitized
+    def _sanitize_debug_text(self, text: str, limit: Optional[int] = None) -> str:
+        """Remove tokens from debug text output, keeping only the first `limit` characters if given"""
+        if limit is not None and len(text) > limit:
+            # Only scan what will be shown, but never cut a token in half:
+            # its visible part could be too short to be recognised
+            end = _TOKEN_TAIL_RE.match(text, limit).end()
+            return _TOKEN_RE.sub('[REDACTED_TOKEN]', text[:end])[:limit] + '...'
+        return _TOKEN_RE.sub('[REDACTED_TOKEN]', text)
     
     def _generate_fallback_name(self, member_id: str, fronter: Dict[str, Any]) -> str:
         """Generate a more useful fallback name when member details aren't available"""
@@ -101,17 +188,39 @@ class SimplyPluralAPI:
         else:
             return short_id
     
-    def _request(self, method: str, endpoint: str, **kwargs) -> Dict[Any, Any]:
-        """Make an API request with retries"""
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Seconds to wait before retrying after failed attempt number `attempt`
+        
+        Full jitter: a random point below the exponential backoff step, capped
+        at retry_max_delay, so clients that failed together don't all retry
+        at the same moment.
+        """
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+    
+    def _request(self, method: str, endpoint: str, revalidate: bool = False, **kwargs) -> Dict[Any, Any]:
+        """
+        Make an API request with retries
+        
+        With revalidate, the last response body for this GET is kept with its
+        ETag (if the API sent one), and later requests send If-None-Match so
+        an unchanged body comes back as a bodiless 304.
+        """
         
         url = f"{self.BASE_URL}{endpoint}"
         # Use configured timeout, allow override via kwargs
         timeout = kwargs.pop('timeout', self.timeout)
         
+        stored = None
+        if revalidate and self.cache:
+            stored = self.cache.get_etag_response(endpoint)
+            if stored:
+                kwargs['headers'] = {**kwargs.get('headers', {}), 'If-None-Match': stored[0]}
+        
         if self.debug:
             print(f"DEBUG: {method} {url}")
             if 'json' in kwargs:
-                print(f"DEBUG: Request body: {json.dumps(kwargs['json'], indent=2)}")
+                print(f"DEBUG: Request body: {_json.dumps(kwargs['json']).decode()}")
             if 'params' in kwargs:
                 print(f"DEBUG: Query params: {kwargs['params']}")
         
@@ -128,17 +237,29 @@ class SimplyPluralAPI:
                     safe_headers = self._filter_sensitive_headers(dict(response.headers))
                     print(f"DEBUG: Response headers: {safe_headers}")
                     # Sanitize response text to prevent token leaks
-                    sanitized_response = self._sanitize_debug_text(response.text)
-                    print(f"DEBUG: Response text: {sanitized_response[:500]}{'...' if len(sanitized_response) > 500 else ''}")
+                    print(f"DEBUG: Response text: {self._sanitize_debug_text(response.text, limit=500)}")
                 
-                # Handle rate limiting
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', 60))
+                # Handle rate limiting / temporary unavailability
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+                    if retry_after is None:
+                        delay = self._backoff_delay(attempt)
+                    elif retry_after <= self.retry_max_delay:
+                        delay = retry_after + random.uniform(0, self.retry_base_delay)
+                    else:
+                        delay = None  # Longer than we're willing to wait
                     if self.debug:
-                        print(f"DEBUG: Server returned HTTP 429 - actual rate limit from API")
-                    raise APIError(f"Rate limited (server). Retry after {retry_after} seconds.")
+                        print(f"DEBUG: Server returned HTTP {response.status_code} (Retry-After: {retry_after})")
+                    if delay is not None and attempt < self.max_retries - 1:
+                        time.sleep(delay)
+                        continue
+                    if response.status_code == 429:
+                        wait = f" Retry after {int(retry_after)} seconds." if retry_after is not None else ""
+                        raise APIError(f"Rate limited (server).{wait}")
                 
                 # Handle other HTTP errors
+                if response.status_code in (401, 403):
+                    self._forget_system_id()
                 if response.status_code == 401:
                     raise APIError("HTTP 401 - Bad Request. Check if your token has the correct permissions (in particular, write permissions are needed to update fronters). If you are sure your token is not the problem, open a bug report at https://github.com/SiteRelEnby/simplyplural-cli/issues")
                 elif response.status_code == 403:
@@ -160,22 +281,28 @@ class SimplyPluralAPI:
                         print(f"DEBUG: HTTP {response.status_code} error: {sanitized_error}")
                     raise APIError(error_msg)
                 
-                # Parse JSON response
+                if response.status_code == 304 and stored:
+                    if self.debug:
+                        print(f"DEBUG: Not modified, reusing stored response for {endpoint}")
+                    return stored[1]
+                
+                # Parse JSON response straight from the bytes (skips requests'
+                # charset detection; orjson when installed)
+                body = response.content
                 try:
                     # Handle empty successful responses (like PATCH updates)
-                    if response.status_code == 200 and not response.text.strip():
+                    if response.status_code == 204 or (response.status_code == 200 and not body.strip()):
                         return {}
                         
-                    result = response.json()
+                    result = _json.loads(body)
                     if self.debug:
-                        print(f"DEBUG: Parsed JSON: {json.dumps(self._sanitize_debug_data(result), indent=2) if result else 'None'}")
+                        print(f"DEBUG: Parsed JSON: {_json.dumps(self._sanitize_debug_data(result)).decode() if result else 'None'}")
+                    if revalidate and self.cache:
+                        etag = response.headers.get('ETag')
+                        if etag:
+                            self.cache.set_etag_response(endpoint, etag, result, body)
                     return result
-                except json.JSONDecodeError:
-                    if response.status_code == 204:  # No Content
-                        return {}
-                    # For successful responses with empty content, return empty dict
-                    if response.status_code == 200 and not response.text.strip():
-                        return {}
+                except _json.JSONDecodeError:
                     raise APIError("Invalid JSON response from API")
                     
             except (requests.Timeout, requests.ConnectionError, requests.RequestException) as e:
@@ -183,8 +310,7 @@ class SimplyPluralAPI:
                 if attempt < self.max_retries - 1:
                     if self.debug:
                         print(f"DEBUG: Request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
-                    # Exponential backoff for retries
-                    time.sleep(2 ** attempt)
+                    time.sleep(self._backoff_delay(attempt))
                     continue
                 else:
                     # Final attempt failed
@@ -198,50 +324,118 @@ class SimplyPluralAPI:
         # This shouldn't be reached, but just in case
         raise APIError(f"Request failed after {self.max_retries} attempts: {last_exception}")
     
-    def get_fronters(self) -> Dict[str, Any]:
-        """Get current fronters with resolved member/custom front names"""
+    def get_fronters(self, members: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Get current fronters with resolved member/custom front names
+        
+        members is the full member list, for callers that just fetched it;
+        names are then resolved from it instead of downloading it again.
+        """
         fronters_response = self._request('GET', '/fronters')
+        self._last_fronters = (time.monotonic(), fronters_response)
         
         # If it's a list of fronter objects, try to resolve names
-        if isinstance(fronters_response, list):
-            resolved_fronters = []
-            for fronter in fronters_response:
-                if 'content' in fronter and 'member' in fronter['content']:
-                    entity_id = fronter['content']['member']
-                    is_custom = fronter['content'].get('custom', False)
-                    
-                    try:
-                        if is_custom:
-                            # It's a custom front
-                            custom_front = self.get_custom_front(entity_id)
-                            fronter_with_name = fronter.copy()
-                            fronter_with_name['name'] = custom_front.get('content', {}).get('name', self._generate_fallback_name(entity_id, fronter))
-                            fronter_with_name['type'] = 'custom_front'
-                        else:
-                            # It's a regular member
-                            member = self.get_member(entity_id)
-                            fronter_with_name = fronter.copy()
-                            fronter_with_name['name'] = member.get('content', {}).get('name', self._generate_fallback_name(entity_id, fronter))
-                            fronter_with_name['type'] = 'member'
-                        
-                        resolved_fronters.append(fronter_with_name)
-                    except APIError:
-                        # If we can't get details, use ID as fallback
-                        fronter_with_name = fronter.copy()
-                        fronter_with_name['name'] = self._generate_fallback_name(entity_id, fronter)
-                        fronter_with_name['type'] = 'custom_front' if is_custom else 'member'
-                        resolved_fronters.append(fronter_with_name)
+        if not isinstance(fronters_response, list):
+            return fronters_response
+        
+        known = self._prefetch_entities(fronters_response, members)
+        pending = sum(1 for fronter in fronters_response
+                      if fronter.get('content', {}).get('member') not in known)
+        
+        def resolve(fronter):
+            return self._resolve_fronter(fronter, known)
+        
+        if pending <= 1:
+            return [resolve(fronter) for fronter in fronters_response]
+        
+        # Independent GETs: run them side by side on the session's connection
+        # pool (map keeps the input order). Resolve the system ID first so the
+        # workers don't all race to fetch it.
+        try:
+            self.get_system_id()
+        except APIError:
+            pass  # Each lookup fails the same way and falls back to the ID
+        workers = min(pending, CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(resolve, fronters_response))
+    
+    def _prefetch_entities(self, fronters: List[Dict[str, Any]],
+                           members: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Members and custom fronts referenced by fronters, by ID, from the full lists
+        
+        A members list passed in and cached lists are always used. Otherwise
+        a list is only fetched when it replaces two or more single lookups:
+        for one fronter, one lookup is cheaper than downloading every member.
+        """
+        wanted = {False: set(), True: set()}
+        for fronter in fronters:
+            content = fronter.get('content', {})
+            if 'member' in content:
+                wanted[bool(content.get('custom', False))].add(content['member'])
+        
+        known = {}
+        for is_custom, ids in wanted.items():
+            if not ids:
+                continue
+            entities = None if is_custom else members
+            if entities is None and self.cache:
+                entities = self.cache.get_custom_fronts() if is_custom else self.cache.get_members()
+            if entities is None and len(ids) > 1:
+                try:
+                    if is_custom:
+                        entities = self.get_custom_fronts()  # Caches the list itself
+                    else:
+                        entities = self.get_members()
+                        if self.cache:
+                            self.cache.set_members(entities)
+                except APIError as e:
+                    if self.debug:
+                        print(f"DEBUG: Bulk lookup failed, resolving fronters one by one: {e}")
+            for entity in entities or ():
+                entity_id = entity.get('id') or entity.get('_id')
+                if entity_id in ids:
+                    known[entity_id] = entity
+        return known
+    
+    def _resolve_fronter(self, fronter: Dict[str, Any],
+                         known: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Copy of a /fronters entry with 'name' and 'type' filled in"""
+        if 'content' not in fronter or 'member' not in fronter['content']:
+            return fronter
+        
+        entity_id = fronter['content']['member']
+        is_custom = fronter['content'].get('custom', False)
+        
+        try:
+            entity = known.get(entity_id) if known else None
+            if entity is None:
+                if is_custom:
+                    entity = self.get_custom_front(entity_id)
                 else:
-                    resolved_fronters.append(fronter)
-            return resolved_fronters
+                    entity = self.get_member(entity_id)
+            name = entity.get('content', {}).get('name', self._generate_fallback_name(entity_id, fronter))
+        except APIError:
+            # If we can't get details, use ID as fallback
+            name = self._generate_fallback_name(entity_id, fronter)
         
-        return fronters_response
+        fronter_with_name = fronter.copy()
+        fronter_with_name['name'] = name
+        fronter_with_name['type'] = 'custom_front' if is_custom else 'member'
+        return fronter_with_name
     
     def get_system_id(self) -> str:
         """Get the system ID from /me endpoint"""
         # Check if we have it cached
-        if hasattr(self, '_system_id') and self._system_id:
+        if self._system_id:
             return self._system_id
+        
+        # A fresh process would otherwise pay a /me round trip before its
+        # first real request; the ID is cached on disk per token
+        if self.cache:
+            self._system_id = self.cache.get_system_id(self._token_id())
+            if self._system_id:
+                return self._system_id
             
         try:
             response = self._request('GET', '/me')
@@ -270,6 +464,8 @@ class SimplyPluralAPI:
             
             # Cache it
             self._system_id = system_id
+            if self.cache:
+                self.cache.set_system_id(self._token_id(), system_id)
             if self.debug:
                 print(f"DEBUG: Found system ID: {system_id}")
                 
@@ -280,6 +476,16 @@ class SimplyPluralAPI:
                 print(f"DEBUG: Failed to get system ID from /me: {e}")
             raise APIError(f"Could not get system ID: {e}")
     
+    def _token_id(self) -> str:
+        """Fingerprint of the API token, so cached data can be tied to it without storing it"""
+        return hashlib.sha256(self.api_token.encode('utf-8')).hexdigest()[:16]
+    
+    def _forget_system_id(self):
+        """Drop the system ID cached for this token (it was rejected, maybe replaced)"""
+        self._system_id = None
+        if self.cache:
+            self.cache.invalidate_system_id()
+    
     def get_members(self) -> List[Dict[str, Any]]:
         """Get all members using the correct /members/{system_id} format"""
         try:
@@ -292,7 +498,7 @@ class SimplyPluralAPI:
             if self.debug:
                 print(f"DEBUG: Trying members endpoint {endpoint}")
                 
-            response = self._request('GET', endpoint)
+            response = self._request('GET', endpoint, revalidate=True)
             
             # Handle different response formats
             if isinstance(response, list):
@@ -352,13 +558,20 @@ class SimplyPluralAPI:
     
     def get_member(self, member_id: str) -> Dict[str, Any]:
         """Get a specific member with caching using the correct /member/{system_id}/{member_id} format"""
-        # Check cache first
+        # Check cache first; it's authoritative when present, so members
+        # it has invalidated are fetched again
         if self.cache:
             cached_member = self.cache.get_member(member_id)
             if cached_member:
                 if self.debug:
                     print(f"DEBUG: Using cached member {member_id}: {cached_member.get('content', {}).get('name', 'Unknown')}")
                 return cached_member
+        else:
+            memo = self._member_memo.get(member_id)
+            if memo is not None:
+                if time.monotonic() - memo[0] <= self._member_memo_ttl:
+                    return memo[1]
+                self._member_memo.pop(member_id, None)
         
         if self.debug:
             print(f"DEBUG: Cache miss for member {member_id}, fetching from API")
@@ -373,13 +586,15 @@ class SimplyPluralAPI:
             if self.debug:
                 print(f"DEBUG: Trying to get member {member_id} from {endpoint}")
                 
-            member_data = self._request('GET', endpoint)
+            member_data = self._request('GET', endpoint, revalidate=True)
             
             # Cache the result
             if self.cache:
                 self.cache.set_member(member_id, member_data)
                 if self.debug:
                     print(f"DEBUG: Cached member {member_id}: {member_data.get('content', {}).get('name', 'Unknown')}")
+            else:
+                self._remember_member(member_id, member_data)
             
             return member_data
             
@@ -388,6 +603,15 @@ class SimplyPluralAPI:
                 print(f"DEBUG: Failed to get member {member_id}: {e}")
             raise APIError(f"Could not fetch member {member_id}: {e}")
     
+    def _remember_member(self, member_id: str, member_data: Dict[str, Any]):
+        """Add a member to the lookup memo, evicting the oldest entry when full"""
+        self._member_memo[member_id] = (time.monotonic(), member_data)
+        if len(self._member_memo) > MEMBER_MEMO_SIZE:
+            try:
+                self._member_memo.popitem(last=False)
+            except KeyError:
+                pass
+    
     def get_custom_fronts(self) -> List[Dict[str, Any]]:
         """Get all custom fronts for this system"""
         # Try cache first
@@ -403,7 +627,7 @@ class SimplyPluralAPI:
             if self.debug:
                 print(f"DEBUG: Fetching custom fronts for system {system_id}")
             
-            response = self._request('GET', f'/customFronts/{system_id}')
+            response = self._request('GET', f'/customFronts/{system_id}', revalidate=True)
             
             # Return the list of custom fronts
             custom_fronts = response if isinstance(response, list) else []
@@ -434,7 +658,7 @@ class SimplyPluralAPI:
             if self.debug:
                 print(f"DEBUG: Fetching custom front {custom_front_id} for system {system_id}")
             
-            response = self._request('GET', f'/customFront/{system_id}/{custom_front_id}')
+            response = self._request('GET', f'/customFront/{system_id}/{custom_front_id}', revalidate=True)
             
             if 'content' in response:
                 # Cache the result
@@ -452,76 +676,76 @@ class SimplyPluralAPI:
     def register_switch(self, names: List[str], note: Optional[str] = None) -> Dict[str, Any]:
         """Register a switch to one or more members or custom fronts using the frontHistory API"""
         
+        # Pick up member edits made elsewhere (e.g. renames in the app) on the
+        # fronter refresh that follows a switch
+        self._member_memo.clear()
+        
         # Get both members and custom fronts
         members = self.get_members()
         custom_fronts = self.get_custom_fronts()
         
-        # Create maps for name lookup
-        member_map = {m['content']['name'].lower(): {'id': m['id'], 'type': 'member'} for m in members}
-        custom_front_map = {cf['content']['name'].lower(): {'id': cf['id'], 'type': 'custom_front'} for cf in custom_fronts}
-        
-        # Combine both maps for unified lookup
-        entity_map = {**member_map, **custom_front_map}
+        name_index = _name_index(members, custom_fronts)
         
         entities = []
         for name in names:
-            entity = entity_map.get(name.lower())
+            # A custom front wins over a member with the same name
+            exact = name_index.get(name.lower())
+            entity = exact[-1] if exact else None
             if not entity:
-                # Try partial matching in both members and custom fronts
-                member_matches = [m for m in members if name.lower() in m['content']['name'].lower()]
-                custom_front_matches = [cf for cf in custom_fronts if name.lower() in cf['content']['name'].lower()]
-                
-                all_matches = [
-                    {'entity': m, 'type': 'member'} for m in member_matches
-                ] + [
-                    {'entity': cf, 'type': 'custom_front'} for cf in custom_front_matches
-                ]
+                # Try partial matching in both members and custom fronts,
+                # against the names the index already lowercased
+                wanted = name.lower()
+                all_matches = [match for lowered, matches in name_index.items()
+                               if wanted in lowered for match in matches]
                 
                 if len(all_matches) == 1:
-                    match = all_matches[0]
-                    entity = {'id': match['entity']['id'], 'type': match['type']}
+                    entity = all_matches[0]
                 elif len(all_matches) > 1:
-                    names_list = [f"{match['entity']['content']['name']} ({match['type']})" for match in all_matches]
+                    names_list = [f"{match['name']} ({match['type']})" for match in all_matches]
                     raise APIError(f"Ambiguous name '{name}'. Matches: {', '.join(names_list)}")
                 else:
-                    available_members = [m['content']['name'] for m in members]
-                    available_custom_fronts = [cf['content']['name'] for cf in custom_fronts]
-                    all_available = [f"{name} (member)" for name in available_members] + [f"{name} (custom_front)" for name in available_custom_fronts]
+                    all_available = [f"{entry['name']} ({entry['type']})"
+                                     for matches in name_index.values() for entry in matches]
                     raise APIError(f"Name '{name}' not found. Available: {', '.join(all_available)}")
             entities.append(entity)
         
-        # Step 1: End all current live fronting sessions
-        current_fronters = self._request('GET', '/fronters')
+        # Step 1: End all current live fronting sessions. `switch --co` has
+        # usually just fetched the fronters, so reuse that response
+        if self._last_fronters and time.monotonic() - self._last_fronters[0] < RECENT_FRONTERS_TTL:
+            current_fronters = self._last_fronters[1]
+        else:
+            current_fronters = self._request('GET', '/fronters')
+        self._last_fronters = None  # About to change
         current_time_ms = int(time.time() * 1000)
         
         if self.debug:
             print(f"DEBUG: Found {len(current_fronters)} current fronters to end")
         
-        for fronter in current_fronters:
-            if fronter.get('content', {}).get('live', False):
-                front_id = fronter['id']
+        def end_session(front_id):
+            if self.debug:
+                print(f"DEBUG: Ending front session {front_id}")
+            
+            end_data = {
+                'live': False,
+                'endTime': current_time_ms
+            }
+            
+            try:
+                self._request('PATCH', f'/frontHistory/{front_id}', json=end_data)
+            except APIError as e:
                 if self.debug:
-                    print(f"DEBUG: Ending front session {front_id}")
-                
-                end_data = {
-                    'live': False,
-                    'endTime': current_time_ms
-                }
-                
-                try:
-                    self._request('PATCH', f'/frontHistory/{front_id}', json=end_data)
-                except APIError as e:
-                    if self.debug:
-                        print(f"DEBUG: Warning - failed to end front session {front_id}: {e}")
-                    # Continue anyway - maybe it was already ended
+                    print(f"DEBUG: Warning - failed to end front session {front_id}: {e}")
+                # Continue anyway - maybe it was already ended
         
-        # Step 2: Create new front sessions for the requested entities (members or custom fronts)
-        import random
-        results = []
+        live_ids = [fronter['id'] for fronter in current_fronters
+                    if fronter.get('content', {}).get('live', False)]
+        _map_concurrently(end_session, live_ids)
         
-        for entity in entities:
+        # Step 2: Create new front sessions for the requested entities (members or custom fronts),
+        # once every old session has ended
+        def start_session(entity):
             # Generate a new ObjectId-style string (24 hex characters)
-            new_front_id = ''.join(random.choices('0123456789abcdef', k=24))
+            new_front_id = secrets.token_hex(12)
             
             start_data = {
                 'member': entity['id'],
@@ -537,14 +761,17 @@ class SimplyPluralAPI:
                 entity_type = 'custom front' if entity['type'] == 'custom_front' else 'member'
                 print(f"DEBUG: Creating front session {new_front_id} for {entity_type} {entity['id']}")
                 
-            result = self._request('POST', f'/frontHistory/{new_front_id}', json=start_data)
-            results.append(result)
+            return self._request('POST', f'/frontHistory/{new_front_id}', json=start_data)
+        
+        results = _map_concurrently(start_session, entities)
         
         return results[0] if len(results) == 1 else results
     
     def get_switches(self, period: str = "recent", count: int = 10) -> List[Dict[str, Any]]:
         """Get switch history using the correct frontHistory endpoint with required time parameters"""
         try:
+            count = min(count, MAX_SWITCH_HISTORY)
+
             # Get system ID first
             system_id = self.get_system_id()
             
@@ -552,9 +779,10 @@ class SimplyPluralAPI:
             current_time_ms = int(time.time() * 1000)
             
             if period == "today":
-                # Start of today
-                today = time.gmtime(time.time())
-                start_of_day = time.mktime((today.tm_year, today.tm_mon, today.tm_mday, 0, 0, 0, 0, 0, 0))
+                # Local midnight, matching the local times history is shown in
+                # (isdst=-1 lets mktime work out whether DST applied then)
+                today = time.localtime(current_time_ms / 1000)
+                start_of_day = time.mktime((today.tm_year, today.tm_mon, today.tm_mday, 0, 0, 0, 0, 0, -1))
                 start_time_ms = int(start_of_day * 1000)
             elif period == "week":
                 # Start of this week (7 days ago)
@@ -578,11 +806,10 @@ class SimplyPluralAPI:
             
             # Handle the response - it should be a list of front history entries
             if isinstance(response, list):
-                # Sort by timestamp (most recent first) and limit count
-                sorted_entries = sorted(response, 
-                                       key=lambda x: x.get('content', {}).get('startTime', 0), 
-                                       reverse=True)
-                return sorted_entries[:count]
+                # Most recent `count` entries, newest first, without sorting
+                # the whole range
+                return heapq.nlargest(count, response,
+                                      key=lambda x: x.get('content', {}).get('startTime', 0))
             else:
                 if self.debug:
                     print(f"DEBUG: Unexpected frontHistory response format: {type(response)}")
@@ -595,22 +822,38 @@ class SimplyPluralAPI:
     
     def export_data(self) -> Dict[str, Any]:
         """Export all user data"""
-        data = {}
-        
+        # Resolve the system ID first so the fetches below don't all race to
+        # fetch it
         try:
-            data['members'] = self.get_members()
+            self.get_system_id()
         except APIError:
-            data['members'] = []
+            pass  # Each fetch fails the same way and falls back on its own
         
+        # Members first: fronter names are resolved from the list, which
+        # would otherwise be downloaded a second time alongside this one
+        members = None
         try:
-            data['fronters'] = self.get_fronters()
+            members = self.get_members()
+            if self.cache:
+                self.cache.set_members(members)
         except APIError:
-            data['fronters'] = {}
+            pass
         
-        try:
-            data['switches'] = self.get_switches(count=1000)
-        except APIError:
-            data['switches'] = []
+        # The rest are independent: run them side by side, each falling back
+        # to an empty value on its own
+        fetches = {
+            'fronters': (lambda: self.get_fronters(members=members), {}),
+            'switches': (lambda: self.get_switches(count=MAX_SWITCH_HISTORY), []),
+        }
+        
+        data = {'members': members if members is not None else []}
+        with ThreadPoolExecutor(max_workers=len(fetches)) as pool:
+            futures = {key: pool.submit(fetch) for key, (fetch, _) in fetches.items()}
+            for key, future in futures.items():
+                try:
+                    data[key] = future.result()
+                except APIError:
+                    data[key] = fetches[key][1]
         
         data['exported_at'] = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
         return data
@@ -5,43 +5,190 @@ Handles local caching of API responses to improve performance and reduce API cal
 Uses both memory and file-based caching with configurable TTL.
 """
 
-import json
+import atexit
+import hashlib
+import threading
 import time
 import tempfile
 import os
+import queue
+import shutil
+import weakref
+from collections import Counter, OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
+from . import _json
+
+# Managers with file writes waiting for the background writer
+_write_queue: 'queue.Queue[CacheManager]' = queue.Queue()
+_writer_lock = threading.Lock()
+_writer_thread: Optional[threading.Thread] = None
+# Every live manager, so pending writes are flushed at exit and locks can
+# be made safe across os.fork()
+_managers: 'weakref.WeakSet[CacheManager]' = weakref.WeakSet()
+
+
+# Parsed cache files remembered per CacheManager (see _load_from_file)
+FILE_ENTRY_MEMO_SIZE = 32
+
+# Cache file paths remembered per CacheManager before the table is reset
+PATH_CACHE_SIZE = 1024
+
+# Default bound on the in-memory cache (least recently used entries go first)
+MEMORY_MAX_ENTRIES = 512
+
+# How long a lookup that found nothing is remembered, so repeated misses
+# (e.g. an unknown member ID) don't go to disk each time
+MISS_TTL = 30
+
+# Memory cache data marking a remembered miss
+_MISS = object()
+
+# A system's ID never changes; it's only dropped when the token is rejected
+SYSTEM_ID_TTL = 30 * 24 * 3600
+
+# API responses kept for If-None-Match revalidation; a 304 reuses them
+ETAG_TTL = 7 * 24 * 3600
+
 
 @dataclass
 class CacheEntry:
     """Represents a cached item with metadata"""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10. Fine here
+    # since no field has a default
+    __slots__ = ('data', 'timestamp', 'ttl')
+    
     data: Any
     timestamp: float
     ttl: int  # Time to live in seconds
     
-    @property
-    def is_expired(self) -> bool:
+    # Both take the caller's time.time(), read once per cache operation.
+    # Timestamps are wall-clock because they're shared with other
+    # processes through the cache files
+    
+    def is_expired(self, now: float) -> bool:
         """Check if this cache entry has expired"""
-        return (time.time() - self.timestamp) > self.ttl
+        return (now - self.timestamp) > self.ttl
     
-    @property
-    def age(self) -> int:
+    def age(self, now: float) -> int:
         """Get age of cache entry in seconds"""
-        return int(time.time() - self.timestamp)
+        return int(now - self.timestamp)
+
+
+class _RawEntry(CacheEntry):
+    """A cache entry whose data is also at hand as JSON, so writing it needs no encoding"""
+    __slots__ = ('raw',)
+    
+    def __init__(self, data: Any, timestamp: float, ttl: int, raw: bytes):
+        super().__init__(data, timestamp, ttl)
+        self.raw = raw
+
+
+def _write_behind():
+    """Background writer: flush each manager that has queued file writes"""
+    while True:
+        manager = _write_queue.get()
+        manager.flush()
+        del manager  # Don't keep the last manager alive while idle
+
+
+def _start_writer():
+    """Start the background writer thread, once per process"""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(
+                target=_write_behind, name='sp-cache-writer', daemon=True
+            )
+            _writer_thread.start()
+
+
+@atexit.register
+def _flush_all():
+    """Write out pending cache entries before the interpreter exits"""
+    for manager in list(_managers):
+        manager.flush()
+
+
+# Only the forking thread exists in a child, so a lock the writer thread
+# held at fork() would stay locked there forever. Before forking, flush
+# every manager and hold its locks (the writer is then idle); the parent
+# releases them, the child gets fresh ones and starts its own writer
+_forking: List['CacheManager'] = []
+
+
+def _before_fork():
+    _writer_lock.acquire()
+    for manager in list(_managers):
+        manager.flush()
+        manager._io_lock.acquire()
+        manager._pending_lock.acquire()
+        _forking.append(manager)
+
+
+def _after_fork_in_parent():
+    while _forking:
+        manager = _forking.pop()
+        manager._pending_lock.release()
+        manager._io_lock.release()
+    _writer_lock.release()
+
+
+def _after_fork_in_child():
+    global _write_queue, _writer_lock, _writer_thread
+    _write_queue = queue.Queue()
+    _writer_lock = threading.Lock()
+    _writer_thread = None
+    for manager in _forking:
+        manager._io_lock = threading.Lock()
+        manager._pending_lock = threading.Lock()
+        if manager._pending:
+            _write_queue.put(manager)
+    _forking.clear()
+    if not _write_queue.empty():
+        _start_writer()
+
+
+if hasattr(os, 'register_at_fork'):  # POSIX
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
 
 
 class CacheManager:
     """Manages local caching for API responses"""
+    __slots__ = ('cache_dir', 'config', 'fsync', 'memory_cache', 'memory_max_entries', '_paths', '_file_entries', 'hits', 'misses',
+                 '_pending', '_pending_lock', '_io_lock', 'default_ttl', 'memory_ttl',
+                 '__weakref__')
     
     def __init__(self, cache_dir: Path, config_manager=None):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.config = config_manager
+        # The cache can always be refetched, so by default a write isn't
+        # forced to disk; the rename keeps files whole either way
+        self.fsync = bool(self.config.cache_fsync) if self.config else False
         
-        # In-memory cache for very recent data
-        self.memory_cache: Dict[str, CacheEntry] = {}
+        # In-memory cache for very recent data, in least recently used order.
+        # One entry per member/custom front, so a long-running daemon would
+        # otherwise only ever grow it
+        self.memory_cache: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self.memory_max_entries = int(self.config.cache_memory_max) if self.config else MEMORY_MAX_ENTRIES
+        # get() results per key, counted by this manager (so only meaningful
+        # in a long-lived process like the daemon); see get_cache_info
+        self.hits: 'Counter[str]' = Counter()
+        self.misses: 'Counter[str]' = Counter()
+        # Cache file path per key (building a Path costs more than the lookup)
+        self._paths: Dict[str, Path] = {}
+        # Parsed file entries, by key: (file stamp, entry); see _load_from_file
+        self._file_entries: 'OrderedDict[str, Tuple[tuple, CacheEntry]]' = OrderedDict()
+        # Entries set but not yet written to their files (write-back; see set).
+        # _io_lock is held while files are written or removed
+        self._pending: Dict[str, CacheEntry] = {}
+        self._pending_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        _managers.add(self)
         
         # Default TTL values (in seconds) - use config if available
         if self.config:
@@ -69,158 +216,446 @@ class CacheManager:
     
     def _get_cache_file(self, key: str) -> Path:
         """Get the cache file path for a given key"""
-        return self.cache_dir / f"{key}.json"
+        path = self._paths.get(key)
+        if path is None:
+            if len(self._paths) >= PATH_CACHE_SIZE:
+                self._paths.clear()  # One per member ID; don't grow forever
+            path = self._paths[key] = self.cache_dir / f"{key}.json"
+        return path
     
-    def _load_from_file(self, key: str) -> Optional[CacheEntry]:
-        """Load cache entry from file"""
-        cache_file = self._get_cache_file(key)
+    @staticmethod
+    def _serialize(entry: CacheEntry) -> bytes:
+        """
+        Encode a cache file's contents (compact: nobody reads these by hand)
         
+        The first line is a header with the timestamp and TTL, the second
+        the data, so an expired entry can be recognised without parsing its
+        data. Compact JSON never contains a raw newline (the data, which may
+        be JSON as received from the API, can).
+        
+        JSON rather than pickle: loading a pickle runs code, and anything
+        that can write to the cache dir could then run code in sp and the
+        daemon. With orjson installed, JSON is about as fast anyway.
+        """
+        header = _json.dumps({'timestamp': entry.timestamp, 'ttl': entry.ttl})
+        if isinstance(entry, _RawEntry):
+            return header + b'\n' + entry.raw
+        return header + b'\n' + _json.dumps(entry.data)
+    
+    @staticmethod
+    def _deserialize(raw: bytes) -> Any:
+        """Decode a cache file's data (raises ValueError if corrupt)"""
+        return _json.loads(raw)
+    
+    @staticmethod
+    def _parse_header(line: bytes) -> Optional[Dict[str, Any]]:
+        """Decode a cache file's header line, or None for files without one"""
         try:
-            if not cache_file.exists():
+            header = _json.loads(line)
+        except ValueError:
+            return None
+        # Files from older versions are a single object that includes the data
+        if isinstance(header, dict) and 'timestamp' in header and 'data' not in header:
+            return header
+        return None
+    
+    def _file_stamp(self, key: str, st: Optional[os.stat_result]) -> Optional[tuple]:
+        """The (inode, mtime, size) stamp of a key's file, or None if there is no file"""
+        if st is None:
+            try:
+                st = self._get_cache_file(key).stat()
+            except OSError:
                 return None
-                
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _remembered_entry(self, key: str, stamp: tuple) -> Optional[CacheEntry]:
+        """The entry parsed from a key's file, if the file hasn't changed since"""
+        remembered = self._file_entries.get(key)
+        if remembered is not None and remembered[0] == stamp:
+            try:
+                self._file_entries.move_to_end(key)
+            except KeyError:
+                pass  # Evicted by another thread meanwhile
+            return remembered[1]
+        return None
+    
+    def _load_from_file(self, key: str, st: Optional[os.stat_result] = None,
+                        now: Optional[float] = None) -> Optional[CacheEntry]:
+        """
+        Load cache entry from file
+        
+        Entries still waiting to be written are returned as they are.
+        Parsed entries are remembered per key along with the file's inode,
+        mtime and size. Files are replaced (never rewritten in place), so an
+        unchanged stamp means the remembered entry is still what's on disk
+        and the file doesn't need parsing again. Callers that already
+        stat'ed the file can pass st.
+        
+        If now is given, an expired entry is reported as None as soon as
+        the header is read, without parsing its data.
+        """
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending  # Newer than whatever the file holds
+        
+        stamp = self._file_stamp(key, st)
+        if stamp is None:
+            return None
+        entry = self._remembered_entry(key, stamp)
+        if entry is not None:
+            return entry
+        
+        cache_file = self._get_cache_file(key)
+        try:
+            with open(cache_file, 'rb') as f:
+                first_line = f.readline()
+                header = self._parse_header(first_line)
+                if header is None:
+                    cache_data = self._deserialize(first_line + f.read())
+                    header, data = cache_data, cache_data['data']
+                else:
+                    ttl = header.get('ttl', self.default_ttl.get(key, 3600))
+                    if now is not None and now - header['timestamp'] > ttl:
+                        return None
+                    data = self._deserialize(f.read())
             
-            return CacheEntry(
-                data=cache_data['data'],
-                timestamp=cache_data['timestamp'],
-                ttl=cache_data.get('ttl', self.default_ttl.get(key, 3600))
+            entry = CacheEntry(
+                data=data,
+                timestamp=header['timestamp'],
+                ttl=header.get('ttl', self.default_ttl.get(key, 3600))
             )
             
-        except (json.JSONDecodeError, KeyError, IOError):
-            # If cache file is corrupted, remove it
+        except FileNotFoundError:
+            return None  # Removed since the stat; nothing to clean up
+        except (ValueError, KeyError, IOError):
+            # If cache file is corrupted (bad JSON or encoding), remove it
             try:
                 cache_file.unlink()
             except:
                 pass
             return None
+        
+        self._file_entries[key] = (stamp, entry)
+        if len(self._file_entries) > FILE_ENTRY_MEMO_SIZE:
+            try:
+                self._file_entries.popitem(last=False)
+            except KeyError:
+                pass
+        return entry
+    
+    def _load_header(self, key: str, st: Optional[os.stat_result] = None) -> Optional[CacheEntry]:
+        """
+        Load a cache file's timestamp and TTL, as an entry without data
+        
+        Only the header line is read, unless the parsed entry is remembered
+        already or the file predates headers.
+        """
+        stamp = self._file_stamp(key, st)
+        if stamp is None:
+            return None
+        entry = self._remembered_entry(key, stamp)
+        if entry is not None:
+            return entry
+        
+        try:
+            with open(self._get_cache_file(key), 'rb') as f:
+                header = self._parse_header(f.readline())
+        except OSError:
+            return None
+        if header is None:
+            return self._load_from_file(key, st)
+        return CacheEntry(
+            data=None,
+            timestamp=header['timestamp'],
+            ttl=header.get('ttl', self.default_ttl.get(key, 3600))
+        )
     
     def _save_to_file(self, key: str, entry: CacheEntry):
-        """Save cache entry to file atomically"""
-        cache_file = self._get_cache_file(key)
+        """
+        Save cache entry to file atomically
         
-        cache_data = {
-            'data': entry.data,
-            'timestamp': entry.timestamp,
-            'ttl': entry.ttl
-        }
+        The data is written to a temporary file that's then renamed over
+        the cache file. This process's writes are serialized (see flush),
+        so a per-process temporary name can't collide.
+        """
+        cache_file = self._get_cache_file(key)
+        temp_path = f"{cache_file}.{os.getpid()}.tmp"
+        data = self._serialize(entry)
         
         try:
-            # Atomic write using temporary file
-            with tempfile.NamedTemporaryFile(
-                mode='w', 
-                dir=self.cache_dir, 
-                delete=False,
-                suffix='.tmp'
-            ) as tmp_file:
-                json.dump(cache_data, tmp_file, indent=2)
-                tmp_file.flush()
-                os.fsync(tmp_file.fileno())
-                temp_path = tmp_file.name
+            # 0600 like tempfile: cache files hold the system's member data
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
             
             # Replace the original file
             os.replace(temp_path, cache_file)
             
-        except (IOError, OSError):
+        except OSError:
             # Clean up temporary file if it exists
             try:
-                if 'temp_path' in locals():
-                    os.unlink(temp_path)
-            except:
+                os.unlink(temp_path)
+            except OSError:
                 pass
     
+    def _remember(self, key: str, entry: CacheEntry):
+        """Put an entry in the memory cache, evicting the least recently used past the limit"""
+        self.memory_cache[key] = entry
+        self.memory_cache.move_to_end(key)
+        while len(self.memory_cache) > self.memory_max_entries:
+            try:
+                self.memory_cache.popitem(last=False)
+            except KeyError:
+                break  # Emptied by another thread meanwhile
+    
+    def _fsync_dir(self):
+        """Flush the cache directory's entries (renames) to disk"""
+        try:
+            fd = os.open(self.cache_dir, os.O_RDONLY)
+        except OSError:
+            return  # Directories can't be opened on Windows
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def flush(self):
+        """
+        Write any entries still waiting for the background writer to their files
+        
+        With cache_fsync, each file's data is fsynced before its rename and
+        the directory once after the whole batch, which makes the renames
+        themselves durable.
+        """
+        with self._io_lock:
+            written = False
+            while True:
+                with self._pending_lock:
+                    batch = list(self._pending.items())
+                if not batch:
+                    if written and self.fsync:
+                        self._fsync_dir()
+                    return
+                written = True
+                for key, entry in batch:
+                    self._save_to_file(key, entry)
+                    with self._pending_lock:
+                        # A newer set() meanwhile stays pending for the next pass
+                        if self._pending.get(key) is entry:
+                            del self._pending[key]
+    
     def get(self, key: str) -> Optional[Any]:
         """Get cached data for a key"""
+        now = time.time()
         
         # 1. Check memory cache first (fastest)
-        if key in self.memory_cache:
-            entry = self.memory_cache[key]
-            if not entry.is_expired:
+        entry = self.memory_cache.get(key)
+        if entry is not None:
+            if not entry.is_expired(now):
+                try:
+                    self.memory_cache.move_to_end(key)
+                except KeyError:
+                    pass  # Evicted by another thread meanwhile
+                if entry.data is _MISS:
+                    self.misses[key] += 1
+                    return None
+                self.hits[key] += 1
                 return entry.data
-            else:
-                # Remove expired entry
-                del self.memory_cache[key]
+            self.memory_cache.pop(key, None)
         
-        # 2. Check file cache
-        entry = self._load_from_file(key)
-        if entry and not entry.is_expired:
-            # Promote to memory cache if still fresh enough
-            if entry.age <= self.memory_ttl.get(key, 300):
-                memory_entry = CacheEntry(
-                    data=entry.data,
-                    timestamp=time.time(),
-                    ttl=self.memory_ttl.get(key, 300)
-                )
-                self.memory_cache[key] = memory_entry
-            
-            return entry.data
+        # 2. Check file cache (an expired file's data isn't parsed)
+        entry = self._load_from_file(key, now=now)
+        if entry is None or entry.is_expired(now):
+            # Remember the miss; set() and invalidate() replace it
+            self._remember(key, CacheEntry(data=_MISS, timestamp=now, ttl=MISS_TTL))
+            self.misses[key] += 1
+            return None
+        self.hits[key] += 1
         
-        return None
+        # Promote to memory cache if still fresh enough. This is a new
+        # entry: the loaded one is remembered as the file's contents (or is
+        # the one queued for writing), so it mustn't be changed
+        memory_ttl = self.memory_ttl.get(key, 300)
+        if entry.age(now) <= memory_ttl:
+            self._remember(key, CacheEntry(data=entry.data, timestamp=now, ttl=memory_ttl))
+        return entry.data
+    
+    def peek(self, key: str) -> Optional[Any]:
+        """Get cached data for a key from its file, even if it has expired"""
+        entry = self._load_from_file(key)
+        return entry.data if entry else None
     
     def set(self, key: str, data: Any, ttl: Optional[int] = None):
-        """Set cached data for a key"""
+        """
+        Set cached data for a key
+        
+        The memory cache is updated immediately; the file is written by a
+        background thread, so a burst of sets (e.g. every member after a
+        refresh) doesn't wait on disk, and repeated sets of one key before
+        it's written only write the latest. flush() forces the writes, and
+        they are flushed at exit.
+        """
+        self._store(key, data, ttl)
+    
+    def set_raw(self, key: str, raw: bytes, data: Any, ttl: Optional[int] = None):
+        """
+        Set cached data for a key, given both parsed and as the JSON it was parsed from
+        
+        Like set(), but the file is written from raw instead of encoding
+        data again (e.g. an API response body and its parsed result).
+        """
+        self._store(key, data, ttl, raw)
+    
+    def _store(self, key: str, data: Any, ttl: Optional[int], raw: Optional[bytes] = None):
+        """Put data in the memory cache and queue its file write (see set)"""
         if ttl is None:
             ttl = self.default_ttl.get(key, 3600)
         
         timestamp = time.time()
         
-        # Save to file cache
-        file_entry = CacheEntry(data=data, timestamp=timestamp, ttl=ttl)
-        self._save_to_file(key, file_entry)
-        
         # Save to memory cache with shorter TTL
         memory_ttl = min(ttl, self.memory_ttl.get(key, 300))
         memory_entry = CacheEntry(data=data, timestamp=timestamp, ttl=memory_ttl)
-        self.memory_cache[key] = memory_entry
+        self._remember(key, memory_entry)
+        
+        # Queue the file write
+        if raw is None:
+            file_entry = CacheEntry(data=data, timestamp=timestamp, ttl=ttl)
+        else:
+            file_entry = _RawEntry(data, timestamp, ttl, raw)
+        self._queue_writes({key: file_entry})
+    
+    def set_many(self, entries: Dict[str, Any]):
+        """
+        Set cached data for several keys at once, with their default TTLs
+        
+        Equivalent to calling set() for each, but the writes are queued
+        together, so the background writer handles them as one batch.
+        """
+        timestamp = time.time()
+        file_entries = {}
+        for key, data in entries.items():
+            ttl = self.default_ttl.get(key, 3600)
+            memory_ttl = min(ttl, self.memory_ttl.get(key, 300))
+            self._remember(key, CacheEntry(data=data, timestamp=timestamp, ttl=memory_ttl))
+            file_entries[key] = CacheEntry(data=data, timestamp=timestamp, ttl=ttl)
+        self._queue_writes(file_entries)
+    
+    def _queue_writes(self, file_entries: Dict[str, CacheEntry]):
+        """Hand entries to the background writer (only the latest per key is written)"""
+        with self._pending_lock:
+            queued = bool(self._pending)
+            self._pending.update(file_entries)
+        if not queued:
+            _start_writer()
+            _write_queue.put(self)
     
     def invalidate(self, key: str):
         """Invalidate cached data for a key"""
         # Remove from memory cache
         if key in self.memory_cache:
             del self.memory_cache[key]
+        self._file_entries.pop(key, None)
         
-        # Remove file cache
-        cache_file = self._get_cache_file(key)
-        try:
-            cache_file.unlink()
-        except FileNotFoundError:
-            pass
+        # Remove file cache, along with any write still queued for it
+        with self._io_lock:
+            with self._pending_lock:
+                self._pending.pop(key, None)
+            cache_file = self._get_cache_file(key)
+            try:
+                cache_file.unlink()
+            except FileNotFoundError:
+                pass
     
     def clear_all(self):
-        """Clear all cached data"""
+        """
+        Clear all cached data
+        
+        The cache directory is renamed aside and replaced by an empty one,
+        so every entry disappears at once for other processes too, and the
+        old directory is deleted by a background thread. That thread isn't
+        a daemon thread, so exit still waits for the deletion to finish.
+        """
         # Clear memory cache
         self.memory_cache.clear()
+        self._file_entries.clear()
         
-        # Clear file cache
-        for cache_file in self.cache_dir.glob("*.json"):
+        # Clear file cache and queued writes
+        with self._io_lock:
+            with self._pending_lock:
+                self._pending.clear()
             try:
-                cache_file.unlink()
-            except:
-                pass
+                # rename() onto an empty directory replaces it (POSIX)
+                old_dir = tempfile.mkdtemp(prefix=f'.{self.cache_dir.name}.old-',
+                                           dir=self.cache_dir.parent)
+                try:
+                    os.replace(self.cache_dir, old_dir)
+                except OSError:
+                    os.rmdir(old_dir)
+                    raise
+            except OSError:
+                # Not renameable (e.g. Windows); remove the files one by one
+                for cache_file in self.cache_dir.glob("*.json"):
+                    try:
+                        cache_file.unlink()
+                    except:
+                        pass
+                return
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        threading.Thread(
+            target=shutil.rmtree, args=(old_dir,), kwargs={'ignore_errors': True},
+            name='sp-cache-clear'
+        ).start()
     
     def get_cache_info(self) -> Dict[str, Dict[str, Any]]:
         """Get information about cached items"""
         info = {}
+        self.flush()
+        now = time.time()
         
-        # Check all possible cache files
-        for cache_file in self.cache_dir.glob("*.json"):
-            key = cache_file.stem
-            entry = self._load_from_file(key)
-            
-            if entry:
-                info[key] = {
-                    'age_seconds': entry.age,
-                    'ttl_seconds': entry.ttl,
-                    'expired': entry.is_expired,
-                    'in_memory': key in self.memory_cache,
-                    'file_size': cache_file.stat().st_size
-                }
+        # One directory scan; each entry's stat is reused for the memo check
+        # and for the size, and only headers are read
+        with os.scandir(self.cache_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith('.json'):
+                    continue
+                key = dir_entry.name[:-len('.json')]
+                try:
+                    st = dir_entry.stat()
+                except OSError:
+                    continue  # Removed meanwhile
+                entry = self._load_header(key, st)
+                
+                if entry:
+                    memory_entry = self.memory_cache.get(key)
+                    info[key] = {
+                        'age_seconds': entry.age(now),
+                        'ttl_seconds': entry.ttl,
+                        'expired': entry.is_expired(now),
+                        'in_memory': memory_entry is not None and memory_entry.data is not _MISS,
+                        'file_size': st.st_size,
+                        'hits': self.hits[key],
+                        'misses': self.misses[key]
+                    }
         
         return info
     
     # Convenience methods for specific data types
     
+    @property
+    def fronters_path(self) -> Path:
+        """Path of the fronters cache file (its mtime is when it was written)"""
+        return self._get_cache_file('fronters')
+    
     def get_fronters(self) -> Optional[Dict[str, Any]]:
         """Get cached fronters data"""
         return self.get('fronters')
@@ -230,13 +665,20 @@ class CacheManager:
         self.set('fronters', data)
     
     def invalidate_fronters(self):
-        """Invalidate fronters cache (e.g., after a switch)"""
+        """
+        Invalidate fronters cache (e.g., after a switch)
+        
+        Fronters stay file-backed: the file is how the daemon, sp and the
+        shell prompt share them. A write still queued when this runs is
+        dropped, so a set quickly followed by a switch doesn't touch disk.
+        """
         self.invalidate('fronters')
     
     def get_fronters_timestamp(self) -> Optional[float]:
         """Get timestamp of when fronters were last cached"""
-        if 'fronters' in self.memory_cache:
-            return self.memory_cache['fronters'].timestamp
+        entry = self.memory_cache.get('fronters')
+        if entry is not None and entry.data is not _MISS:
+            return entry.timestamp
         
         entry = self._load_from_file('fronters')
         return entry.timestamp if entry else None
@@ -292,3 +734,40 @@ class CacheManager:
     def invalidate_custom_fronts(self):
         """Invalidate all custom fronts cache"""
         self.invalidate('custom_fronts')
+    
+    def get_system_id(self, token_id: str) -> Optional[str]:
+        """Get the cached system ID, if it was cached for the token with this fingerprint"""
+        cached = self.get('system_id')
+        if isinstance(cached, dict) and cached.get('token') == token_id:
+            return cached.get('system_id')
+        return None
+    
+    def set_system_id(self, token_id: str, system_id: str):
+        """Cache the system ID for the token with this fingerprint"""
+        self.set('system_id', {'token': token_id, 'system_id': system_id}, ttl=SYSTEM_ID_TTL)
+    
+    def invalidate_system_id(self):
+        """Invalidate the cached system ID (e.g., after the token was rejected)"""
+        self.invalidate('system_id')
+    
+    @staticmethod
+    def _etag_key(endpoint: str) -> str:
+        """Cache key for an API endpoint's stored response"""
+        return f"etag_{hashlib.sha1(endpoint.encode('utf-8')).hexdigest()[:16]}"
+    
+    def get_etag_response(self, endpoint: str) -> Optional[Tuple[str, Any]]:
+        """Get the last (ETag, body) received from an API endpoint"""
+        cached = self.get(self._etag_key(endpoint))
+        if isinstance(cached, dict) and cached.get('etag'):
+            return cached['etag'], cached.get('data')
+        return None
+    
+    def set_etag_response(self, endpoint: str, etag: str, data: Any, body: Optional[bytes] = None):
+        """Store an API endpoint's response (parsed, and its raw JSON body if given) with its ETag"""
+        cached = {'etag': etag, 'data': data}
+        if body is None:
+            self.set(self._etag_key(endpoint), cached, ttl=ETAG_TTL)
+        else:
+            # Same object as cached, spliced around the body instead of re-encoded
+            raw = b'{"etag":' + _json.dumps(etag) + b',"data":' + body + b'}'
+            self.set_raw(self._etag_key(endpoint), raw, cached, ttl=ETAG_TTL)
@@ -36,44 +36,268 @@ Installation:
 """
 
 import sys
-import argparse
 import json
 import os
 import time
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 
 
-from . import __version__
-from .api_client import SimplyPluralAPI, APIError
+from . import __version__, _json
+from .exceptions import APIError
 from .cache_manager import CacheManager
 from .config_manager import ConfigManager
 from .shell_integration import ShellIntegrationManager
 from .daemon_client import DaemonClientSync
+from .launcher import STATUS_FILE, refresh_lock_name, status_file_name
+
+
+# Upper bound on concurrent API lookups for history names the bulk
+# member/custom front lists didn't cover (stays well under rate limits)
+_HISTORY_LOOKUP_WORKERS = 4
+
+
+# Default profile's shell status file (also read by the launcher's prompt
+# fast path) and the lock held while its background refresh runs; other
+# profiles' sit next to them
+_STATUS_FILE = Path(STATUS_FILE)
+_REFRESH_LOCK_FILE = _STATUS_FILE.with_name(refresh_lock_name('default'))
+
+
+# Output of `sp config --example`
+_EXAMPLE_CONFIG = """\
+# Simply Plural CLI - Example Configuration File
+#
+# Copy this content to your config file and edit as needed
+# Uncomment and modify settings as needed
+#
+# QUICK START:
+# 1. Copy this content to your config file
+# 2. Add your token: api_token = your-token-here
+# 3. Uncomment and modify any settings you want to change
+#
+# SECURITY NOTE:
+# Protect your tokens! They are like passwords.
+# Use read-only tokens when possible for safety.
+
+[default]
+# Get your token from: Simply Plural app -> Settings -> Account -> Tokens
+api_token = your-token-here
+
+# API settings
+# api_timeout = 10
+# max_retries = 3
+# retry_base_delay = 1.0          # backoff before the first retry, doubling after
+# retry_max_delay = 30            # retries wait a random time up to this
+
+# Display preferences
+# default_output_format = text    # text, json, prompt, simple
+# show_timestamps = true
+# show_cache_age = true
+# use_colors = true
+# timezone = local
+
+# Cache settings (in seconds)
+# cache_fronters_ttl = 300     # 5 minutes
+# cache_members_ttl = 3600     # 1 hour
+# cache_switches_ttl = 1800    # 30 minutes
+# cache_fsync = false          # fsync each cache write (only matters on power loss)
+# cache_memory_max = 512       # entries kept in memory (mostly matters for the daemon)
+
+# Daemon
+# start_daemon = true             # auto-start daemon on CLI use
+
+# Shell integration
+# shell_update_interval = 60
+# async_status_update = false     # update prompt status file in the background
+
+# Member preferences
+# default_member = member-name
+# member_name_matching = fuzzy
+
+# Backup settings
+# auto_backup_on_exit = false
+# backup_include_switches = true
+# backup_include_members = true
+# max_backup_files = 5
+
+# Example: Friend's system (read-only monitoring)
+[friend-system]
+api_token = friend-readonly-token-here
+default_output_format = json
+cache_fronters_ttl = 120    # Check more frequently
+
+# Example: Server deployment (minimal, fast)
+[server]
+api_token = server-token-here
+default_output_format = simple
+show_timestamps = false
+show_cache_age = false
+cache_fronters_ttl = 600    # Cache longer for stability
+"""
+
+
+# Topic texts for `sp help <topic>`
+_HELP_TOPICS = {
+    'config': 'Configuration management:\n  --setup    Run setup wizard\n  --show     Show current config\n  --edit     Edit config file\n  --example  Output example config to stdout\n  --list-profiles    List all profiles\n  --create-profile   Create new profile\n  --delete-profile   Delete a profile',
+    'profiles': 'Profile management:\n  sp --profile <n> <command>     Use specific profile\n  sp config --list-profiles        List profiles\n  sp config --create-profile <n>   Create profile\n  sp config --delete-profile <n>   Delete profile',
+    'switch': 'Switch registration:\n  sp switch <member>               Switch to member\n  sp switch <member1> <member2>    Multiple fronters\n  sp switch --co <member>          Add co-fronter\n  sp switch --add <member>          (alias for --co)\n  sp switch <member> --note "text"  Add note\n  sp sw <member>                   Alias for `sp switch`',
+    'format': 'Output formats:\n  text     Text (default)\n  json     JSON for scripts\n  prompt   For shell prompts\n  simple   Just names',
+    'cache': 'Cache management:\n  sp cache clear          Clear cache for current profile\n  sp cache clear --all    Clear cache for all profiles\n\nCaching behavior:\n  - Fronters cached for 15 minutes\n  - Members cached for 1 hour\n  - Custom fronts cached for 1 hour\n  - Profile-specific cache isolation\n  - Works offline with cached data',
+    'debug': 'Debug mode:\n  sp --debug <command>    Show API calls and responses\n  sp debug cache          Show cache information\n  sp debug config         Show configuration details\n  sp debug purge          Clear cached data (deprecated, use "cache clear")',
+    'shell': 'Shell integration:\n  sp shell generate       Generate shell integration script\n  sp shell install        Generate and show installation instructions',
+    'custom-fronts': 'Custom front support:\n  sp custom-fronts                    List all custom fronts\n  sp switch <custom-front>            Switch to a custom front\n  sp switch <member> <custom-front>   Mixed member/custom front co-fronting\n  sp members --include-custom         Show both members and custom fronts\n  sp fronting                         Shows "(custom front)" indicators\n\nCustom fronts work identically to members in all switch commands.\nThe CLI automatically detects whether a name is a member or custom front.'
+}
+_HELP_TOPIC_KEYS_STR = ', '.join(_HELP_TOPICS)
+
+
+def _fronter_list(fronters) -> List[Dict[str, Any]]:
+    """Normalize a fronters response (list, or dict with 'fronters') to a list"""
+    if isinstance(fronters, list):
+        return fronters
+    return fronters.get('fronters', [])
+
+
+def _extract_fronter_names(fronter_list: List[Dict[str, Any]]) -> List[str]:
+    """Names of the current fronters, 'Unknown' for unresolved entries"""
+    return [f.get('name', 'Unknown') for f in fronter_list]
+
+
+def _status_names(fronter_list: List[Dict[str, Any]]) -> List[str]:
+    """Fronter names to show in the shell status, leaving out unresolved ones"""
+    return [name for name in (f.get('name') for f in fronter_list)
+            if name and name != 'Unknown']
+
+
+def _status_text(names: List[str], stale: bool = False) -> str:
+    """Shell status line: '[A, B] ', prefixed with ~ when stale, '' if no names"""
+    if not names:
+        return ""
+    return f"{'~' if stale else ''}[{', '.join(names)}] "
+
+
+def _acquire_refresh_lock(lock_file: Path) -> Optional[int]:
+    """
+    Take a background refresh lock (see refresh_lock_name) without blocking
+
+    Returns the fd holding it, or None if another refresh has it (or the
+    lock file can't be opened). The kernel drops an flock once every copy
+    of the fd is closed, including when its holder dies, so there are no
+    stale locks to clean up.
+    """
+    import fcntl
+
+    try:
+        lock_fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(lock_fd)
+        return None
+    return lock_fd
+
+
+def _link_tmpfile(directory: Path, path: Path, data: bytes) -> bool:
+    """
+    Write data to an anonymous O_TMPFILE in directory and link it in there
+    under path's name
+
+    The file only gets a name once fully written, so an interrupted write
+    leaves nothing behind. Returns False where O_TMPFILE or /proc/self/fd
+    isn't available (non-Linux, some filesystems); callers then write path
+    directly.
+    """
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return False
+    try:
+        fd = os.open('.', os.O_TMPFILE | os.O_WRONLY, 0o644, dir_fd=dir_fd)
+    except (AttributeError, OSError):
+        os.close(dir_fd)
+        return False
+    try:
+        os.write(fd, data)
+        # A dir_fd makes os.link use linkat() with AT_SYMLINK_FOLLOW, which
+        # resolves the /proc magic link to the file itself
+        os.link(f'/proc/self/fd/{fd}', path.name, dst_dir_fd=dir_fd, follow_symlinks=True)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+        os.close(dir_fd)
+
+
+def _entity_row(name: str, pronouns: str = '', desc: str = '') -> str:
+    """One line of a member/custom front listing: '  name (pronouns) - desc'"""
+    row = f"  {name}"
+    if pronouns:
+        row += f" ({pronouns})"
+    if desc:
+        row += f" - {desc[:50]}..." if len(desc) > 50 else f" - {desc}"
+    return row + "\n"
 
 
 class SimplyPluralCLI:
+    __slots__ = ('debug', 'profile', 'config', 'cache', '_api', 'shell', 'daemon_client')
+
     def __init__(self, profile: str = "default", debug: bool = False):
         self.debug = debug
         self.profile = profile
         self.config = ConfigManager(profile)
         # Use profile-specific cache directory to prevent cache collisions between profiles
         self.cache = CacheManager(self.config.get_profile_cache_dir(), self.config)
-        self.api = SimplyPluralAPI(self.config.api_token, self.config, debug, self.cache) if self.config.api_token else None
+        # self.api is created on first use (see the api property)
         self.shell = ShellIntegrationManager(self.config)
         # Initialize daemon client
         self.daemon_client = DaemonClientSync(profile)
     
+    @property
+    def api(self):
+        """
+        API client, or None if no token is configured
+        
+        Built on first access: commands answered by the daemon or the cache
+        never touch it, and skipping it avoids importing requests entirely.
+        """
+        try:
+            return self._api
+        except AttributeError:
+            pass
+        if self.config.api_token:
+            from .api_client import SimplyPluralAPI
+            self._api = SimplyPluralAPI(self.config.api_token, self.config, self.debug, self.cache)
+        else:
+            self._api = None
+        return self._api
+    
+    @api.setter
+    def api(self, value):
+        self._api = value
+    
+    def _entity_name_formatter(self) -> Callable[[str, str], str]:
+        """
+        Return a (name, entity_type) -> display name function
+        
+        The indicator settings are read from config once, so listings can
+        call the result per entity without going back to the config.
+        """
+        if not self.config.show_custom_front_indicators:
+            return lambda name, entity_type: name
+        if self.config.custom_front_indicator_style == 'character':
+            prefix = self.config.custom_front_indicator_character
+            return lambda name, entity_type: f"{prefix}{name}" if entity_type == 'custom_front' else name
+        # text style
+        return lambda name, entity_type: f"{name} (custom front)" if entity_type == 'custom_front' else name
+    
     def _format_entity_name(self, name: str, entity_type: str) -> str:
         """Format entity name with appropriate type indicator based on config"""
-        if entity_type == 'custom_front' and self.config.show_custom_front_indicators:
-            if self.config.custom_front_indicator_style == 'character':
-                return f"{self.config.custom_front_indicator_character}{name}"
-            else:  # text style
-                return f"{name} (custom front)"
-        else:
-            return name
+        return self._entity_name_formatter()(name, entity_type)
     
     def _try_daemon_or_api(self, method_name: str, fallback_func, *args, **kwargs):
         """
@@ -165,14 +389,9 @@ class SimplyPluralCLI:
             if co:
                 # Add co-fronter(s) to existing fronters
                 current = self._try_daemon_or_api('get_fronters', self.api.get_fronters)
-                # Handle both list and dict responses
-                if isinstance(current, list):
-                    fronter_list = current
-                else:
-                    fronter_list = current.get('fronters', [])
                 # Filter out unresolved names
-                current_names = [f.get('name') for f in fronter_list
-                                 if f.get('name') and f.get('name') != 'Unknown']
+                current_names = [name for name in _extract_fronter_names(_fronter_list(current))
+                                 if name and name != 'Unknown']
                 # Add new members that aren't already fronting
                 for name in members:
                     if name not in current_names:
@@ -184,11 +403,8 @@ class SimplyPluralCLI:
             # Invalidate cache immediately after local switch
             self.cache.invalidate_fronters()
             
-            # Update status file immediately (local action, lag acceptable)
-            try:
-                self.cmd_internal_update_status()
-            except:
-                pass  # Don't fail switch if status update fails
+            # Update status file (local action, lag acceptable)
+            self._update_status_file()
             
             if len(members) == 1:
                 print(f"[OK] Switched to {members[0]}")
@@ -258,10 +474,8 @@ class SimplyPluralCLI:
                 return 0
             
             try:
-                # Clear the cache directory
-                shutil.rmtree(profile_cache_dir)
-                # Recreate empty directory
-                profile_cache_dir.mkdir(parents=True, exist_ok=True)
+                # Swaps in an empty directory; the old one is removed in the background
+                self.cache.clear_all()
                 print("\n[OK] Cache cleared successfully.")
                 print("Next API calls will fetch fresh data.")
             except Exception as e:
@@ -310,29 +524,19 @@ class SimplyPluralCLI:
         """Show help information"""
         if topic:
             # Show help for specific topic
-            help_topics = {
-                'config': 'Configuration management:\n  --setup    Run setup wizard\n  --show     Show current config\n  --edit     Edit config file\n  --example  Output example config to stdout\n  --list-profiles    List all profiles\n  --create-profile   Create new profile\n  --delete-profile   Delete a profile',
-                'profiles': 'Profile management:\n  sp --profile <n> <command>     Use specific profile\n  sp config --list-profiles        List profiles\n  sp config --create-profile <n>   Create profile\n  sp config --delete-profile <n>   Delete profile',
-                'switch': 'Switch registration:\n  sp switch <member>               Switch to member\n  sp switch <member1> <member2>    Multiple fronters\n  sp switch --co <member>          Add co-fronter\n  sp switch --add <member>          (alias for --co)\n  sp switch <member> --note "text"  Add note\n  sp sw <member>                   Alias for `sp switch`',
-                'format': 'Output formats:\n  text     Text (default)\n  json     JSON for scripts\n  prompt   For shell prompts\n  simple   Just names',
-                'cache': 'Cache management:\n  sp cache clear          Clear cache for current profile\n  sp cache clear --all    Clear cache for all profiles\n\nCaching behavior:\n  - Fronters cached for 15 minutes\n  - Members cached for 1 hour\n  - Custom fronts cached for 1 hour\n  - Profile-specific cache isolation\n  - Works offline with cached data',
-                'debug': 'Debug mode:\n  sp --debug <command>    Show API calls and responses\n  sp debug cache          Show cache information\n  sp debug config         Show configuration details\n  sp debug purge          Clear cached data (deprecated, use "cache clear")',
-                'shell': 'Shell integration:\n  sp shell generate       Generate shell integration script\n  sp shell install        Generate and show installation instructions',
-                'custom-fronts': 'Custom front support:\n  sp custom-fronts                    List all custom fronts\n  sp switch <custom-front>            Switch to a custom front\n  sp switch <member> <custom-front>   Mixed member/custom front co-fronting\n  sp members --include-custom         Show both members and custom fronts\n  sp fronting                         Shows "(custom front)" indicators\n\nCustom fronts work identically to members in all switch commands.\nThe CLI automatically detects whether a name is a member or custom front.'
-            }
-            
-            if topic.lower() in help_topics:
+            text = _HELP_TOPICS.get(topic.lower())
+            if text is not None:
                 print(f"Help: {topic}")
                 print("=" * (7 + len(topic)))
-                print(help_topics[topic.lower()])
+                print(text)
             else:
                 print(f"No help available for '{topic}'")
-                print(f"Available topics: {', '.join(help_topics.keys())}")
+                print(f"Available topics: {_HELP_TOPIC_KEYS_STR}")
         else:
             # Show general help (same as --help)
             print(__doc__.strip())
             print("\nFor topic-specific help: sp help <topic>")
-            print("Available topics: config, profiles, switch, format, cache, debug, shell, custom-fronts")
+            print(f"Available topics: {_HELP_TOPIC_KEYS_STR}")
         
         return 0
     
@@ -374,27 +578,23 @@ class SimplyPluralCLI:
                         print("[DEBUG] Calling API...")
                     fronters = self.api.get_fronters()
                     self.cache.set_fronters(fronters)
+                    # The status update below (possibly another process)
+                    # reads the file, so don't leave it to the writer thread
+                    self.cache.flush()
                     if self.debug:
                         print("[DEBUG] ✓ Got fronters from API")
                 elif self.debug:
                     print(f"[DEBUG] ✓ Using cached fronters: {len(fronters)} entries")
             
-            # Handle both list and dict responses
-            if isinstance(fronters, list):
-                fronter_info = [{'name': f.get('name', 'Unknown'), 'type': f.get('type', 'member')} for f in fronters]
-            else:
-                fronter_info = [{'name': f.get('name', 'Unknown'), 'type': f.get('type', 'member')} for f in fronters.get('fronters', [])]
-            
-            fronter_names = [f['name'] for f in fronter_info]
+            # Normalize once; everything below works on the plain list
+            fronters = _fronter_list(fronters)
+            fronter_names = _extract_fronter_names(fronters)
             
             if self.debug:
                 print(f"DEBUG: Extracted fronter names: {fronter_names}")
             
             # Always update status file when we fetch fronters
-            try:
-                self.cmd_internal_update_status()
-            except:
-                pass  # Don't fail fronters command if status update fails
+            self._update_status_file()
             
             if format_type == "json":
                 print(json.dumps({"fronters": fronter_names}))
@@ -407,10 +607,13 @@ class SimplyPluralCLI:
                 print(', '.join(fronter_names) if fronter_names else "No one fronting")
             else:  # text
                 if fronter_names:
-                    # Build display names with type indicators
-                    display_names = []
-                    for info in fronter_info:
-                        display_names.append(self._format_entity_name(info['name'], info['type']))
+                    # Build display names with type indicators (only this
+                    # format needs the entity types)
+                    format_name = self._entity_name_formatter()
+                    display_names = [
+                        format_name(f.get('name', 'Unknown'), f.get('type', 'member'))
+                        for f in fronters
+                    ]
                     
                     if len(display_names) == 1:
                         print(f"Currently fronting: {display_names[0]}")
@@ -441,6 +644,9 @@ class SimplyPluralCLI:
             if self.debug:
                 print("DEBUG: Fetching members list")
 
+            # Set when the cache-miss path below already fetched them
+            custom_fronts = None
+
             # Try daemon first, then cache, then API
             self._maybe_auto_start_daemon()
             if self.daemon_client.is_running():
@@ -472,9 +678,22 @@ class SimplyPluralCLI:
                     if not self.api:
                         print("Error: Not configured and no cached data", file=sys.stderr)
                         return 1
-                    if self.debug:
-                        print("[DEBUG] Calling API...")
-                    members = self.api.get_members()
+                    if include_custom:
+                        custom_fronts = self.cache.get_custom_fronts()
+                    if include_custom and not custom_fronts:
+                        # Both are cold: they're independent, so fetch them side by side
+                        if self.debug:
+                            print("[DEBUG] Calling API for members and custom fronts...")
+                        with ThreadPoolExecutor(max_workers=2) as pool:
+                            members_future = pool.submit(self.api.get_members)
+                            custom_future = pool.submit(self.api.get_custom_fronts)
+                            members = members_future.result()
+                            custom_fronts = custom_future.result()
+                        self.cache.set_custom_fronts(custom_fronts)
+                    else:
+                        if self.debug:
+                            print("[DEBUG] Calling API...")
+                        members = self.api.get_members()
                     self.cache.set_members(members)
                     if self.debug:
                         print("[DEBUG] ✓ Got members from API")
@@ -485,54 +704,40 @@ class SimplyPluralCLI:
                 print(f"DEBUG: Members response type: {type(members)}")
                 print(f"DEBUG: Members response: {members}")
             
-            print("Members:")
+            # Build all rows, then write them in one go
+            rows = ["Members:\n"]
             for member in members:
-                # Extract name from the nested structure
-                name = member.get('content', {}).get('name', 'Unknown')
-                desc = member.get('content', {}).get('desc', '')
-                pronouns = member.get('content', {}).get('pronouns', '')
-                
-                # Build the display line
-                display_parts = [name]
-                if pronouns:
-                    display_parts.append(f"({pronouns})")
-                if desc:
-                    desc_short = desc[:50] + "..." if len(desc) > 50 else desc
-                    display_parts.append(f"- {desc_short}")
-                    
-                print(f"  {' '.join(display_parts)}")
+                # Extract fields from the nested structure
+                content = member.get('content', {})
+                rows.append(_entity_row(content.get('name', 'Unknown'),
+                                        content.get('pronouns', ''),
+                                        content.get('desc', '')))
+            sys.stdout.write(''.join(rows))
             
             # Include custom fronts if requested
             if include_custom:
                 if self.debug:
                     print("DEBUG: Also fetching custom fronts")
                 
-                custom_fronts = self.cache.get_custom_fronts()
-                if not custom_fronts:
-                    if self.debug:
-                        print("DEBUG: No cached custom fronts found, fetching from API")
-                    custom_fronts = self.api.get_custom_fronts()
-                    self.cache.set_custom_fronts(custom_fronts)
-                elif self.debug:
-                    print(f"DEBUG: Using cached custom fronts: {len(custom_fronts) if custom_fronts else 0} custom fronts")
+                if custom_fronts is None:
+                    custom_fronts = self.cache.get_custom_fronts()
+                    if not custom_fronts:
+                        if self.debug:
+                            print("DEBUG: No cached custom fronts found, fetching from API")
+                        custom_fronts = self.api.get_custom_fronts()
+                        self.cache.set_custom_fronts(custom_fronts)
+                    elif self.debug:
+                        print(f"DEBUG: Using cached custom fronts: {len(custom_fronts) if custom_fronts else 0} custom fronts")
                 
                 if custom_fronts:
-                    print("\nCustom fronts:")
+                    rows = ["\nCustom fronts:\n"]
+                    format_name = self._entity_name_formatter()
                     for custom_front in custom_fronts:
-                        # Extract name from the nested structure
-                        name = custom_front.get('content', {}).get('name', 'Unknown')
-                        desc = custom_front.get('content', {}).get('desc', '')
-                        
+                        content = custom_front.get('content', {})
                         # Format name with type indicator
-                        formatted_name = self._format_entity_name(name, 'custom_front')
-                        
-                        # Build the display line
-                        display_parts = [formatted_name]
-                        if desc:
-                            desc_short = desc[:50] + "..." if len(desc) > 50 else desc
-                            display_parts.append(f"- {desc_short}")
-                            
-                        print(f"  {' '.join(display_parts)}")
+                        formatted_name = format_name(content.get('name', 'Unknown'), 'custom_front')
+                        rows.append(_entity_row(formatted_name, desc=content.get('desc', '')))
+                    sys.stdout.write(''.join(rows))
                 elif self.debug:
                     print("DEBUG: No custom fronts found")
                     
@@ -596,22 +801,15 @@ class SimplyPluralCLI:
                 print("No custom fronts found")
                 return 0
             
-            print("Custom fronts:")
+            # Build all rows, then write them in one go
+            rows = ["Custom fronts:\n"]
+            format_name = self._entity_name_formatter()
             for custom_front in custom_fronts:
-                # Extract name from the nested structure
-                name = custom_front.get('content', {}).get('name', 'Unknown')
-                desc = custom_front.get('content', {}).get('desc', '')
-                
+                content = custom_front.get('content', {})
                 # Format name with type indicator
-                formatted_name = self._format_entity_name(name, 'custom_front')
-                
-                # Build the display line
-                display_parts = [formatted_name]
-                if desc:
-                    desc_short = desc[:50] + "..." if len(desc) > 50 else desc
-                    display_parts.append(f"- {desc_short}")
-                    
-                print(f"  {' '.join(display_parts)}")
+                formatted_name = format_name(content.get('name', 'Unknown'), 'custom_front')
+                rows.append(_entity_row(formatted_name, desc=content.get('desc', '')))
+            sys.stdout.write(''.join(rows))
                 
         except APIError as e:
             print(f"Error: {e}", file=sys.stderr)
@@ -630,8 +828,8 @@ class SimplyPluralCLI:
             print("Error: Count must be at least 1", file=sys.stderr)
             return 1
         elif count > 1000:
+            # get_switches() enforces the limit itself
             print(f"Warning: Count limited to 1000 (requested {count})")
-            count = 1000
 
         try:
             switches = self.api.get_switches(period, count)
@@ -661,8 +859,16 @@ class SimplyPluralCLI:
             except Exception:
                 cf_map = {}
 
+            # IDs missing from the bulk lists (e.g. members fetched from a
+            # stale cache) get one targeted lookup each, shared by every
+            # switch that references them
+            self._resolve_missing_names(switches, member_map, cf_map)
+
+            format_name = self._entity_name_formatter()
+            last_minute = None
+            last_time_str = ""
             print("Recent switches:")
-            for switch in switches[:count]:
+            for switch in switches:
                 # Extract data from frontHistory structure
                 content = switch.get('content', {})
                 start_time = content.get('startTime', 0)
@@ -680,29 +886,32 @@ class SimplyPluralCLI:
                     member_name = "Unknown"
 
                 # Format with type indicator
-                display_name = self._format_entity_name(
+                display_name = format_name(
                     member_name, 'custom_front' if is_custom else 'member')
 
-                # Format timestamp from startTime (milliseconds)
+                # Format timestamp from startTime (milliseconds); switches
+                # in the same minute as the previous row reuse its string
                 try:
                     if start_time:
-                        timestamp_seconds = start_time / 1000
-                        time_str = time.strftime("%m/%d %H:%M", time.localtime(timestamp_seconds))
+                        minute = start_time // 60_000
+                        if minute != last_minute:
+                            last_minute = minute
+                            last_time_str = time.strftime("%m/%d %H:%M", time.localtime(start_time / 1000))
+                        time_str = last_time_str
                     else:
                         time_str = "Unknown"
                 except Exception:
                     time_str = "Unknown"
 
-                # Format duration if we have end time
+                # Format duration if we have end time (rounded to 0.1h or 1m)
                 duration_str = ""
                 if end_time and start_time:
                     duration_ms = end_time - start_time
-                    duration_hours = duration_ms / (1000 * 60 * 60)
-                    if duration_hours >= 1:
-                        duration_str = f" ({duration_hours:.1f}h)"
+                    if duration_ms >= 3_600_000:
+                        tenths = (duration_ms + 180_000) // 360_000
+                        duration_str = f" ({tenths // 10}.{tenths % 10}h)"
                     else:
-                        duration_minutes = duration_ms / (1000 * 60)
-                        duration_str = f" ({duration_minutes:.0f}m)"
+                        duration_str = f" ({(duration_ms + 30_000) // 60_000}m)"
                 elif not end_time and content.get('live', False):
                     duration_str = " (ongoing)"
 
@@ -714,6 +923,49 @@ class SimplyPluralCLI:
 
         return 0
     
+    def _resolve_missing_names(self, switches: List[Dict], member_map: Dict[str, str],
+                               cf_map: Dict[str, str]):
+        """Look up names for switch entries not covered by member_map/cf_map, in place"""
+        missing = {}
+        for switch in switches:
+            content = switch.get('content', {})
+            entity_id = content.get('member', '')
+            is_custom = content.get('custom', False)
+            if entity_id and entity_id not in (cf_map if is_custom else member_map):
+                missing[entity_id] = is_custom
+
+        if not missing:
+            return
+
+        def lookup(entity_id: str, is_custom: bool) -> Optional[str]:
+            try:
+                if is_custom:
+                    entity = self.api.get_custom_front(entity_id)
+                else:
+                    entity = self.api.get_member(entity_id)
+            except APIError:
+                # Deleted entities can't be resolved; the caller shows the ID
+                return None
+            return entity.get('content', {}).get('name')
+
+        if len(missing) == 1:
+            names = [lookup(*next(iter(missing.items())))]
+        else:
+            # Independent GETs: run them side by side on the API session's
+            # connection pool. Resolve the system ID first so the workers
+            # don't all race to fetch it.
+            try:
+                self.api.get_system_id()
+            except APIError:
+                return
+            workers = min(len(missing), _HISTORY_LOOKUP_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                names = list(pool.map(lookup, missing.keys(), missing.values()))
+
+        for (entity_id, is_custom), name in zip(missing.items(), names):
+            if name:
+                (cf_map if is_custom else member_map)[entity_id] = name
+
     def cmd_backup(self, output_file: Optional[str] = None):
         """Backup data"""
         if not self.api:
@@ -727,8 +979,19 @@ class SimplyPluralCLI:
                 timestamp = time.strftime("%Y%m%d_%H%M%S")
                 output_file = f"sp_backup_{timestamp}.json"
             
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Write the whole document in one go to a temp file, then rename
+            # it into place so a crash never leaves a truncated backup
+            tmp_file = f"{output_file}.tmp"
+            try:
+                with open(tmp_file, 'wb') as f:
+                    f.write(_json.dumps(data, indent=True))
+                os.replace(tmp_file, output_file)
+            except OSError:
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
+                raise
                 
             print(f"[OK] Backup saved to {output_file}")
             print(f"\n[!] Important: This is a limited backup containing:")
@@ -809,6 +1072,7 @@ class SimplyPluralCLI:
             # Test the token (debug mode temporarily disabled for security)
             original_debug = self.debug
             self.debug = False  # Prevent token from appearing in API debug output
+            from .api_client import SimplyPluralAPI
             test_api = SimplyPluralAPI(token, self.config, debug=False)
             try:
                 test_api.get_fronters()
@@ -841,88 +1105,7 @@ class SimplyPluralCLI:
                 self.debug = original_debug
                 
         elif example:
-            # Output example configuration to stdout
-            example_profiles = {
-                "default": self.config._get_default_config(),
-                "example-friend-system": {
-                    "api_token": "friend-token-here",
-                    "default_output_format": "json",
-                    "cache_fronters_ttl": 120
-                },
-                "example-server-readonly": {
-                    "api_token": "readonly-token-here",
-                    "default_output_format": "simple"
-                }
-            }
-            
-            # Create a comprehensive example config
-            lines = [
-                "# Simply Plural CLI - Example Configuration File",
-                "#",
-                "# Copy this content to your config file and edit as needed",
-                "# Uncomment and modify settings as needed",
-                "#",
-                "# QUICK START:",
-                "# 1. Copy this content to your config file",
-                "# 2. Add your token: api_token = your-token-here",
-                "# 3. Uncomment and modify any settings you want to change",
-                "#",
-                "# SECURITY NOTE:",
-                "# Protect your tokens! They are like passwords.",
-                "# Use read-only tokens when possible for safety.",
-                "",
-                "[default]",
-                "# Get your token from: Simply Plural app -> Settings -> Account -> Tokens",
-                "api_token = your-token-here",
-                "",
-                "# API settings",
-                "# api_timeout = 10",
-                "# max_retries = 3",
-                "",
-                "# Display preferences",
-                "# default_output_format = text    # text, json, prompt, simple",
-                "# show_timestamps = true",
-                "# show_cache_age = true",
-                "# use_colors = true",
-                "# timezone = local",
-                "",
-                "# Cache settings (in seconds)",
-                "# cache_fronters_ttl = 300     # 5 minutes",
-                "# cache_members_ttl = 3600     # 1 hour",
-                "# cache_switches_ttl = 1800    # 30 minutes",
-                "",
-                "# Daemon",
-                "# start_daemon = true             # auto-start daemon on CLI use",
-                "",
-                "# Shell integration",
-                "# shell_update_interval = 60",
-                "",
-                "# Member preferences",
-                "# default_member = member-name",
-                "# member_name_matching = fuzzy",
-                "",
-                "# Backup settings",
-                "# auto_backup_on_exit = false",
-                "# backup_include_switches = true",
-                "# backup_include_members = true",
-                "# max_backup_files = 5",
-                "",
-                "# Example: Friend's system (read-only monitoring)",
-                "[friend-system]",
-                "api_token = friend-readonly-token-here",
-                "default_output_format = json",
-                "cache_fronters_ttl = 120    # Check more frequently",
-                "",
-                "# Example: Server deployment (minimal, fast)",
-                "[server]",
-                "api_token = server-token-here",
-                "default_output_format = simple",
-                "show_timestamps = false",
-                "show_cache_age = false",
-                "cache_fronters_ttl = 600    # Cache longer for stability"
-            ]
-            
-            print("\n".join(lines))
+            sys.stdout.write(_EXAMPLE_CONFIG)
                 
         elif show:
             info = self.config.get_config_info()
@@ -954,20 +1137,30 @@ class SimplyPluralCLI:
             print(f"Edit config file: {config_file}")
             print("\nAfter editing, run 'sp config --show' to verify changes")
             
-            # Try to open with system editor
-            import subprocess
-            import shutil
+            # Open with the user's editor ($VISUAL, then $EDITOR), falling
+            # back to searching PATH for a few common ones
+            import shlex
             
-            editors = ['code', 'nano', 'vim', 'notepad']
-            for editor in editors:
-                if shutil.which(editor):
-                    try:
-                        subprocess.run([editor, str(config_file)])
-                        break
-                    except:
-                        continue
-            else:
-                print(f"\nNo editor found. Please manually edit: {config_file}")
+            editor_cmd = shlex.split(os.environ.get('VISUAL') or os.environ.get('EDITOR') or '')
+            if editor_cmd:
+                try:
+                    subprocess.call(editor_cmd + [str(config_file)])
+                except OSError:
+                    editor_cmd = []
+            
+            if not editor_cmd:
+                import shutil
+                
+                editors = ['code', 'nano', 'vim', 'notepad']
+                for editor in editors:
+                    if shutil.which(editor):
+                        try:
+                            subprocess.call([editor, str(config_file)])
+                            break
+                        except OSError:
+                            continue
+                else:
+                    print(f"\nNo editor found. Please manually edit: {config_file}")
         
         else:
             print("Configuration management:")
@@ -1060,7 +1253,7 @@ class SimplyPluralCLI:
                         socket_path = f"/tmp/sp-daemon-{self.profile}.sock"
                         print(f"Socket: {socket_path}")
                         return 0
-                except:
+                except Exception:
                     pass
             
             print("[WARN] Daemon may have started but not responding yet")
@@ -1149,62 +1342,16 @@ class SimplyPluralCLI:
     
     def cmd_internal_update_status(self):
         """Internal command for shell prompt - daemon-first with cache fallback"""
-        status_text = ""
-        should_refresh = False
-
         try:
-            # Daemon path: instant and always fresh
-            self._maybe_auto_start_daemon()
-            if self.daemon_client.is_running():
-                try:
-                    result = self.daemon_client.get_fronters()
-                    fronters = result.get('fronters', [])
-                    names = [f.get('name', 'Unknown') for f in fronters if f.get('name') != 'Unknown']
-                    if names:
-                        status_text = f"[{', '.join(names)}] "
-                    else:
-                        status_text = ""
-                    if self.debug:
-                        print(f"DEBUG: Got fronters from daemon: '{status_text.strip()}'")
-                except Exception as e:
-                    if self.debug:
-                        print(f"DEBUG: Daemon error: {e}, falling back to cache")
-
-            # Cache fallback if daemon didn't provide data
-            if not status_text:
-                fronters = self.cache.get_fronters()
-                cache_timestamp = self.cache.get_fronters_timestamp()
-
-                if fronters and cache_timestamp:
-                    cache_age = int(time.time() - cache_timestamp)
-                    names = [f.get('name', 'Unknown') for f in fronters if f.get('name') != 'Unknown']
-                    if names:
-                        if cache_age <= self.config.cache_fronters_ttl:
-                            status_text = f"[{', '.join(names)}] "
-                        else:
-                            status_text = f"~[{', '.join(names)}] "
-                            should_refresh = True
-                    else:
-                        status_text = "(updating) "
-                        should_refresh = True
-                else:
-                    status_text = "(updating) "
-                    should_refresh = True
-
+            status_text, should_refresh = self._current_status()
         except Exception as e:
             if self.debug:
                 print(f"DEBUG: internal_update_status error: {e}")
-            status_text = status_text or "(error) "
+            status_text, should_refresh = "(error) ", False
 
-        # Atomic write to status file
         try:
-            status_file = Path.home() / '.cache' / 'sp_status'
-            status_file.parent.mkdir(exist_ok=True)
-            temp_file = status_file.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                f.write(status_text)
-            temp_file.replace(status_file)
-        except Exception:
+            self._write_status(status_text)
+        except OSError:
             pass
 
         if should_refresh:
@@ -1212,61 +1359,404 @@ class SimplyPluralCLI:
 
         return 0
     
+    def _current_status(self):
+        """Return (status text, whether a background refresh is needed)"""
+        # Daemon path: instant and always fresh
+        self._maybe_auto_start_daemon()
+        if self.daemon_client.is_running():
+            try:
+                result = self.daemon_client.get_fronters()
+                # An empty list means nobody is fronting; that is an answer
+                # too, and stale cached names must not replace it
+                status_text = _status_text(_status_names(result.get('fronters', [])))
+                if self.debug:
+                    print(f"DEBUG: Got fronters from daemon: '{status_text.strip()}'")
+                return status_text, False
+            except Exception as e:
+                if self.debug:
+                    print(f"DEBUG: Daemon error: {e}, falling back to cache")
+
+        # Cache fallback if daemon didn't provide data. The cache file's
+        # mtime is its write time, so freshness is decided with one stat;
+        # the file is parsed once, only if it exists. Writes this process
+        # still has queued must land first, or the stat would miss them
+        self.cache.flush()
+        try:
+            cache_mtime = os.stat(self.cache.fronters_path).st_mtime
+        except OSError:
+            return "(updating) ", True
+
+        # The TTL table CacheManager built at construction, so no config
+        # lookups run per prompt and both agree on what "fresh" means
+        fresh = time.time() < cache_mtime + self.cache.default_ttl['fronters']
+        # Stale names are still shown, marked with ~, while a refresh runs
+        fronters = self.cache.get_fronters() if fresh else self.cache.peek('fronters')
+        names = _status_names(_fronter_list(fronters)) if fronters else None
+        if not names:
+            return "(updating) ", True
+        return _status_text(names, stale=not fresh), not fresh
+    
+    def _write_status(self, status_text: str):
+        """
+        Store status_text in the shell status file
+        
+        Prompts usually find the text unchanged, so that case is answered by
+        reading the file: it is left alone if written within the last second,
+        otherwise only its mtime is bumped (readers judge freshness by mtime).
+        New text is written to a per-process temp file and renamed over the
+        old one, so a prompt reading concurrently never sees a partial line
+        and concurrent writers never share a temp file.
+        """
+        status_file = _STATUS_FILE.with_name(status_file_name(self.profile))
+        data = status_text.encode('utf-8')
+        try:
+            with open(status_file, 'rb') as f:
+                if f.read(len(data) + 1) == data:
+                    if time.time() - os.fstat(f.fileno()).st_mtime >= 1:
+                        os.utime(f.fileno())
+                    return
+        except OSError:
+            pass
+
+        temp_file = status_file.with_name(f'{status_file.name}.{os.getpid()}.tmp')
+        if not _link_tmpfile(status_file.parent, temp_file, data):
+            try:
+                f = open(temp_file, 'wb')
+            except FileNotFoundError:
+                # First run: ~/.cache doesn't exist yet
+                status_file.parent.mkdir(parents=True, exist_ok=True)
+                f = open(temp_file, 'wb')
+            with f:
+                f.write(data)
+        temp_file.replace(status_file)
+    
+    def _update_status_file(self):
+        """
+        Refresh the shell status file after a switch or fronters fetch
+        
+        With async_status_update enabled this happens in a detached process,
+        so the command returns without waiting for it. A fresh interpreter is
+        used rather than os.fork(): the daemon client may already have its
+        background event loop thread running, which a forked child wouldn't have.
+        """
+        if self.config.async_status_update:
+            try:
+                subprocess.Popen(
+                    [sys.executable, '-m', 'simplyplural.cli',
+                     '--profile', self.profile, '_internal_update_status'],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+                return
+            except OSError:
+                pass  # Fall back to updating in the foreground
+        try:
+            self.cmd_internal_update_status()
+        except (OSError, APIError):
+            pass  # Don't fail the command if status update fails
+    
+    def _refresh_lock_path(self) -> Path:
+        """This profile's background refresh lock file"""
+        return _REFRESH_LOCK_FILE.with_name(refresh_lock_name(self.profile))
+    
     def _start_background_refresh(self):
-        """Start a background cache refresh if one isn't already running"""
+        """
+        Start a background cache refresh if one isn't already running
+        
+        The refresh runs in a forked child, which already has the config,
+        cache and modules loaded, so the prompt doesn't pay for starting
+        another interpreter. The parent returns immediately. If fork()
+        fails, `sp _internal_refresh` is started in a new process instead.
+        """
+        if not hasattr(os, 'fork'):
+            return
+        
+        # Held by the refreshing child for its lifetime
+        lock_fd = _acquire_refresh_lock(self._refresh_lock_path())
+        if lock_fd is None:
+            return  # Another refresh is running
+        
+        # Only the forking thread survives in the child, so stop the daemon
+        # client's event loop thread (if it was started) first
+        self.daemon_client.close()
+        
+        try:
+            pid = os.fork()
+        except OSError:
+            pid = None
+        if pid != 0:
+            # Parent: the child keeps the lock through its own copy of the fd
+            os.close(lock_fd)
+            if pid is None:
+                self._spawn_refresh_process()
+            return
+        
+        # Child: detach from the terminal, refresh, and exit without running
+        # the parent's cleanup handlers
+        try:
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            self._refresh_fronters()
+        except BaseException:
+            pass
+        finally:
+            os._exit(0)
+    
+    def _spawn_refresh_process(self):
+        """Run `sp _internal_refresh` detached (it takes the refresh lock itself)"""
         try:
-            import subprocess
-            import os
-            
-            lock_file = Path.home() / '.cache' / 'sp_refresh.lock'
-            
-            # Check if refresh is already running
-            if lock_file.exists():
-                # Check lock file age - if > 2 minutes old, assume stale
-                try:
-                    lock_age = time.time() - lock_file.stat().st_mtime
-                    if lock_age < 120:  # 2 minutes
-                        return  # Another refresh is running
-                    else:
-                        # Stale lock, remove it
-                        lock_file.unlink()
-                except:
-                    pass  # If we can't check, proceed anyway
-            
-            # Start background refresh
-            # Use subprocess to avoid blocking the shell prompt
-            script_path = Path(__file__).resolve()
-            python_exe = sys.executable
-            
-            # Background command that:
-            # 1. Creates lock file
-            # 2. Fetches fronters (populates cache)
-            # 3. Updates status file
-            # 4. Removes lock file
-            refresh_cmd = f'''
-            (
-                echo $ > "{lock_file}" &&
-                "{python_exe}" "{script_path}" fronting --format=simple >/dev/null 2>&1 &&
-                "{python_exe}" "{script_path}" _internal_update_status >/dev/null 2>&1;
-                rm -f "{lock_file}" 2>/dev/null || true
-            ) &
-            '''
-            
-            # Execute in background shell
             subprocess.Popen(
-                refresh_cmd,
-                shell=True,
+                [sys.executable, '-m', 'simplyplural.cli',
+                 '--profile', self.profile, '_internal_refresh'],
+                stdin=subprocess.DEVNULL,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
-                start_new_session=True  # Detach from parent
+                start_new_session=True,
             )
-            
-        except Exception:
-            # If background refresh fails, that's okay - just continue
-            pass
+        except OSError:
+            pass  # If background refresh fails, that's okay - just continue
+    
+    def cmd_internal_refresh(self):
+        """Internal command: refresh the fronters cache and status file now"""
+        lock_fd = _acquire_refresh_lock(self._refresh_lock_path())
+        if lock_fd is None:
+            return 0  # Another refresh is already doing it
+        try:
+            self._refresh_fronters()
+        except Exception as e:
+            if self.debug:
+                print(f"DEBUG: internal_refresh error: {e}")
+            return 1
+        finally:
+            os.close(lock_fd)
+        return 0
+    
+    def _refresh_fronters(self):
+        """Fetch fronters from the API into the cache and rewrite the status file"""
+        if not self.api:
+            return
+        fronters = self.api.get_fronters()
+        self.cache.set_fronters(fronters)
+        # Other shells judge freshness by the file, so write it now
+        self.cache.flush()
+        self._write_status(_status_text(_status_names(_fronter_list(fronters))))
+
+
+# Fronter display commands and their default --format; these run on every
+# prompt render, so main() parses them by hand instead of building the
+# full argparse tree
+_FRONTING_COMMANDS = {'fronting': 'text', 'who': 'text', 'w': 'text', 'status': 'prompt'}
+_FRONTING_FORMATS = ('text', 'json', 'prompt', 'simple')
+
+
+def _parse_fronting_argv(argv: List[str]) -> Optional[str]:
+    """
+    Return the output format for a plain fronter query, or None
+
+    Only `<command>`, `<command> --format=X` and `<command> --format X` are
+    recognized; anything else (global options, invalid formats, --help) is
+    left to argparse so errors and help output stay the same.
+    """
+    if not argv or argv[0] not in _FRONTING_COMMANDS:
+        return None
+    rest = argv[1:]
+    if not rest:
+        return _FRONTING_COMMANDS[argv[0]]
+    if len(rest) == 1 and rest[0].startswith('--format='):
+        fmt = rest[0][len('--format='):]
+    elif len(rest) == 2 and rest[0] == '--format':
+        fmt = rest[1]
+    else:
+        return None
+    return fmt if fmt in _FRONTING_FORMATS else None
+
+
+def _parse_internal_status_argv(argv: List[str]) -> Optional[str]:
+    """
+    Return the profile for an `_internal_update_status` call, or None
+
+    The shell integration runs this before every prompt, as
+    `sp [--profile=NAME | --profile NAME] _internal_update_status`.
+    """
+    if not argv or argv[-1] != '_internal_update_status':
+        return None
+    options = argv[:-1]
+    if not options:
+        return 'default'
+    if len(options) == 1 and options[0].startswith('--profile='):
+        return options[0][len('--profile='):] or None
+    if len(options) == 2 and options[0] == '--profile':
+        return options[1]
+    return None
+
+
+def _add_switch_arguments(parser):
+    parser.add_argument('members', nargs='+', help='Member name(s)')
+    parser.add_argument('--note', help='Add a note to the switch')
+    parser.add_argument('--co', '--add', action='store_true', help='Add co-fronter to existing fronters')
+
+
+def _add_format_argument(default: str):
+    def add_arguments(parser):
+        parser.add_argument('--format', choices=_FRONTING_FORMATS,
+                            default=default, help='Output format')
+    return add_arguments
+
+
+def _add_members_arguments(parser):
+    parser.add_argument('--fronting', action='store_true', help='Show only current fronters')
+    parser.add_argument('--include-custom', action='store_true', help='Include custom fronts in the listing')
+
+
+def _add_custom_fronts_arguments(parser):
+    import argparse
+    parser.add_argument('--help-alias', action='store_true', help=argparse.SUPPRESS)
+
+
+def _add_history_arguments(parser):
+    parser.add_argument('--today', action='store_const', const='today', dest='period', 
+                        help='Show today\'s switches')
+    parser.add_argument('--week', action='store_const', const='week', dest='period',
+                        help='Show this week\'s switches')
+    parser.add_argument('--count', type=int, default=10, help='Number of switches to show (max 1000)')
+
+
+def _add_backup_arguments(parser):
+    parser.add_argument('--output', help='Output file name')
+
+
+def _add_config_arguments(parser):
+    parser.add_argument('--setup', action='store_true', help='Run setup wizard')
+    parser.add_argument('--show', action='store_true', help='Show current configuration')
+    parser.add_argument('--edit', action='store_true', help='Edit configuration file')
+    parser.add_argument('--example', action='store_true', help='Output example configuration to stdout')
+    parser.add_argument('--list-profiles', action='store_true', help='List all profiles')
+    parser.add_argument('--create-profile', metavar='NAME', help='Create a new profile')
+    parser.add_argument('--delete-profile', metavar='NAME', help='Delete a profile')
+
+
+def _add_help_arguments(parser):
+    parser.add_argument('topic', nargs='?', help='Help topic (optional)')
+
+
+def _add_shell_arguments(parser):
+    parser.add_argument('action', choices=['generate', 'install'], 
+                        help='Generate integration script or install it')
+
+
+def _add_cache_arguments(parser):
+    parser.add_argument('action', choices=['clear'], help='Cache action to perform')
+    parser.add_argument('--all', action='store_true', dest='all_profiles',
+                        help='Clear cache for all profiles (default: current profile only)')
+
+
+def _add_daemon_arguments(parser):
+    parser.add_argument('action', choices=['start', 'stop', 'status', 'restart'],
+                        help='Daemon action to perform')
+
+
+def _add_debug_arguments(parser):
+    parser.add_argument('action', choices=['cache', 'config', 'purge'], 
+                        help='Debug action to perform')
+
+
+# Subcommand name -> (help text, function adding its arguments), in the
+# order `sp --help` lists them. A help text of None hides the command.
+_SUBCOMMANDS = {
+    'version': ('Show version', None),
+    'switch': ('Register a switch', _add_switch_arguments),
+    'sw': ('Register a switch', _add_switch_arguments),
+    'fronting': ('Show current fronter(s)', _add_format_argument('text')),
+    'who': ('Show current fronter(s)', _add_format_argument('text')),
+    'w': ('Show current fronter(s)', _add_format_argument('text')),
+    'members': ('List members', _add_members_arguments),
+    'custom-fronts': ('List custom fronts', _add_custom_fronts_arguments),
+    'history': ('Show switch history', _add_history_arguments),
+    'backup': ('Export data', _add_backup_arguments),
+    'config': ('Configuration', _add_config_arguments),
+    'help': ('Show help message', _add_help_arguments),
+    'status': ('Get status (alias for fronting)', _add_format_argument('prompt')),
+    'shell': ('Generate shell integration', _add_shell_arguments),
+    '_internal_update_status': (None, None),
+    '_internal_refresh': (None, None),
+    'cache': ('Cache management', _add_cache_arguments),
+    'daemon': ('Daemon management (real-time updates)', _add_daemon_arguments),
+    'debug': ('Debug and diagnostic commands', _add_debug_arguments),
+}
+
+
+def _run_fronting(cli, args):
+    return cli.cmd_fronting(args.format)
+
+
+def _run_switch(cli, args):
+    return cli.cmd_switch(args.members, args.note, args.co)
+
+
+# Subcommand name -> function(cli, args) running it ('version' is answered
+# before a SimplyPluralCLI is built)
+_HANDLERS = {
+    'switch': _run_switch,
+    'sw': _run_switch,
+    'fronting': _run_fronting,
+    'who': _run_fronting,
+    'w': _run_fronting,
+    'status': _run_fronting,
+    'members': lambda cli, args: cli.cmd_members(args.fronting, args.include_custom),
+    'custom-fronts': lambda cli, args: cli.cmd_custom_fronts(),
+    'history': lambda cli, args: cli.cmd_history(args.period or 'recent', args.count),
+    'backup': lambda cli, args: cli.cmd_backup(args.output),
+    'config': lambda cli, args: cli.cmd_config(args.setup, args.show, args.edit, args.example,
+                                               args.list_profiles, args.create_profile,
+                                               args.delete_profile),
+    'help': lambda cli, args: cli.cmd_help(args.topic),
+    'shell': lambda cli, args: cli.cmd_shell(args.action),
+    # 'clear' is the only action argparse accepts
+    'cache': lambda cli, args: cli.cmd_cache_clear(args.all_profiles),
+    'daemon': lambda cli, args: cli.cmd_daemon(args.action),
+    'debug': lambda cli, args: cli.cmd_debug(args.action),
+    '_internal_update_status': lambda cli, args: cli.cmd_internal_update_status(),
+    '_internal_refresh': lambda cli, args: cli.cmd_internal_refresh(),
+}
+
+
+def _find_subcommand(argv: List[str]) -> Optional[str]:
+    """
+    Return the subcommand named in argv, skipping global options
+
+    Returns None if an option other than --profile/--debug comes first
+    (e.g. --help or --version), so the caller builds the full parser.
+    """
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == '--profile':
+            i += 2
+        elif arg.startswith('--profile=') or arg == '--debug':
+            i += 1
+        elif arg.startswith('-'):
+            return None
+        else:
+            return arg
+    return None
 
 
 def main():
+    argv = sys.argv[1:]
+    profile = _parse_internal_status_argv(argv)
+    if profile is not None:
+        return SimplyPluralCLI(profile, False).cmd_internal_update_status()
+
+    fmt = _parse_fronting_argv(argv)
+    if fmt is not None:
+        return SimplyPluralCLI('default', False).cmd_fronting(fmt)
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog='sp',
         description='Simply Plural CLI',
@@ -1284,99 +1774,18 @@ def main():
 
     subparsers = parser.add_subparsers(dest='command', help='Commands')
 
-    # Version command (same as --version but as a subcommand)
-    subparsers.add_parser('version', help='Show version')
-    
-    # Switch command
-    switch_parser = subparsers.add_parser('switch', help='Register a switch')
-    switch_parser.add_argument('members', nargs='+', help='Member name(s)')
-    switch_parser.add_argument('--note', help='Add a note to the switch')
-    switch_parser.add_argument('--co', '--add', action='store_true', help='Add co-fronter to existing fronters')
-
-    # sw command (alias for switch)
-    sw_parser = subparsers.add_parser('sw', help='Register a switch')
-    sw_parser.add_argument('members', nargs='+', help='Member name(s)')
-    sw_parser.add_argument('--note', help='Add a note to the switch')
-    sw_parser.add_argument('--co', '--add', action='store_true', help='Add co-fronter to existing fronters')
-
-    
-    # Fronting command
-    fronting_parser = subparsers.add_parser('fronting', help='Show current fronter(s)')
-    fronting_parser.add_argument('--format', choices=['text', 'json', 'prompt', 'simple'],
-                                default='text', help='Output format')
-    
-    # Who command (alias for fronting)
-    who_parser = subparsers.add_parser('who', help='Show current fronter(s)')
-    who_parser.add_argument('--format', choices=['text', 'json', 'prompt', 'simple'],
-                           default='text', help='Output format')
-    
-    # w command (alias for who)
-    w_parser = subparsers.add_parser('w', help='Show current fronter(s)')
-    w_parser.add_argument('--format', choices=['text', 'json', 'prompt', 'simple'],
-                         default='text', help='Output format')
-    # Members command
-    members_parser = subparsers.add_parser('members', help='List members')
-    members_parser.add_argument('--fronting', action='store_true', help='Show only current fronters')
-    members_parser.add_argument('--include-custom', action='store_true', help='Include custom fronts in the listing')
-    
-    # Custom fronts command
-    custom_fronts_parser = subparsers.add_parser('custom-fronts', help='List custom fronts')
-    custom_fronts_parser.add_argument('--help-alias', action='store_true', help=argparse.SUPPRESS)
-    
-    # History command
-    history_parser = subparsers.add_parser('history', help='Show switch history')
-    history_parser.add_argument('--today', action='store_const', const='today', dest='period', 
-                               help='Show today\'s switches')
-    history_parser.add_argument('--week', action='store_const', const='week', dest='period',
-                               help='Show this week\'s switches')
-    history_parser.add_argument('--count', type=int, default=10, help='Number of switches to show (max 1000)')
-    
-    # Backup command
-    backup_parser = subparsers.add_parser('backup', help='Export data')
-    backup_parser.add_argument('--output', help='Output file name')
-    
-    # Config command
-    config_parser = subparsers.add_parser('config', help='Configuration')
-    config_parser.add_argument('--setup', action='store_true', help='Run setup wizard')
-    config_parser.add_argument('--show', action='store_true', help='Show current configuration')
-    config_parser.add_argument('--edit', action='store_true', help='Edit configuration file')
-    config_parser.add_argument('--example', action='store_true', help='Output example configuration to stdout')
-    config_parser.add_argument('--list-profiles', action='store_true', help='List all profiles')
-    config_parser.add_argument('--create-profile', metavar='NAME', help='Create a new profile')
-    config_parser.add_argument('--delete-profile', metavar='NAME', help='Delete a profile')
-    
-    # Help command
-    help_parser = subparsers.add_parser('help', help='Show help message')
-    help_parser.add_argument('topic', nargs='?', help='Help topic (optional)')
-    
-    # Status command
-    status_parser = subparsers.add_parser('status', help='Get status (alias for fronting)')
-    status_parser.add_argument('--format', choices=['text', 'json', 'prompt', 'simple'], 
-                              default='prompt', help='Output format')
-    
-    # Shell integration command
-    shell_parser = subparsers.add_parser('shell', help='Generate shell integration')
-    shell_parser.add_argument('action', choices=['generate', 'install'], 
-                             help='Generate integration script or install it')
-    
-    # Internal commands
-    internal_parser = subparsers.add_parser('_internal_update_status', help=argparse.SUPPRESS)
-    
-    # Cache commands
-    cache_parser = subparsers.add_parser('cache', help='Cache management')
-    cache_parser.add_argument('action', choices=['clear'], help='Cache action to perform')
-    cache_parser.add_argument('--all', action='store_true', dest='all_profiles',
-                             help='Clear cache for all profiles (default: current profile only)')
-    
-    # Daemon commands
-    daemon_parser = subparsers.add_parser('daemon', help='Daemon management (real-time updates)')
-    daemon_parser.add_argument('action', choices=['start', 'stop', 'status', 'restart'],
-                              help='Daemon action to perform')
-    
-    # Debug commands
-    debug_parser = subparsers.add_parser('debug', help='Debug and diagnostic commands')
-    debug_parser.add_argument('action', choices=['cache', 'config', 'purge'], 
-                             help='Debug action to perform')
+    # Only the requested subcommand's parser is needed, unless argparse may
+    # have to list them all (top-level help, missing or unknown command)
+    command = _find_subcommand(argv)
+    if command in _SUBCOMMANDS:
+        selected = {command: _SUBCOMMANDS[command]}
+    else:
+        selected = _SUBCOMMANDS
+    for name, (help_text, add_arguments) in selected.items():
+        subparser = subparsers.add_parser(
+            name, help=argparse.SUPPRESS if help_text is None else help_text)
+        if add_arguments is not None:
+            add_arguments(subparser)
     
     args = parser.parse_args()
     
@@ -1390,47 +1799,7 @@ def main():
 
     cli = SimplyPluralCLI(args.profile, args.debug)
     
-    # Route commands
-    if args.command in ['switch','sw']:
-        return cli.cmd_switch(args.members, args.note, args.co)
-    elif args.command in ['fronting', 'who', 'w']:
-        return cli.cmd_fronting(args.format)
-    elif args.command == 'members':
-        return cli.cmd_members(args.fronting, getattr(args, 'include_custom', False))
-    elif args.command == 'custom-fronts':
-        return cli.cmd_custom_fronts()
-    elif args.command == 'history':
-        period = getattr(args, 'period', 'recent')
-        return cli.cmd_history(period, args.count)
-    elif args.command == 'backup':
-        return cli.cmd_backup(args.output)
-    elif args.command == 'config':
-        return cli.cmd_config(args.setup, args.show, args.edit, args.example,
-                             getattr(args, 'list_profiles', False),
-                             getattr(args, 'create_profile', None),
-                             getattr(args, 'delete_profile', None))
-    elif args.command == 'help':
-        return cli.cmd_help(getattr(args, 'topic', None))
-    elif args.command == 'status':
-        return cli.cmd_fronting(args.format)
-    elif args.command == 'shell':
-        return cli.cmd_shell(args.action)
-    elif args.command == 'cache':
-        if args.action == 'clear':
-            return cli.cmd_cache_clear(getattr(args, 'all_profiles', False))
-        else:
-            print(f"Unknown cache action: {args.action}", file=sys.stderr)
-            return 1
-    elif args.command == 'daemon':
-        return cli.cmd_daemon(args.action)
-    elif args.command == 'debug':
-        return cli.cmd_debug(args.action)
-    elif args.command == '_internal_update_status':
-        return cli.cmd_internal_update_status()
-    else:
-        print(f"Unknown command: {args.command}", file=sys.stderr)
-        return 1
-
+    return _HANDLERS[args.command](cli, args)
 
 if __name__ == '__main__':
     sys.exit(main())
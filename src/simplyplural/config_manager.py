@@ -21,6 +21,7 @@ import hashlib
 
 class ConfigManager:
     """Manages configuration for Simply Plural CLI"""
+    __slots__ = ('profile', 'config_dir', 'cache_dir', 'config_file', 'json_config_file', '_all_profiles', '_config')
     
     def __init__(self, profile: str = "default"):
         self.profile = profile
@@ -217,7 +218,9 @@ class ConfigManager:
             ("API Settings", [
                 "api_token",
                 "api_timeout", 
-                "max_retries"
+                "max_retries",
+                "retry_base_delay",
+                "retry_max_delay"
             ]),
             ("Display Settings", [
                 "default_output_format"
@@ -226,7 +229,9 @@ class ConfigManager:
                 "cache_fronters_ttl",
                 "cache_members_ttl",
                 "cache_switches_ttl",
-                "cache_custom_fronts_ttl"
+                "cache_custom_fronts_ttl",
+                "cache_fsync",
+                "cache_memory_max"
             ]),
             ("Shell Integration", [
                 "shell_update_interval"
@@ -308,6 +313,8 @@ class ConfigManager:
             'api_token': "",
             'api_timeout': 10,
             'max_retries': 3,
+            'retry_base_delay': 1.0,  # backoff before the first retry, doubling after
+            'retry_max_delay': 30,    # cap on the backoff between retries
             
             # Display Settings
             'default_output_format': "text",
@@ -320,9 +327,12 @@ class ConfigManager:
             'cache_members_ttl': 3600,    # 1 hour
             'cache_switches_ttl': 1800,   # 30 minutes
             'cache_custom_fronts_ttl': 3600,  # 1 hour (same as members)
+            'cache_fsync': False,  # force each cache write to disk (survives power loss)
+            'cache_memory_max': 512,  # entries kept in memory (least recently used dropped)
             
             # Shell Integration
             'shell_update_interval': 60,
+            'async_status_update': False,
 
             # Daemon
             'start_daemon': True,
@@ -439,6 +449,11 @@ class ConfigManager:
         """Get shell update interval in seconds"""
         return self._config.get('shell_update_interval', 60)
     
+    @property
+    def async_status_update(self) -> bool:
+        """Get whether switch/fronting update the shell status file in a background process"""
+        return self._config.get('async_status_update', False)
+    
     @property
     def default_output_format(self) -> str:
         """Get the default output format"""
@@ -572,6 +587,16 @@ class ConfigManager:
         """Get custom fronts cache TTL in seconds"""
         return self._config.get('cache_custom_fronts_ttl', 3600)
     
+    @property
+    def cache_fsync(self) -> bool:
+        """Get whether cache writes are fsynced before being renamed into place"""
+        return self._config.get('cache_fsync', False)
+    
+    @property
+    def cache_memory_max(self) -> int:
+        """Get the maximum number of entries kept in the in-memory cache"""
+        return self._config.get('cache_memory_max', 512)
+    
     @property
     def api_timeout(self) -> int:
         """Get API timeout in seconds"""
@@ -582,6 +607,16 @@ class ConfigManager:
         """Get maximum retries for API requests"""
         return self._config.get('max_retries', 3)
     
+    @property
+    def retry_base_delay(self) -> float:
+        """Get the backoff before the first API retry in seconds (doubled per retry)"""
+        return self._config.get('retry_base_delay', 1.0)
+    
+    @property
+    def retry_max_delay(self) -> float:
+        """Get the maximum backoff between API retries in seconds"""
+        return self._config.get('retry_max_delay', 30)
+    
     @property
     def default_output_format(self) -> str:
         """Get the default output format"""
@@ -13,7 +13,7 @@ import sys
 import time
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List
 import signal
 
 try:
@@ -23,6 +23,7 @@ except ImportError:
     print("Install with: pip3 install websockets>=12.0")
     sys.exit(1)
 
+from . import _json
 from .daemon_protocol import (
     WS_ENDPOINT_PROD,
     WS_KEEPALIVE_INTERVAL,
@@ -30,12 +31,16 @@ from .daemon_protocol import (
     WS_RECONNECT_INITIAL_DELAY,
     WS_RECONNECT_MAX_DELAY,
     WS_RECONNECT_MULTIPLIER,
+    SOCKET_IDLE_TIMEOUT,
     WebSocketOp,
     WSUpdateMessage,
     WSUpdateResult,
     Request,
     Response,
     CommandType,
+    encode_frame,
+    read_frame,
+    PING_FRAME,
 )
 
 
@@ -394,98 +399,83 @@ class DaemonState:
         self.last_update_times['front_history'] = time.time()
         self.logger.info(f"Seeded front_history with {len(self.front_history)} entries")
 
+    def _set_initial(self, kind: str, data: List[Dict[str, Any]]):
+        """Make fetched or cached data current ('fronters', 'members' or 'custom_fronts')"""
+        if kind == 'fronters':
+            self.current_fronters = data
+            self._seed_front_history(data)
+        elif kind == 'members':
+            self.members = {m.get('id') or m.get('_id'): m for m in data}
+        else:
+            self.custom_fronts = {cf.get('id') or cf.get('_id'): cf for cf in data}
+    
+    def _load_initial_from_cache(self, kind: str):
+        """Fall back to the cached data for one kind (see _set_initial)"""
+        if not self.cache:
+            return
+        try:
+            cached = self.cache.get(kind)
+        except Exception as e:
+            self.logger.error(f"Error loading {kind} from cache: {e}")
+            return
+        if cached:
+            self._set_initial(kind, cached)
+            self.logger.info(f"Loaded {len(cached)} {kind.replace('_', ' ')} from cache")
+    
+    def _apply_initial_fetch(self, kind: str, result):
+        """Use one API result from initialize(), or the cache if the fetch failed"""
+        if isinstance(result, BaseException):
+            self.logger.error(f"Error loading {kind} from API: {result}")
+            self.logger.info(f"Attempting to load {kind} from cache as fallback...")
+            self._load_initial_from_cache(kind)
+            return
+        if not result:
+            return
+        self._set_initial(kind, result)
+        self.last_update_times[kind] = time.time()
+        self.logger.info(f"Loaded {len(result)} {kind.replace('_', ' ')}")
+        
+        # Write to cache
+        if self.cache:
+            try:
+                self.cache.set(kind, result)
+            except Exception as e:
+                self.logger.error(f"Error caching {kind}: {e}")
+    
     async def initialize(self):
         """
         Initialize state with data from API or cache
         
-        Called on daemon startup to populate initial state
+        Called on daemon startup to populate initial state. Each kind of
+        data is applied on its own, so one failed fetch only falls back to
+        the cache for that kind.
         """
         self.logger.info("Initializing daemon state...")
         
         # Try to load from API if available
         if self.api:
+            # Members and custom fronts first, concurrently on worker
+            # threads. Once they're cached, get_fronters resolves names
+            # from them instead of downloading both lists again itself
+            members_data, custom_fronts_data = await asyncio.gather(
+                asyncio.to_thread(self.api.get_members),
+                asyncio.to_thread(self.api.get_custom_fronts),
+                return_exceptions=True,
+            )
+            self._apply_initial_fetch('members', members_data)
+            self._apply_initial_fetch('custom_fronts', custom_fronts_data)
+            
             try:
-                # Get current fronters
                 fronters_data = await asyncio.to_thread(self.api.get_fronters)
-                if fronters_data:
-                    self.current_fronters = fronters_data
-                    self.last_update_times['fronters'] = time.time()
-                    self.logger.info(f"Loaded {len(fronters_data)} current fronters")
-
-                    self._seed_front_history(fronters_data)
-
-                    # Write to cache
-                    if self.cache:
-                        self.cache.set_fronters(fronters_data)
-                
-                # Get members
-                members_data = await asyncio.to_thread(self.api.get_members)
-                if members_data:
-                    self.members = {m.get('id') or m.get('_id'): m for m in members_data}
-                    self.last_update_times['members'] = time.time()
-                    self.logger.info(f"Loaded {len(self.members)} members")
-                    
-                    # Write to cache
-                    if self.cache:
-                        self.cache.set_members(members_data)
-                
-                # Get custom fronts
-                custom_fronts_data = await asyncio.to_thread(self.api.get_custom_fronts)
-                if custom_fronts_data:
-                    self.custom_fronts = {cf.get('id') or cf.get('_id'): cf for cf in custom_fronts_data}
-                    self.last_update_times['custom_fronts'] = time.time()
-                    self.logger.info(f"Loaded {len(self.custom_fronts)} custom fronts")
-                    
-                    # Write to cache
-                    if self.cache:
-                        self.cache.set_custom_fronts(custom_fronts_data)
-                
             except Exception as e:
-                self.logger.error(f"Error initializing from API: {e}")
-                
-                # Fallback to cache on error
-                if self.cache:
-                    self.logger.info("Attempting to load from cache as fallback...")
-                    try:
-                        cached_fronters = self.cache.get_fronters()
-                        if cached_fronters:
-                            self.current_fronters = cached_fronters
-                            self._seed_front_history(cached_fronters)
-                            self.logger.info(f"Loaded {len(cached_fronters)} fronters from cache")
-
-                        cached_members = self.cache.get_members()
-                        if cached_members:
-                            self.members = {m.get('id') or m.get('_id'): m for m in cached_members}
-                            self.logger.info(f"Loaded {len(self.members)} members from cache")
-
-                        cached_custom_fronts = self.cache.get_custom_fronts()
-                        if cached_custom_fronts:
-                            self.custom_fronts = {cf.get('id') or cf.get('_id'): cf for cf in cached_custom_fronts}
-                            self.logger.info(f"Loaded {len(self.custom_fronts)} custom fronts from cache")
-                    except Exception as cache_error:
-                        self.logger.error(f"Error loading from cache: {cache_error}")
-
+                fronters_data = e
+            self._apply_initial_fetch('fronters', fronters_data)
+        
         # If no API, try cache first
         elif self.cache:
             self.logger.info("No API client available, loading from cache...")
-            try:
-                cached_fronters = self.cache.get_fronters()
-                if cached_fronters:
-                    self.current_fronters = cached_fronters
-                    self._seed_front_history(cached_fronters)
-                    self.logger.info(f"Loaded {len(cached_fronters)} fronters from cache")
-                
-                cached_members = self.cache.get_members()
-                if cached_members:
-                    self.members = {m.get('id') or m.get('_id'): m for m in cached_members}
-                    self.logger.info(f"Loaded {len(self.members)} members from cache")
-                
-                cached_custom_fronts = self.cache.get_custom_fronts()
-                if cached_custom_fronts:
-                    self.custom_fronts = {cf.get('id') or cf.get('_id'): cf for cf in cached_custom_fronts}
-                    self.logger.info(f"Loaded {len(self.custom_fronts)} custom fronts from cache")
-            except Exception as e:
-                self.logger.error(f"Error loading from cache: {e}")
+            for kind in ('fronters', 'members', 'custom_fronts'):
+                self._load_initial_from_cache(kind)
         
         self.logger.info("State initialization complete")
     
@@ -573,23 +563,18 @@ class DaemonState:
             self.members[obj_id] = content
             name = content.get('content', {}).get('name', obj_id) if 'content' in content else content.get('name', obj_id)
             self.logger.info(f"Updated member: {name}")
-            
-            # Write to disk cache (individual member)
-            if self.cache:
-                try:
-                    self.cache.set_member(obj_id, content)
-                    self.logger.debug(f"Updated member cache for {name}")
-                except Exception as e:
-                    self.logger.error(f"Error updating member cache: {e}")
         
-        # Update full members list in cache
+        # Update the member's own entry and the full members list in cache,
+        # written as one batch
         if self.cache:
             try:
-                members_list = list(self.members.values())
-                self.cache.set_members(members_list)
-                self.logger.debug("Updated full members list cache")
+                entries = {'members': list(self.members.values())}
+                if operation != "delete":
+                    entries[f'member_{obj_id}'] = content
+                self.cache.set_many(entries)
+                self.logger.debug("Updated members cache")
             except Exception as e:
-                self.logger.error(f"Error updating members list cache: {e}")
+                self.logger.error(f"Error updating members cache: {e}")
     
     async def _handle_custom_front_update(self, operation: str, obj_id: str, content: Dict[str, Any]):
         """Handle custom front updates"""
@@ -609,23 +594,18 @@ class DaemonState:
             self.custom_fronts[obj_id] = content
             name = content.get('content', {}).get('name', obj_id) if 'content' in content else content.get('name', obj_id)
             self.logger.info(f"Updated custom front: {name}")
-            
-            # Write to disk cache (individual custom front)
-            if self.cache:
-                try:
-                    self.cache.set_custom_front(obj_id, content)
-                    self.logger.debug(f"Updated custom front cache for {name}")
-                except Exception as e:
-                    self.logger.error(f"Error updating custom front cache: {e}")
         
-        # Update full custom fronts list in cache
+        # Update the custom front's own entry and the full list in cache,
+        # written as one batch
         if self.cache:
             try:
-                custom_fronts_list = list(self.custom_fronts.values())
-                self.cache.set_custom_fronts(custom_fronts_list)
-                self.logger.debug("Updated full custom fronts list cache")
+                entries = {'custom_fronts': list(self.custom_fronts.values())}
+                if operation != "delete":
+                    entries[f'custom_front_{obj_id}'] = content
+                self.cache.set_many(entries)
+                self.logger.debug("Updated custom fronts cache")
             except Exception as e:
-                self.logger.error(f"Error updating custom fronts list cache: {e}")
+                self.logger.error(f"Error updating custom fronts cache: {e}")
     
     def get_fronters(self) -> Dict[str, Any]:
         """Get current fronters (instant, from memory)"""
@@ -743,42 +723,49 @@ class UnixSocketServer:
         self.logger.debug(f"Client {client_id} connected")
         
         try:
-            # Read request (with timeout)
-            request_data = await asyncio.wait_for(reader.read(8192), timeout=5.0)
-            
-            if not request_data:
-                self.logger.debug(f"Client {client_id} sent empty request")
-                return
-            
-            request_str = request_data.decode('utf-8')
-            self.logger.debug(f"Client {client_id} request: {request_str[:200]}")
-            
-            # Parse request
-            try:
-                request_dict = json.loads(request_str)
-                request = Request.from_dict(request_dict)
-            except Exception as e:
-                error_response = Response.error("unknown", f"Invalid request: {e}")
-                writer.write(error_response.to_json().encode('utf-8'))
+            # Serve requests until the client disconnects or goes idle
+            while self.running:
+                try:
+                    request_data = await read_frame(reader, timeout=SOCKET_IDLE_TIMEOUT)
+                except asyncio.IncompleteReadError:
+                    break
+                
+                if not request_data:
+                    # Health check: answer without touching JSON
+                    writer.write(PING_FRAME)
+                    continue
+                
+                self.logger.debug(f"Client {client_id} request: {request_data[:200]!r}")
+                
+                # Parse request
+                try:
+                    request_dict = _json.loads(request_data)
+                    request = Request.from_dict(request_dict)
+                except Exception as e:
+                    response = Response.error("unknown", f"Invalid request: {e}")
+                else:
+                    # Handle command
+                    response = await self.handle_command(request)
+                
+                # Send response frame
+                writer.write(encode_frame(response.to_json_bytes()))
                 await writer.drain()
-                return
-            
-            # Handle command
-            response = await self.handle_command(request)
-            
-            # Send response
-            writer.write(response.to_json().encode('utf-8'))
-            await writer.drain()
-            
-            self.logger.debug(f"Client {client_id} response sent")
+                
+                self.logger.debug(f"Client {client_id} response sent")
             
         except asyncio.TimeoutError:
-            self.logger.warning(f"Client {client_id} timeout")
+            self.logger.debug(f"Client {client_id} idle timeout")
+        except asyncio.CancelledError:
+            # Event loop is shutting down with this connection still open
+            pass
         except Exception as e:
             self.logger.error(f"Error handling client {client_id}: {e}")
         finally:
             writer.close()
-            await writer.wait_closed()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
             self.logger.debug(f"Client {client_id} disconnected")
     
     async def handle_command(self, request: Request) -> Response:
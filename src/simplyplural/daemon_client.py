@@ -7,19 +7,62 @@ Provides high-level methods for querying daemon state.
 """
 
 import asyncio
-import json
+import concurrent.futures
 import os
+import socket
+import struct
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
+from . import _json
 from .daemon_protocol import (
     Request,
     Response,
     CommandType,
     ResponseStatus,
+    encode_frame,
+    read_frame,
+    PING_FRAME,
 )
 
 
+# Requests at or below this size are written without awaiting drain()
+_DRAIN_THRESHOLD = 32 * 1024
+
+# struct ucred {pid_t pid; uid_t uid; gid_t gid;} returned by SO_PEERCRED
+_SO_PEERCRED = getattr(socket, 'SO_PEERCRED', None)
+_PEERCRED = struct.Struct('3i')
+
+# Framed payloads for the argument-less commands, built once at import. The
+# request_id only needs to be unique per in-flight request, and a connection
+# carries one request at a time, so a fixed per-command ID is fine.
+_PRESERIALIZED = {
+    command: encode_frame(Request(command=command, request_id=command.value).to_json_bytes())
+    for command in (
+        CommandType.PING,
+        CommandType.STATUS,
+        CommandType.FRONTING,
+        CommandType.MEMBERS,
+        CommandType.CUSTOM_FRONTS,
+        CommandType.RELOAD,
+    )
+}
+
+
+def _fast_status_and_data(raw: bytes) -> Tuple[bool, Any, Optional[str]]:
+    """
+    Pull (ok, data, error) out of a raw response frame
+    
+    Hot-path alternative to Response.from_dict() for callers that only look
+    at these three fields.
+    """
+    d = _json.loads(raw)
+    if not isinstance(d, dict):
+        raise ValueError("response is not a JSON object")
+    return d.get('status') == ResponseStatus.OK.value, d.get('data'), d.get('error')
+
+
 class DaemonClient:
     """
     Client for connecting to Simply Plural daemon
@@ -38,15 +81,145 @@ class DaemonClient:
         self.profile = profile
         self.timeout = timeout
         self.socket_path = f"/tmp/sp-daemon-{profile}.sock"
+        
+        # Persistent keep-alive connection (opened lazily, see _ensure_conn)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._conn_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Connected socket left over from is_running(), handed to _ensure_conn
+        self._probe_sock: Optional[socket.socket] = None
+    
+    async def __aenter__(self) -> 'DaemonClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     def is_running(self) -> bool:
         """
         Check if daemon is running
         
+        Probes by actually connecting, so a stale socket file left behind by
+        a crashed daemon reports False. A successful probe connection is kept
+        and reused by the next request instead of connecting again.
+        
         Returns:
-            True if daemon socket exists and is accessible
+            True if daemon socket accepts connections
+        """
+        self._drop_probe()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(0.1)
+        if sock.connect_ex(self.socket_path) != 0:
+            sock.close()
+            return False
+        self._probe_sock = sock
+        return True
+    
+    def _drop_probe(self):
+        """Close the cached probe connection, if any"""
+        sock, self._probe_sock = self._probe_sock, None
+        if sock is not None:
+            sock.close()
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """
+        Get the connection lock for the running event loop
+        
+        Streams and locks are bound to the loop that created them, so if we
+        are called from a different loop the old connection is dropped.
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._conn_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._reader = self._writer = None
+            self._conn_loop = loop
+        return self._lock
+    
+    async def _ensure_conn(self):
+        """Open the Unix socket connection if we don't have a usable one"""
+        if self._writer is None or self._writer.is_closing():
+            sock, self._probe_sock = self._probe_sock, None
+            if sock is not None:
+                reader, writer = await asyncio.open_unix_connection(sock=sock)
+            else:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_unix_connection(self.socket_path),
+                    timeout=self.timeout
+                )
+            try:
+                self._check_peer(writer.get_extra_info('socket'))
+            except ConnectionError:
+                writer.close()
+                raise
+            self._reader, self._writer = reader, writer
+    
+    def _check_peer(self, sock):
+        """
+        Verify the process on the other end of the socket is running as us
+        
+        The socket lives in /tmp, so another user could create it first and
+        receive our requests. Checked once per connection via SO_PEERCRED
+        (Linux only; skipped elsewhere).
         """
-        return os.path.exists(self.socket_path)
+        if _SO_PEERCRED is None or sock is None:
+            return
+        creds = sock.getsockopt(socket.SOL_SOCKET, _SO_PEERCRED, _PEERCRED.size)
+        pid, uid, gid = _PEERCRED.unpack(creds)
+        if uid != os.getuid():
+            raise ConnectionError(
+                f"Daemon socket {self.socket_path} is owned by another user "
+                f"(pid {pid}, uid {uid}); remove it and restart the daemon"
+            )
+    
+    def _reset_conn(self):
+        """Drop the current connection so the next request reconnects"""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+    
+    async def _exchange(self, payload: bytes, count: int = 1) -> List[bytes]:
+        """
+        Write framed request(s) and read count framed responses
+        
+        payload may hold several frames back to back; the daemon answers them
+        in order on the same connection, so responses come back in the order
+        the requests were written.
+        
+        Retries once on a fresh connection if the kept-alive one was closed
+        by the daemon (idle timeout, restart). Must be called with the lock held.
+        """
+        for attempt in range(2):
+            await self._ensure_conn()
+            try:
+                self._writer.write(payload)
+                # Small requests go straight into the socket buffer, so only
+                # wait for the write side when there could be backpressure.
+                # A dead connection still surfaces on the read below.
+                if len(payload) > _DRAIN_THRESHOLD:
+                    await self._writer.drain()
+                return [await read_frame(self._reader, timeout=self.timeout) for _ in range(count)]
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                self._reset_conn()
+                if attempt:
+                    raise
+            except BaseException:
+                # Stream state is unknown (e.g. timed out mid-response)
+                self._reset_conn()
+                raise
+    
+    async def close(self):
+        """Close the persistent connection, if any"""
+        self._drop_probe()
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
     
     async def send_request(self, request: Request) -> Response:
         """
@@ -62,54 +235,97 @@ class DaemonClient:
             ConnectionError: If cannot connect to daemon
             TimeoutError: If request times out
         """
-        if not self.is_running():
-            raise ConnectionError(f"Daemon not running (socket not found: {self.socket_path})")
+        return await self.send_raw(encode_frame(request.to_json_bytes()))
+    
+    async def send_raw(self, payload: bytes) -> Response:
+        """
+        Send an already framed request to the daemon
         
-        try:
-            # Connect to Unix socket
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_unix_connection(self.socket_path),
-                timeout=self.timeout
-            )
-            
-            # Send request
-            request_json = request.to_json()
-            writer.write(request_json.encode('utf-8'))
-            await writer.drain()
-            
-            # Read response
-            response_data = await asyncio.wait_for(
-                reader.read(1024 * 1024),  # 1MB max
-                timeout=self.timeout
-            )
-            
-            # Close connection
-            writer.close()
-            await writer.wait_closed()
+        Args:
+            payload: Length-prefixed request bytes (see encode_frame)
             
-            # Parse response
-            response_json = response_data.decode('utf-8')
-            response_dict = json.loads(response_json)
-            response = Response.from_dict(response_dict)
+        Returns:
+            Response object
             
-            return response
+        Raises:
+            ConnectionError: If cannot connect to daemon
+            TimeoutError: If request times out
+        """
+        response_data, = await self._roundtrip(payload)
+        try:
+            # Parse response (straight from bytes, no intermediate decode)
+            return Response.from_dict(_json.loads(response_data))
+        except (ValueError, KeyError) as e:
+            raise ConnectionError(f"Invalid response from daemon: {e}")
+    
+    async def _roundtrip(self, payload: bytes, count: int = 1) -> List[bytes]:
+        """Exchange frames with the daemon, mapping failures to ConnectionError/TimeoutError"""
+        try:
+            async with self._get_lock():
+                return await self._exchange(payload, count)
             
         except asyncio.TimeoutError:
             raise TimeoutError(f"Request to daemon timed out after {self.timeout}s")
+        except (FileNotFoundError, ConnectionRefusedError):
+            # No separate existence check up front: connecting fails just as
+            # fast when the socket is missing or stale, without the extra stat()
+            raise ConnectionError(f"Daemon not running (socket: {self.socket_path})")
         except Exception as e:
             raise ConnectionError(f"Error communicating with daemon: {e}")
     
+    async def _query(self, command: CommandType) -> Tuple[bool, Any, Optional[str]]:
+        """Send a precomputed argument-less command, returning (ok, data, error)"""
+        response_data, = await self._roundtrip(_PRESERIALIZED[command])
+        try:
+            return _fast_status_and_data(response_data)
+        except ValueError as e:
+            raise ConnectionError(f"Invalid response from daemon: {e}")
+    
+    async def get_bulk(self, commands: List[CommandType]) -> Dict[CommandType, Response]:
+        """
+        Send several argument-less commands in one round trip
+        
+        All request frames are written back to back before any response is
+        read, so e.g. fronters + status costs one round trip instead of two.
+        
+        Args:
+            commands: Commands to send (e.g. [CommandType.FRONTING, CommandType.STATUS])
+            
+        Returns:
+            Dictionary mapping each command to its Response
+            
+        Raises:
+            ConnectionError: If cannot connect to daemon
+            TimeoutError: If request times out
+        """
+        commands = list(dict.fromkeys(commands))
+        payload = b''.join(
+            _PRESERIALIZED.get(command) or encode_frame(Request.create(command).to_json_bytes())
+            for command in commands
+        )
+        frames = await self._roundtrip(payload, len(commands))
+        try:
+            return {
+                command: Response.from_dict(_json.loads(frame))
+                for command, frame in zip(commands, frames)
+            }
+        except (ValueError, KeyError) as e:
+            raise ConnectionError(f"Invalid response from daemon: {e}")
+    
     async def ping(self) -> bool:
         """
         Ping the daemon
         
+        Sends an empty frame, which the daemon answers without any JSON
+        handling. Any reply frame means the daemon is up: older daemons
+        answer it with an error response rather than an empty frame.
+        
         Returns:
-            True if daemon responds successfully
+            True if daemon responds
         """
-        request = Request.create(CommandType.PING)
-        response = await self.send_request(request)
+        await self._roundtrip(PING_FRAME)
         
-        return response.status == ResponseStatus.OK
+        return True
     
     async def get_status(self) -> Dict[str, Any]:
         """
@@ -118,13 +334,12 @@ class DaemonClient:
         Returns:
             Dictionary with daemon status information
         """
-        request = Request.create(CommandType.STATUS)
-        response = await self.send_request(request)
+        ok, data, error = await self._query(CommandType.STATUS)
         
-        if response.status == ResponseStatus.OK:
-            return response.data
+        if ok:
+            return data
         else:
-            raise RuntimeError(f"Status request failed: {response.error}")
+            raise RuntimeError(f"Status request failed: {error}")
     
     async def get_fronters(self) -> Dict[str, Any]:
         """
@@ -133,13 +348,12 @@ class DaemonClient:
         Returns:
             Dictionary with fronters data
         """
-        request = Request.create(CommandType.FRONTING)
-        response = await self.send_request(request)
+        ok, data, error = await self._query(CommandType.FRONTING)
         
-        if response.status == ResponseStatus.OK:
-            return response.data
+        if ok:
+            return data
         else:
-            raise RuntimeError(f"Fronters request failed: {response.error}")
+            raise RuntimeError(f"Fronters request failed: {error}")
     
     async def get_members(self) -> Dict[str, Any]:
         """
@@ -148,13 +362,12 @@ class DaemonClient:
         Returns:
             Dictionary with members data
         """
-        request = Request.create(CommandType.MEMBERS)
-        response = await self.send_request(request)
+        ok, data, error = await self._query(CommandType.MEMBERS)
         
-        if response.status == ResponseStatus.OK:
-            return response.data
+        if ok:
+            return data
         else:
-            raise RuntimeError(f"Members request failed: {response.error}")
+            raise RuntimeError(f"Members request failed: {error}")
     
     async def get_custom_fronts(self) -> Dict[str, Any]:
         """
@@ -163,13 +376,12 @@ class DaemonClient:
         Returns:
             Dictionary with custom fronts data
         """
-        request = Request.create(CommandType.CUSTOM_FRONTS)
-        response = await self.send_request(request)
+        ok, data, error = await self._query(CommandType.CUSTOM_FRONTS)
         
-        if response.status == ResponseStatus.OK:
-            return response.data
+        if ok:
+            return data
         else:
-            raise RuntimeError(f"Custom fronts request failed: {response.error}")
+            raise RuntimeError(f"Custom fronts request failed: {error}")
     
     async def switch(self, entity_names: list) -> Dict[str, Any]:
         """
@@ -199,10 +411,9 @@ class DaemonClient:
         Returns:
             True if reload successful
         """
-        request = Request.create(CommandType.RELOAD)
-        response = await self.send_request(request)
+        ok, _, _ = await self._query(CommandType.RELOAD)
         
-        return response.status == ResponseStatus.OK
+        return ok
 
 
 # Synchronous wrapper for convenience
@@ -215,18 +426,63 @@ class DaemonClientSync:
     
     def __init__(self, profile: str = "default", timeout: float = 5.0):
         self.client = DaemonClient(profile, timeout)
+        # Background event loop, started on first use so that constructing
+        # the wrapper (e.g. on every CLI invocation) costs nothing
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background event loop, starting its thread if needed"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="sp-daemon-client",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
     
     def _run(self, coro):
-        """Run async coroutine synchronously, even if called from async context"""
+        """
+        Run async coroutine synchronously on the background event loop
+        
+        Safe to call from inside a running event loop too, since the
+        coroutine never runs on the caller's loop.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
         try:
-            asyncio.get_running_loop()
-            # Already in an event loop - run in a separate thread to avoid blocking
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                return pool.submit(asyncio.run, coro).result()
-        except RuntimeError:
-            # No event loop, safe to use asyncio.run directly
-            return asyncio.run(coro)
+            return future.result(self.client.timeout + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError("Daemon request timed out")
+    
+    def close(self):
+        """Close the daemon connection and stop the background event loop"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.client.close(), loop).result(1)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1)
+            if not thread.is_alive():
+                loop.close()
+    
+    def __del__(self):
+        # The thread is a daemon so it never blocks interpreter exit, but
+        # stop it explicitly when the wrapper is collected earlier than that
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def is_running(self) -> bool:
         """Check if daemon is running"""
@@ -236,6 +492,10 @@ class DaemonClientSync:
         """Ping the daemon"""
         return self._run(self.client.ping())
     
+    def get_bulk(self, commands: List[CommandType]) -> Dict[CommandType, Response]:
+        """Send several commands in one round trip"""
+        return self._run(self.client.get_bulk(commands))
+    
     def get_status(self) -> Dict[str, Any]:
         """Get daemon status"""
         return self._run(self.client.get_status())
@@ -287,26 +547,28 @@ async def main():
         elif args.command == 'status':
             status = await client.get_status()
             print("Daemon Status:")
-            print(json.dumps(status, indent=2))
+            print(_json.dumps(status, indent=True).decode('utf-8'))
         
         elif args.command == 'fronting':
             fronters = await client.get_fronters()
             print("Current Fronters:")
-            print(json.dumps(fronters, indent=2))
+            print(_json.dumps(fronters, indent=True).decode('utf-8'))
         
         elif args.command == 'members':
             members = await client.get_members()
             print("Members:")
-            print(json.dumps(members, indent=2))
+            print(_json.dumps(members, indent=True).decode('utf-8'))
         
         elif args.command == 'custom-fronts':
             custom_fronts = await client.get_custom_fronts()
             print("Custom Fronts:")
-            print(json.dumps(custom_fronts, indent=2))
+            print(_json.dumps(custom_fronts, indent=True).decode('utf-8'))
     
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        await client.close()
 
 
 if __name__ == '__main__':
@@ -4,17 +4,46 @@ Protocol definitions for daemon communication
 This module defines the protocol used for communication between the daemon
 and CLI clients over Unix domain sockets, as well as constants for the
 WebSocket protocol with Simply Plural's API.
+
+Socket framing (protocol version 2+):
+    Every message in either direction is a JSON document prefixed with its
+    length as a 4-byte big-endian unsigned integer:
+
+        +----------------+------------------------+
+        | length (4B BE) | JSON payload (length B) |
+        +----------------+------------------------+
+
+    Version 1 wrote bare JSON and relied on the reader doing a single large
+    read(), which capped responses at 1 MiB and raced with half-open sockets.
+
+    A connection may carry any number of request/response pairs. The daemon
+    answers requests on a connection strictly in the order they were sent.
+
+    An empty frame (length 0) is a health check: the daemon answers with an
+    empty frame without parsing anything. Daemons that predate this reply
+    with a JSON error frame instead, which still shows they are alive.
 """
 
 from enum import Enum
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
+import asyncio
 import json
 import uuid
 
+from . import _json
+
 
 # Protocol version
-PROTOCOL_VERSION = 1
+PROTOCOL_VERSION = 2
+
+# Socket framing
+FRAME_HEADER_SIZE = 4                 # bytes, big-endian payload length
+MAX_FRAME_SIZE = 64 * 1024 * 1024     # sanity limit for a single message
+
+# Clients may keep a connection open and send several requests on it; the
+# daemon closes connections that stay idle longer than this
+SOCKET_IDLE_TIMEOUT = 60  # seconds
 
 
 class CommandType(str, Enum):
@@ -99,6 +128,10 @@ class Request:
         """Serialize to JSON"""
         return json.dumps(self.to_dict())
     
+    def to_json_bytes(self) -> bytes:
+        """Serialize to UTF-8 encoded JSON bytes (ready to write to a socket)"""
+        return _json.dumps(self.to_dict())
+    
     @classmethod
     def create(cls, command: CommandType, args: Optional[Dict[str, Any]] = None) -> 'Request':
         """Create a new request with auto-generated ID"""
@@ -144,6 +177,10 @@ class Response:
         """Serialize to JSON"""
         return json.dumps(self.to_dict())
     
+    def to_json_bytes(self) -> bytes:
+        """Serialize to UTF-8 encoded JSON bytes (ready to write to a socket)"""
+        return _json.dumps(self.to_dict())
+    
     @classmethod
     def success(cls, request_id: str, data: Optional[Dict[str, Any]] = None) -> 'Response':
         """Create a successful response"""
@@ -205,6 +242,38 @@ class WSUpdateResult:
         )
 
 
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix a payload with its 4-byte big-endian length"""
+    return len(payload).to_bytes(FRAME_HEADER_SIZE, 'big') + payload
+
+
+# Zero-length frame used as a health check in both directions
+PING_FRAME = encode_frame(b'')
+
+
+async def read_frame(reader: asyncio.StreamReader, timeout: Optional[float] = None) -> bytes:
+    """
+    Read one length-prefixed frame from a stream
+    
+    Args:
+        reader: Stream to read from
+        timeout: Per-read timeout in seconds (None for no timeout)
+        
+    Returns:
+        Frame payload (without the length prefix)
+        
+    Raises:
+        asyncio.IncompleteReadError: If the peer closed the connection mid-frame
+        asyncio.TimeoutError: If a read exceeds the timeout
+        ValueError: If the announced frame length exceeds MAX_FRAME_SIZE
+    """
+    header = await asyncio.wait_for(reader.readexactly(FRAME_HEADER_SIZE), timeout=timeout)
+    length = int.from_bytes(header, 'big')
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {length} bytes")
+    return await asyncio.wait_for(reader.readexactly(length), timeout=timeout)
+
+
 # WebSocket keepalive constants
 WS_KEEPALIVE_INTERVAL = 10  # seconds
 WS_KEEPALIVE_MESSAGE = "ping"
@@ -0,0 +1,11 @@
+"""
+Exceptions for Simply Plural CLI
+
+Kept free of third-party imports so modules that only need to catch these
+(e.g. the CLI's fast paths) don't pay for importing requests.
+"""
+
+
+class APIError(Exception):
+    """Exception raised for API-related errors"""
+    pass
@@ -0,0 +1,91 @@
+"""
+Entry point for the sp command
+
+Answers prompt-format fronter queries straight from the shell status file
+when it is fresh, before importing the rest of the CLI. Prompts render on
+every command, so skipping config/cache/client setup matters there;
+everything else is handed to cli.main().
+"""
+
+import os
+import sys
+import time
+
+
+def status_file_name(profile: str) -> str:
+    """
+    Name of a profile's shell status file in ~/.cache
+
+    Each profile has its own, so a prompt hook generated for one profile
+    never shows another's fronters. The default profile keeps the
+    original name.
+    """
+    return f'sp_status{_profile_suffix(profile)}'
+
+
+def refresh_lock_name(profile: str) -> str:
+    """
+    Name of the lock in ~/.cache held while a profile's background refresh
+    runs
+
+    Per profile like the status file, so one profile's refresh never holds
+    up another's.
+    """
+    return f'sp_refresh{_profile_suffix(profile)}.lock'
+
+
+def _profile_suffix(profile: str) -> str:
+    """'' for the default profile, else '.<profile>' made filename-safe"""
+    if profile == 'default':
+        return ''
+    safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in profile)
+    return f'.{safe}'
+
+
+# Written by `sp _internal_update_status` (see SimplyPluralCLI); this is
+# the default profile's, the only one the fast path serves
+STATUS_FILE = os.path.join(os.path.expanduser('~'), '.cache', status_file_name('default'))
+
+# Only serve the status file if it was refreshed this recently (seconds);
+# older content goes through the full daemon/cache path
+PROMPT_STATUS_MAX_AGE = 30
+
+# Argument lists that produce prompt output for the default profile
+_PROMPT_ARGVS = frozenset(
+    args
+    for command in ('fronting', 'who', 'w', 'status')
+    for args in ((command, '--format=prompt'), (command, '--format', 'prompt'))
+) | {('status',)}
+
+
+def read_prompt_status(argv) -> str:
+    """
+    Return the prompt text for argv from the status file, or '' to fall back
+
+    Only fresh, resolved content ("[Name, ...] ") is used; placeholders like
+    "(updating)" or stale "~[...]" lines mean the full path should run.
+    """
+    if tuple(argv) not in _PROMPT_ARGVS:
+        return ''
+    try:
+        with open(STATUS_FILE, 'r') as f:
+            if time.time() - os.fstat(f.fileno()).st_mtime > PROMPT_STATUS_MAX_AGE:
+                return ''
+            text = f.read()
+    except OSError:
+        return ''
+    return text if text.startswith('[') else ''
+
+
+def main():
+    text = read_prompt_status(sys.argv[1:])
+    if text:
+        sys.stdout.write(text + '\n')
+        return 0
+
+    from .cli import main as cli_main
+    return cli_main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,122 +6,106 @@ Provides smart, non-blocking prompt updates with background cache refresh.
 """
 
 import os
+import shlex
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from .launcher import status_file_name
 
-class ShellIntegrationManager:
-    """Manages shell prompt integration for Simply Plural CLI"""
-    
-    def __init__(self, config_manager):
-        self.config = config_manager
-        self.shell_dir = self.config.config_dir / "shell"
-    
-    def generate_integration_script(self) -> Path:
-        """Generate the shell integration script from template"""
-        self.shell_dir.mkdir(exist_ok=True)
-        
-        # Read the template file
-        template_path = Path(__file__).parent / "shell_template.sh"
-        
-        try:
-            with open(template_path, 'r') as f:
-                script_content = f.read()
-        except FileNotFoundError:
-            # Fallback to embedded script if template not found
-            script_content = self._get_fallback_script()
-        
-        script_path = self.shell_dir / "integration.sh"
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-            
-        return script_path
-    
-    def _get_fallback_script(self) -> str:
-        """Fallback shell script if template file is missing"""
-        return '''# Simply Plural shell integration
+
+_MODULE_DIR = Path(__file__).resolve().parent
+_TEMPLATE_PATH = _MODULE_DIR / "shell_template.sh"
+
+# Used when shell_template.sh isn't shipped alongside this module
+_FALLBACK_SHELL_SCRIPT = '''# Simply Plural shell integration
 # Add this to your ~/.bashrc or ~/.zshrc
+# Generated by `sp shell generate`: run it again after changing
+# shell_update_interval, or with --profile to follow a different profile
+
+# Seconds the status file is shown as-is before it's refreshed in the background
+SP_REFRESH_INTERVAL=${SP_REFRESH_INTERVAL:-@SHELL_UPDATE_INTERVAL@}
+_SP_PROFILE=@PROFILE@
+_SP_STATUS_FILE="$HOME/.cache/"@STATUS_FILE_NAME@  # One per profile
+_SP_LAST_CHECK=0
+
+# zsh only provides $EPOCHSECONDS through this module
+[[ -n $ZSH_VERSION ]] && zmodload zsh/datetime 2>/dev/null
+
+# Load the status line ("[Member] ") into $SP_STATUS. `read` is a shell
+# builtin, so this costs no fork (~1ms less than cat in a subshell)
+_sp_read_status() {
+    SP_STATUS=""
+    IFS= read -r SP_STATUS 2>/dev/null < "$_SP_STATUS_FILE" || :
+}
+
+# Prompt hook: refresh $SP_STATUS, and at most once per interval check in
+# the background whether the status file needs updating. $EPOCHSECONDS
+# (bash 5+, zsh) keeps the common case free of forks; sp only runs when
+# the file is actually stale
+_sp_precmd() {
+    _sp_read_status
+    local now=${EPOCHSECONDS:-$(date +%s)}
+    if (( now - _SP_LAST_CHECK >= SP_REFRESH_INTERVAL )); then
+        _SP_LAST_CHECK=$now
+        (_sp_background_check >/dev/null 2>&1 & disown)
+    fi
+}
 
+# Print the status line (for use as $(_sp_prompt) inside a prompt string)
 _sp_prompt() {
-    local status_file="$HOME/.cache/sp_status"
-    
-    # Always show current content (fast - ~1ms)
-    cat "$status_file" 2>/dev/null || echo ""
-    
-    # Background check if refresh needed (slow stuff in background, no job control spam)
-    (_sp_background_check >/dev/null 2>&1 & disown)
+    _sp_precmd
+    printf '%s' "$SP_STATUS"
 }
 
 _sp_background_check() {
-    local lock_file="$HOME/.cache/sp_refresh.lock"
-    local status_file="$HOME/.cache/sp_status"
-    local cache_ttl=300      # 5 minutes
-    
-    # Quick mutex check - only one background worker at a time
-    if [[ -f "$lock_file" ]]; then
-        local lock_age=$(($(date +%s) - $(stat -c %Y "$lock_file" 2>/dev/null || echo 0)))
-        if [[ $lock_age -lt 120 ]]; then
-            return  # Another check is running
-        fi
+    local mtime
+    # GNU stat, then BSD/macOS stat; a missing file counts as stale
+    mtime=$(stat -c %Y "$_SP_STATUS_FILE" 2>/dev/null ||
+            stat -f %m "$_SP_STATUS_FILE" 2>/dev/null) || mtime=0
+    if (( $(date +%s) - mtime < SP_REFRESH_INTERVAL )); then
+        return  # Still fresh (another shell may have just updated it)
     fi
-    
-    # Check if we need to refresh
-    if [[ -f "$status_file" ]]; then
-        local file_age=$(($(date +%s) - $(stat -c %Y "$status_file" 2>/dev/null || echo 0)))
-        if [[ $file_age -lt $cache_ttl ]]; then
-            return  # Cache is still fresh
-        fi
-    fi
-    
-    # Do the slow work - update cache and status file
-    # Note: Using --profile=default - change this if you want shell integration to use a different profile
-    touch "$lock_file"
-    sp --profile=default _internal_update_status >/dev/null 2>&1 || true
-    rm -f "$lock_file" 2>/dev/null || true
-}
 
-# Initial cache population (run once on shell startup)
-_sp_background_check
+    # sp serialises its own API refreshes, so no lock is needed here
+    sp --profile="$_SP_PROFILE" _internal_update_status >/dev/null 2>&1 || true
+}
 
-# Hook into prompt (uncomment the one for your shell)
+# Hook into prompt (uncomment the lines for your shell)
 # For Bash:
-# PS1="$(_sp_prompt)$PS1"
+# PROMPT_COMMAND="_sp_precmd${PROMPT_COMMAND:+; $PROMPT_COMMAND}"
+# PS1='${SP_STATUS}'"$PS1"
 
-# For Zsh:  
-# PROMPT="$(_sp_prompt)$PROMPT"
-
-# Alternative: If you have existing PROMPT_COMMAND setup
-# PROMPT_COMMAND="_sp_prompt; $PROMPT_COMMAND"
+# For Zsh:
+# setopt PROMPT_SUBST
+# precmd_functions+=(_sp_precmd)
+# PROMPT='${SP_STATUS}'"$PROMPT"
 '''
-    
-    def get_installation_instructions(self, script_path: Path) -> str:
-        """Get shell-specific installation instructions"""
-        shell_name = os.environ.get('SHELL', '').split('/')[-1]
-        
-        if shell_name == 'bash':
-            config_file = "~/.bashrc"
-        elif shell_name == 'zsh':
-            config_file = "~/.zshrc"
-        elif shell_name == 'fish':
-            return f"""Fish shell detected, but this integration is for bash/zsh.
+
+_SHELL_CONFIG_FILES = {
+    'bash': "~/.bashrc",
+    'zsh': "~/.zshrc",
+}
+
+_FISH_INSTRUCTIONS = """Fish shell detected, but this integration is for bash/zsh.
 Consider using fish-specific prompt functions.
 
 For fish, you might want to create a function in ~/.config/fish/functions/:
 function sp_prompt
     cat ~/.cache/sp_status 2>/dev/null; or echo ""
 end"""
-        else:
-            config_file = "your shell config file (~/.bashrc or ~/.zshrc)"
-        
-        return f"""To install shell integration:
+
+_INSTALL_INSTRUCTIONS = """To install shell integration:
 
 1. Add the integration to your shell:
    echo 'source {script_path}' >> {config_file}
 
-2. Edit {config_file} and uncomment the prompt line for your shell:
-   # For Bash: PS1="$(_sp_prompt)$PS1" 
-   # For Zsh:  PROMPT="$(_sp_prompt)$PROMPT"
+2. Add the prompt hook for your shell to {config_file}, after that line:
+   # For Bash: PROMPT_COMMAND="_sp_precmd${{PROMPT_COMMAND:+; $PROMPT_COMMAND}}"
+   #           PS1='${{SP_STATUS}}'"$PS1"
+   # For Zsh:  setopt PROMPT_SUBST; precmd_functions+=(_sp_precmd)
+   #           PROMPT='${{SP_STATUS}}'"$PROMPT"
 
 3. Restart your shell or run:
    source {config_file}
@@ -132,8 +116,77 @@ The prompt will show:
   (updating)   - Fetching data
   (error)      - Something went wrong
 
-To use a different profile for shell integration, edit the generated script and
-change --profile=default to --profile=yourprofile"""
+The status is refreshed in the background once it is older than {interval}s,
+for profile '{profile}'. To change either, set shell_update_interval or pass
+--profile, then run 'sp shell generate' again."""
+
+
+@lru_cache(maxsize=None)
+def _detect_shell() -> str:
+    """Name of the user's login shell from $SHELL (e.g. 'bash')"""
+    return os.environ.get('SHELL', '').split('/')[-1]
+
+
+@lru_cache(maxsize=None)
+def _read_template() -> str:
+    """Read the shell template once per process, falling back to the embedded script"""
+    try:
+        return _TEMPLATE_PATH.read_text()
+    except FileNotFoundError:
+        return _FALLBACK_SHELL_SCRIPT
+
+
+class ShellIntegrationManager:
+    """Manages shell prompt integration for Simply Plural CLI"""
+    __slots__ = ('config', 'shell_dir')
+    
+    def __init__(self, config_manager):
+        self.config = config_manager
+        self.shell_dir = self.config.config_dir / "shell"
+    
+    def generate_integration_script(self) -> Path:
+        """Generate the shell integration script from template"""
+        self.shell_dir.mkdir(exist_ok=True)
+        
+        script_content = _read_template().replace(
+            '@SHELL_UPDATE_INTERVAL@', str(int(self.config.shell_update_interval))
+        ).replace('@PROFILE@', shlex.quote(self.config.profile)
+        ).replace('@STATUS_FILE_NAME@', shlex.quote(status_file_name(self.config.profile)))
+        
+        script_path = self.shell_dir / "integration.sh"
+        new_bytes = script_content.encode('utf-8')
+        
+        # Skip the rewrite when nothing changed so the file's mtime stays put
+        try:
+            existing = script_path.read_bytes()
+        except FileNotFoundError:
+            existing = None
+        
+        if existing != new_bytes:
+            script_path.write_bytes(new_bytes)
+            
+        return script_path
+    
+    def _get_fallback_script(self) -> str:
+        """Fallback shell script if template file is missing"""
+        return _FALLBACK_SHELL_SCRIPT
+    
+    def get_installation_instructions(self, script_path: Path) -> str:
+        """Get shell-specific installation instructions"""
+        shell_name = _detect_shell()
+        
+        if shell_name == 'fish':
+            return _FISH_INSTRUCTIONS
+        
+        config_file = _SHELL_CONFIG_FILES.get(
+            shell_name, "your shell config file (~/.bashrc or ~/.zshrc)"
+        )
+        return _INSTALL_INSTRUCTIONS.format_map({
+            'script_path': script_path,
+            'config_file': config_file,
+            'interval': self.config.shell_update_interval,
+            'profile': self.config.profile,
+        })
     
     def generate_and_show_instructions(self) -> bool:
         """Generate integration script and show installation instructions"""
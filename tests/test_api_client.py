@@ -2,6 +2,7 @@
 
 import pytest
 import json
+import time
 from unittest.mock import patch, MagicMock
 
 from simplyplural.api_client import SimplyPluralAPI, APIError
@@ -14,6 +15,7 @@ def make_response(status_code=200, json_data=None, text=""):
     resp.status_code = status_code
     resp.ok = 200 <= status_code < 300
     resp.text = text or json.dumps(json_data or {})
+    resp.content = resp.text.encode()
     resp.json.return_value = json_data
     resp.headers = {"Content-Type": "application/json"}
     return resp
@@ -24,6 +26,14 @@ class TestAPIClientInit:
         api = SimplyPluralAPI("my-token")
         assert api.session.headers["Authorization"] == "my-token"
 
+    def test_https_adapter_pool(self):
+        api = SimplyPluralAPI("tok")
+        adapter = api.session.get_adapter(SimplyPluralAPI.BASE_URL)
+        assert adapter._pool_maxsize == 16
+        assert adapter._pool_connections == 1
+        assert adapter._pool_block is True
+        assert adapter.max_retries.total == 0
+
     def test_default_timeout(self):
         api = SimplyPluralAPI("tok")
         assert api.timeout == 10
@@ -37,6 +47,114 @@ class TestAPIClientInit:
         assert api.max_retries == 5
 
 
+class TestRetryBackoff:
+    def test_delay_bounded_by_exponential_step_and_cap(self):
+        api = SimplyPluralAPI("tok")
+        with patch("simplyplural.api_client.random.uniform", side_effect=lambda a, b: b):
+            assert [api._backoff_delay(n) for n in (0, 1, 2, 10)] == [1.0, 2.0, 4.0, 30.0]
+
+    def test_connection_errors_retried_with_jitter(self):
+        import requests
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(side_effect=[
+            requests.ConnectionError(), requests.ConnectionError(), make_response(200, {"ok": True}),
+        ])
+        with patch("simplyplural.api_client.time.sleep") as sleep, \
+             patch("simplyplural.api_client.random.uniform", return_value=0.25) as uniform:
+            assert api._request('GET', '/me') == {"ok": True}
+        assert [c.args for c in uniform.call_args_list] == [(0, 1.0), (0, 2.0)]
+        assert sleep.call_count == 2
+
+    @staticmethod
+    def _limited(status=429, retry_after=None):
+        resp = make_response(status, {"message": "slow down"})
+        if retry_after is not None:
+            resp.headers["Retry-After"] = retry_after
+        return resp
+
+    def test_rate_limit_waits_for_retry_after(self):
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(side_effect=[self._limited(retry_after="3"), make_response(200, {"ok": True})])
+        with patch("simplyplural.api_client.time.sleep") as sleep, \
+             patch("simplyplural.api_client.random.uniform", return_value=0.5):
+            assert api._request('GET', '/me') == {"ok": True}
+        sleep.assert_called_once_with(3.5)
+
+    def test_unavailable_without_header_uses_backoff(self):
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(side_effect=[self._limited(503), make_response(200, {"ok": True})])
+        with patch("simplyplural.api_client.time.sleep") as sleep, \
+             patch("simplyplural.api_client.random.uniform", return_value=0.7):
+            assert api._request('GET', '/me') == {"ok": True}
+        sleep.assert_called_once_with(0.7)
+
+    def test_rate_limit_raises_once_retries_exhausted(self):
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(return_value=self._limited(retry_after="2"))
+        with patch("simplyplural.api_client.time.sleep") as sleep:
+            with pytest.raises(APIError, match="Retry after 2 seconds"):
+                api._request('GET', '/me')
+        assert api.session.request.call_count == api.max_retries
+        assert sleep.call_count == api.max_retries - 1
+
+    def test_long_retry_after_not_waited_for(self):
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(return_value=self._limited(retry_after="3600"))
+        with patch("simplyplural.api_client.time.sleep") as sleep:
+            with pytest.raises(APIError, match="Rate limited"):
+                api._request('GET', '/me')
+        sleep.assert_not_called()
+        api.session.request.assert_called_once()
+
+    def test_retry_after_http_date(self):
+        from email.utils import formatdate
+        from simplyplural.api_client import _retry_after_seconds
+        import time
+        assert 8 <= _retry_after_seconds(formatdate(time.time() + 10, usegmt=True)) <= 10
+        assert _retry_after_seconds("not a date") is None
+
+
+class TestConditionalRequests:
+    def test_not_modified_reuses_stored_body(self, tmp_path):
+        from simplyplural.cache_manager import CacheManager
+        api = SimplyPluralAPI("tok", cache_manager=CacheManager(tmp_path))
+        first = make_response(200, [{"id": "cf1"}])
+        first.headers["ETag"] = '"v1"'
+        api.session.request = MagicMock(side_effect=[first, make_response(304, text=" ")])
+
+        assert api._request('GET', '/customFronts/x', revalidate=True) == [{"id": "cf1"}]
+        assert api._request('GET', '/customFronts/x', revalidate=True) == [{"id": "cf1"}]
+        second_headers = api.session.request.call_args_list[1].kwargs["headers"]
+        assert second_headers["If-None-Match"] == '"v1"'
+
+    def test_no_etag_sends_plain_requests(self, tmp_path):
+        from simplyplural.cache_manager import CacheManager
+        api = SimplyPluralAPI("tok", cache_manager=CacheManager(tmp_path))
+        api.session.request = MagicMock(return_value=make_response(200, [{"id": "cf1"}]))
+        api._request('GET', '/customFronts/x', revalidate=True)
+        api._request('GET', '/customFronts/x', revalidate=True)
+        assert "headers" not in api.session.request.call_args.kwargs
+
+
+class TestResponseParsing:
+    def test_json_body_parsed(self):
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(return_value=make_response(200, [{"name": "Zoë"}]))
+        assert api._request('GET', '/x') == [{"name": "Zoë"}]
+
+    def test_empty_bodies(self):
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(side_effect=[make_response(200, text=" "), make_response(204, text=" ")])
+        assert api._request('PATCH', '/x') == {}
+        assert api._request('PATCH', '/x') == {}
+
+    def test_invalid_json(self):
+        api = SimplyPluralAPI("tok")
+        api.session.request = MagicMock(return_value=make_response(200, text="<html>"))
+        with pytest.raises(APIError, match="Invalid JSON"):
+            api._request('GET', '/x')
+
+
 class TestGetSystemId:
     def test_extracts_id_from_me(self):
         api = SimplyPluralAPI("tok")
@@ -55,6 +173,37 @@ class TestGetSystemId:
         # Should return cached value without calling _request
         assert api.get_system_id() == "cached-id"
 
+    def test_system_id_persisted_in_cache(self, tmp_path):
+        from simplyplural.cache_manager import CacheManager
+        cache = CacheManager(tmp_path)
+        api = SimplyPluralAPI("tok", cache_manager=cache)
+        with patch.object(api, '_request', return_value={"id": SYSTEM_ID}):
+            api.get_system_id()
+        cache.flush()
+
+        # A new process (new client) doesn't ask /me again...
+        fresh = SimplyPluralAPI("tok", cache_manager=CacheManager(tmp_path))
+        with patch.object(fresh, '_request') as req:
+            assert fresh.get_system_id() == SYSTEM_ID
+        req.assert_not_called()
+
+        # ...unless the token changed
+        other = SimplyPluralAPI("other-tok", cache_manager=CacheManager(tmp_path))
+        with patch.object(other, '_request', return_value={"id": "sys2"}) as req:
+            assert other.get_system_id() == "sys2"
+        req.assert_called_once()
+
+    def test_rejected_token_forgets_system_id(self, tmp_path):
+        from simplyplural.cache_manager import CacheManager
+        cache = CacheManager(tmp_path)
+        api = SimplyPluralAPI("tok", cache_manager=cache)
+        cache.set_system_id(api._token_id(), SYSTEM_ID)
+        api.session.request = MagicMock(return_value=make_response(401))
+        with pytest.raises(APIError):
+            api._request('GET', '/me')
+        assert cache.get_system_id(api._token_id()) is None
+        assert api._system_id is None
+
     def test_raises_on_missing_id(self):
         api = SimplyPluralAPI("tok")
         with patch.object(api, '_request', return_value={"exists": True}):
@@ -62,6 +211,49 @@ class TestGetSystemId:
                 api.get_system_id()
 
 
+class TestGetMember:
+    def test_memoizes_lookups(self):
+        api = SimplyPluralAPI("tok")
+        api._system_id = SYSTEM_ID
+        member = {"id": "m1", "content": {"name": "Alice"}}
+        with patch.object(api, '_request', return_value=member) as req:
+            assert api.get_member("m1") == member
+            assert api.get_member("m1") == member
+        req.assert_called_once()
+
+    def test_memo_entries_expire(self):
+        api = SimplyPluralAPI("tok")
+        api._system_id = SYSTEM_ID
+        member = {"id": "m1", "content": {"name": "Alice"}}
+        with patch.object(api, '_request', return_value=member) as req:
+            api.get_member("m1")
+            api._member_memo_ttl = -1
+            api.get_member("m1")
+        assert req.call_count == 2
+
+    def test_invalidated_member_fetched_again(self, tmp_path):
+        from simplyplural.cache_manager import CacheManager
+        cache = CacheManager(tmp_path)
+        api = SimplyPluralAPI("tok", cache_manager=cache)
+        api._system_id = SYSTEM_ID
+        old = {"id": "m1", "content": {"name": "Alice"}}
+        renamed = {"id": "m1", "content": {"name": "Alicia"}}
+        with patch.object(api, '_request', side_effect=[old, renamed]) as req:
+            assert api.get_member("m1") == old
+            assert api.get_member("m1") == old  # Served from the cache
+            cache.invalidate_member("m1")  # e.g. the daemon saw an update
+            assert api.get_member("m1") == renamed
+        assert req.call_count == 2
+
+    def test_memo_is_bounded(self):
+        from simplyplural.api_client import MEMBER_MEMO_SIZE
+        api = SimplyPluralAPI("tok")
+        for i in range(MEMBER_MEMO_SIZE + 5):
+            api._remember_member(f"m{i}", {})
+        assert len(api._member_memo) == MEMBER_MEMO_SIZE
+        assert "m0" not in api._member_memo
+
+
 class TestGetFronters:
     def test_resolves_member_names(self):
         api = SimplyPluralAPI("tok")
@@ -114,6 +306,218 @@ class TestGetFronters:
             assert len(result) == 1
             assert result[0]["type"] == "member"
 
+    def test_resolves_several_fronters_in_order(self):
+        api = SimplyPluralAPI("tok")
+        api._system_id = SYSTEM_ID
+        fronters = [
+            {"id": f"f{i}", "content": {"member": f"m{i}", "custom": i == 2}}
+            for i in range(4)
+        ]
+
+        def lookup(entity_id):
+            if entity_id == "m3":
+                raise APIError("gone")
+            return {"content": {"name": entity_id.upper()}}
+
+        with patch.object(api, '_request', return_value=fronters), \
+             patch.object(api, 'get_members', return_value=[]), \
+             patch.object(api, 'get_member', side_effect=lookup) as get_member, \
+             patch.object(api, 'get_custom_front', side_effect=lookup):
+            result = api.get_fronters()
+        assert [f["name"] for f in result[:3]] == ["M0", "M1", "M2"]
+        assert result[3]["name"].startswith("ID-")
+        assert [f["type"] for f in result] == ["member", "member", "custom_front", "member"]
+        assert get_member.call_count == 3
+
+    @staticmethod
+    def _member_fronters(*ids):
+        return [{"id": f"f-{i}", "content": {"member": i, "custom": False}} for i in ids]
+
+    def test_several_fronters_use_member_list(self):
+        cache = MagicMock()
+        cache.get_members.return_value = None
+        api = SimplyPluralAPI("tok", cache_manager=cache)
+        members = [{"id": "m1", "content": {"name": "Alice"}}, {"id": "m2", "content": {"name": "Bob"}}]
+        with patch.object(api, '_request', return_value=self._member_fronters("m1", "m2")), \
+             patch.object(api, 'get_members', return_value=members), \
+             patch.object(api, 'get_member') as get_member:
+            result = api.get_fronters()
+        assert [f["name"] for f in result] == ["Alice", "Bob"]
+        get_member.assert_not_called()
+        cache.set_members.assert_called_once_with(members)
+
+    def test_single_fronter_skips_member_list(self):
+        api = SimplyPluralAPI("tok")
+        with patch.object(api, '_request', return_value=self._member_fronters("m1")), \
+             patch.object(api, 'get_members') as get_members, \
+             patch.object(api, 'get_member', return_value={"content": {"name": "Alice"}}):
+            assert api.get_fronters()[0]["name"] == "Alice"
+        get_members.assert_not_called()
+
+    def test_cached_member_list_used_for_single_fronter(self):
+        cache = MagicMock()
+        cache.get_members.return_value = [{"id": "m1", "content": {"name": "Alice"}}]
+        api = SimplyPluralAPI("tok", cache_manager=cache)
+        with patch.object(api, '_request', return_value=self._member_fronters("m1")), \
+             patch.object(api, 'get_member') as get_member:
+            assert api.get_fronters()[0]["name"] == "Alice"
+        get_member.assert_not_called()
+
+
+class TestRegisterSwitch:
+    def test_ends_live_sessions_then_starts_new_ones(self):
+        api = SimplyPluralAPI("tok")
+        members = [{"id": "m1", "content": {"name": "Alice"}}, {"id": "m2", "content": {"name": "Bob"}}]
+        current = [
+            {"id": "old1", "content": {"live": True}},
+            {"id": "old2", "content": {"live": True}},
+            {"id": "done", "content": {"live": False}},
+        ]
+        calls = []
+
+        def request(method, endpoint, json=None):
+            calls.append((method, endpoint, json))
+            if endpoint == '/fronters':
+                return current
+            return {"member": json.get("member")} if method == 'POST' else {}
+
+        with patch.object(api, 'get_members', return_value=members), \
+             patch.object(api, 'get_custom_fronts', return_value=[]), \
+             patch.object(api, '_request', side_effect=request):
+            results = api.register_switch(["alice", "bob"], note="hi")
+
+        assert results == [{"member": "m1"}, {"member": "m2"}]
+        post_ids = [c[1].rsplit('/', 1)[1] for c in calls if c[0] == 'POST']
+        assert len(set(post_ids)) == 2
+        assert all(len(i) == 24 and int(i, 16) >= 0 for i in post_ids)
+        methods = [c[0] for c in calls]
+        assert methods == ['GET', 'PATCH', 'PATCH', 'POST', 'POST']
+        assert sorted(c[1] for c in calls if c[0] == 'PATCH') == ['/frontHistory/old1', '/frontHistory/old2']
+        posts = [c[2] for c in calls if c[0] == 'POST']
+        assert all(p["customStatus"] == "hi" for p in posts)
+        end_time = calls[1][2]["endTime"]
+        assert all(p["startTime"] == end_time + 1 for p in posts)
+
+
+    @staticmethod
+    def _switch(names, members, custom_fronts=()):
+        api = SimplyPluralAPI("tok")
+        with patch.object(api, 'get_members', return_value=list(members)), \
+             patch.object(api, 'get_custom_fronts', return_value=list(custom_fronts)), \
+             patch.object(api, '_request', side_effect=lambda method, endpoint, json=None:
+                          [] if method == 'GET' else json):
+            return api.register_switch(names)
+
+    def test_reuses_fronters_fetched_just_before(self):
+        api = SimplyPluralAPI("tok")
+        current = [{"id": "old1", "content": {"member": "m1", "live": True}, "name": "Alice"}]
+        members = [{"id": "m1", "content": {"name": "Alice"}}, {"id": "m2", "content": {"name": "Bob"}}]
+        calls = []
+
+        def request(method, endpoint, json=None):
+            calls.append((method, endpoint))
+            return [dict(f) for f in current] if endpoint == '/fronters' else {}
+
+        with patch.object(api, 'get_members', return_value=members), \
+             patch.object(api, 'get_custom_fronts', return_value=[]), \
+             patch.object(api, 'get_member', return_value=members[0]), \
+             patch.object(api, '_request', side_effect=request):
+            api.get_fronters()
+            api.register_switch(["Bob"])
+            assert calls.count(('GET', '/fronters')) == 1
+            assert ('PATCH', '/frontHistory/old1') in calls
+            # The switch changed the fronters, so the next one fetches again
+            api.register_switch(["Alice"])
+            assert calls.count(('GET', '/fronters')) == 2
+
+    def test_exact_name_beats_partial_matches(self):
+        members = [{"id": "m1", "content": {"name": "Sam"}}, {"id": "m2", "content": {"name": "Samantha"}}]
+        assert self._switch(["SAM"], members)["member"] == "m1"
+
+    def test_custom_front_wins_exact_name_clash(self):
+        members = [{"id": "m1", "content": {"name": "Calm"}}]
+        custom_fronts = [{"id": "cf1", "content": {"name": "calm"}}]
+        result = self._switch(["calm"], members, custom_fronts)
+        assert result["member"] == "cf1"
+        assert result["custom"] is True
+
+
+    def test_partial_name_match(self):
+        members = [{"id": "m1", "content": {"name": "Alice"}}, {"id": "m2", "content": {"name": "Bob"}}]
+        assert self._switch(["lic"], members)["member"] == "m1"
+
+    def test_ambiguous_and_unknown_names(self):
+        members = [{"id": "m1", "content": {"name": "Alice"}}, {"id": "m2", "content": {"name": "Alina"}}]
+        custom_fronts = [{"id": "cf1", "content": {"name": "Blurry"}}]
+        with pytest.raises(APIError, match=r"Ambiguous name 'ali'. Matches: Alice \(member\), Alina \(member\)"):
+            self._switch(["ali"], members, custom_fronts)
+        with pytest.raises(APIError, match=r"Available: Alice \(member\), Alina \(member\), Blurry \(custom_front\)"):
+            self._switch(["zed"], members, custom_fronts)
+
+
+class TestGetSwitches:
+    @staticmethod
+    def _entries(n):
+        return [{"content": {"startTime": i}} for i in range(n)]
+
+    def test_newest_first_and_limited(self):
+        api = SimplyPluralAPI("tok")
+        with patch.object(api, 'get_system_id', return_value=SYSTEM_ID), \
+             patch.object(api, '_request', return_value=self._entries(5)):
+            result = api.get_switches(count=2)
+        assert [e["content"]["startTime"] for e in result] == [4, 3]
+
+    def test_today_starts_at_local_midnight(self):
+        api = SimplyPluralAPI("tok")
+        with patch.object(api, 'get_system_id', return_value=SYSTEM_ID), \
+             patch.object(api, '_request', return_value=[]) as req:
+            api.get_switches(period="today")
+        start = req.call_args.kwargs['params']['startTime'] / 1000
+        midnight = time.localtime(start)
+        assert (midnight.tm_hour, midnight.tm_min, midnight.tm_sec) == (0, 0, 0)
+        assert midnight.tm_yday == time.localtime().tm_yday
+
+    def test_count_clamped(self):
+        api = SimplyPluralAPI("tok")
+        with patch.object(api, 'get_system_id', return_value=SYSTEM_ID), \
+             patch.object(api, '_request', return_value=self._entries(1200)):
+            assert len(api.get_switches(count=5000)) == 1000
+
+
+class TestExportData:
+    def test_failed_fetch_falls_back_alone(self):
+        api = SimplyPluralAPI("tok")
+        api._system_id = SYSTEM_ID
+        with patch.object(api, 'get_members', return_value=[{"id": "m1"}]), \
+             patch.object(api, 'get_fronters', side_effect=APIError("down")), \
+             patch.object(api, 'get_switches', return_value=[{"id": "s1"}]) as get_switches:
+            data = api.export_data()
+        assert list(data) == ['members', 'fronters', 'switches', 'exported_at']
+        assert data['members'] == [{"id": "m1"}]
+        assert data['fronters'] == {}
+        assert data['switches'] == [{"id": "s1"}]
+        get_switches.assert_called_once_with(count=1000)
+
+    def test_cold_start_fetches_me_and_members_once(self):
+        api = SimplyPluralAPI("tok")
+        members = [{"id": "m1", "content": {"name": "Alice"}}, {"id": "m2", "content": {"name": "Bob"}}]
+        calls = []
+
+        def request(method, endpoint, **kwargs):
+            calls.append(endpoint.split('/')[1])
+            if endpoint == '/me':
+                return {"id": SYSTEM_ID}
+            if endpoint == '/fronters':
+                return [{"content": {"member": "m1"}}, {"content": {"member": "m2"}}]
+            return members if endpoint.startswith('/members/') else []
+
+        with patch.object(api, '_request', side_effect=request):
+            data = api.export_data()
+        assert calls.count('me') == 1
+        assert calls.count('members') == 1
+        assert calls[:2] == ['me', 'members']
+        assert [f['name'] for f in data['fronters']] == ['Alice', 'Bob']
+
 
 class TestSensitiveDataRedaction:
     def test_auth_header_filtered(self):
@@ -121,3 +525,29 @@ class TestSensitiveDataRedaction:
         filtered = api._filter_sensitive_headers({"Authorization": "secret", "Content-Type": "json"})
         assert filtered["Authorization"] == "[REDACTED]"
         assert filtered["Content-Type"] == "json"
+
+    def test_sensitive_keys_redacted_at_any_depth(self):
+        api = SimplyPluralAPI("tok")
+        data = {"name": "A", "apiToken": "x", "nested": [{"Authorization": "y", "ok": 1}]}
+        assert api._sanitize_debug_data(data) == {
+            "name": "A", "apiToken": "[REDACTED]", "nested": [{"Authorization": "[REDACTED]", "ok": 1}],
+        }
+
+    def test_token_redacted_from_text(self):
+        api = SimplyPluralAPI("tok")
+        token = "A" * 60 + "=="
+        assert api._sanitize_debug_text(f'{{"t": "{token}"}}') == '{"t": "[REDACTED_TOKEN]"}'
+
+    def test_limited_text_never_splits_a_token(self):
+        api = SimplyPluralAPI("tok")
+        text = "-" * 480 + " " + "B" * 60 + " tail" * 1000
+        result = api._sanitize_debug_text(text, limit=500)
+        assert result == "-" * 480 + " [REDACTED_TOKEN]..."
+
+    def test_debug_bodies_printed_compact(self, capsys):
+        api = SimplyPluralAPI("tok", debug=True)
+        api.session.request = MagicMock(return_value=make_response(200, {"a": [1, 2]}))
+        api._request('POST', '/x', json={"live": True})
+        out = capsys.readouterr().out
+        assert 'DEBUG: Request body: {"live":true}' in out
+        assert 'DEBUG: Parsed JSON: {"a":[1,2]}' in out
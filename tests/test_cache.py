@@ -1,5 +1,7 @@
 """Tests for CacheManager"""
 
+import os
+import signal
 import time
 import pytest
 from unittest.mock import MagicMock
@@ -15,6 +17,7 @@ def cache(tmp_cache_dir):
     config.cache_members_ttl = 3600
     config.cache_switches_ttl = 1800
     config.cache_custom_fronts_ttl = 3600
+    config.cache_memory_max = 512
     return CacheManager(str(tmp_cache_dir), config)
 
 
@@ -62,8 +65,243 @@ class TestCacheManager:
 
         cache1 = CacheManager(str(tmp_cache_dir), config)
         cache1.set_fronters([{"id": "f1", "name": "Alice"}])
+        cache1.flush()
 
         cache2 = CacheManager(str(tmp_cache_dir), config)
         result = cache2.get_fronters()
         assert result is not None
         assert result[0]["name"] == "Alice"
+
+    def test_corrupted_file_is_discarded(self, cache, tmp_cache_dir):
+        cache_file = tmp_cache_dir / "fronters.json"
+        cache_file.write_bytes(b'{"data": [1, 2')
+        assert cache.get_fronters() is None
+        assert not cache_file.exists()
+
+    def test_non_ascii_round_trip(self, tmp_cache_dir, cache):
+        cache.set_fronters([{"id": "f1", "name": "Zoë ✨"}])
+        cache.flush()
+        fresh = CacheManager(str(tmp_cache_dir), cache.config)
+        assert fresh.get_fronters()[0]["name"] == "Zoë ✨"
+
+    def test_peek_returns_expired_data(self, cache):
+        cache.set('fronters', [{"name": "Alice"}], ttl=-1)
+        cache.memory_cache.clear()
+        assert cache.get_fronters() is None
+        assert cache.peek('fronters') == [{"name": "Alice"}]
+        assert cache.peek('members') is None
+
+    def test_fronters_path_is_written_file(self, cache):
+        assert not cache.fronters_path.exists()
+        cache.set_fronters([])
+        cache.flush()
+        assert cache.fronters_path.exists()
+
+    def test_files_written_compact_and_old_format_read(self, cache, tmp_cache_dir):
+        cache.set_members([{"id": "m1\nm2"}])
+        cache.flush()
+        # Header line, then the data
+        assert cache._get_cache_file('members').read_bytes().count(b"\n") == 1
+        assert cache.peek('members') == [{"id": "m1\nm2"}]
+
+        # Files from older versions were indented
+        cache._get_cache_file('switches_recent').write_text(
+            '{\n  "data": [],\n  "timestamp": %f,\n  "ttl": 60\n}' % time.time())
+        assert cache.get_switches() == []
+
+    def test_unchanged_file_not_parsed_again(self, cache):
+        from unittest.mock import patch
+        cache.set_members([{"id": "m1"}])
+        cache.flush()
+        with patch.object(CacheManager, '_deserialize', wraps=CacheManager._deserialize) as parse:
+            assert cache.peek('members') == [{"id": "m1"}]
+            assert cache.peek('members') == [{"id": "m1"}]
+            assert parse.call_count == 1
+
+            # Rewritten (by this or another process): parsed again
+            cache.set_members([{"id": "m2"}])
+            cache.flush()
+            assert cache.peek('members') == [{"id": "m2"}]
+            assert parse.call_count == 2
+
+    def test_fsync_only_when_configured(self, tmp_cache_dir):
+        from unittest.mock import patch
+        config = MagicMock()
+        config.cache_members_ttl = 3600
+        # Enabled: the file, then the directory after the batch
+        for enabled, expected_calls in ((False, 0), (True, 2)):
+            config.cache_fsync = enabled
+            cache = CacheManager(str(tmp_cache_dir), config)
+            with patch("simplyplural.cache_manager.os.fsync") as fsync:
+                cache.set_members([])
+                cache.flush()
+            assert fsync.call_count == expected_calls
+            assert cache.peek('members') == []
+
+    def test_system_id_tied_to_token(self, cache):
+        cache.set_system_id("tok-a", "sys1")
+        cache.memory_cache.clear()
+        assert cache.get_system_id("tok-a") == "sys1"
+        assert cache.get_system_id("tok-b") is None
+        cache.invalidate_system_id()
+        assert cache.get_system_id("tok-a") is None
+
+    def test_writes_are_coalesced_in_background(self, cache):
+        from unittest.mock import patch
+        # autospec passes self, so writes queued by other tests' managers
+        # (flushed by the background writer meanwhile) can be told apart
+        with patch.object(CacheManager, '_save_to_file', autospec=True,
+                          side_effect=CacheManager._save_to_file) as save:
+            with cache._io_lock:  # Hold the writer off until all sets are queued
+                for n in range(5):
+                    cache.set_members([{"id": f"m{n}"}])
+                assert cache.peek('members') == [{"id": "m4"}]
+            cache.flush()
+        assert [c.args[1] for c in save.call_args_list if c.args[0] is cache] == ['members']
+        assert CacheManager(cache.cache_dir, cache.config).get_members() == [{"id": "m4"}]
+
+    def test_invalidate_drops_queued_write(self, cache):
+        from unittest.mock import patch
+        with patch("simplyplural.cache_manager._write_queue"):
+            cache.set_members([{"id": "m1"}])
+        cache.invalidate('members')
+        cache.flush()
+        assert not cache._get_cache_file('members').exists()
+
+    def test_cache_info_reports_file_sizes(self, cache):
+        cache.set_members([{"id": "m1"}])
+        cache.set_fronters([])
+        info = cache.get_cache_info()
+        assert set(info) == {'members', 'fronters'}
+        for key, item in info.items():
+            assert item['file_size'] == cache._get_cache_file(key).stat().st_size
+            assert item['in_memory'] and not item['expired']
+
+    def test_memory_cache_evicts_least_recently_used(self, cache):
+        cache.memory_max_entries = 2
+        cache.set_member("m1", {"id": "m1"})
+        cache.set_member("m2", {"id": "m2"})
+        assert cache.get_member("m1") == {"id": "m1"}  # m1 now most recent
+        cache.set_member("m3", {"id": "m3"})
+        assert list(cache.memory_cache) == ["member_m1", "member_m3"]
+        # Evicted entries are still read back from their files
+        assert cache.get_member("m2") == {"id": "m2"}
+
+    def test_fronters_invalidated_before_write_never_hit_disk(self, cache):
+        from unittest.mock import patch
+        with patch("simplyplural.cache_manager._write_queue"), \
+                patch.object(CacheManager, '_save_to_file', autospec=True) as save:
+            cache.set_fronters([{"name": "Alice"}])  # Queued, writer never told
+            cache.invalidate_fronters()
+            cache.flush()
+        assert not [c for c in save.call_args_list if c.args[0] is cache]
+        assert cache.get_fronters() is None
+
+    def test_expired_file_data_not_parsed(self, cache):
+        from unittest.mock import patch
+        cache.set('members', [{"id": "m1"}], ttl=-1)
+        cache.flush()
+        cache.memory_cache.clear()
+        with patch.object(CacheManager, '_deserialize', wraps=CacheManager._deserialize) as parse:
+            assert cache.get_members() is None
+            info = cache.get_cache_info()
+            assert parse.call_count == 0
+        assert info['members']['expired'] and info['members']['ttl_seconds'] == -1
+        assert cache.peek('members') == [{"id": "m1"}]
+
+    def test_cache_entry_has_no_dict(self):
+        from simplyplural.cache_manager import CacheEntry
+        entry = CacheEntry(data=[], timestamp=time.time(), ttl=60)
+        assert not hasattr(entry, '__dict__')
+        assert not entry.is_expired(entry.timestamp)
+
+    def test_file_removed_after_stat_is_a_miss(self, cache):
+        from unittest.mock import patch
+        cache.set_members([])
+        cache.flush()
+        with patch("builtins.open", side_effect=FileNotFoundError), \
+                patch("pathlib.Path.unlink") as unlink:
+            assert cache.peek('members') is None
+        unlink.assert_not_called()
+
+    def test_misses_remembered_until_set(self, cache):
+        from unittest.mock import patch
+        with patch.object(CacheManager, '_load_from_file', autospec=True,
+                          side_effect=CacheManager._load_from_file) as load:
+            assert cache.get_member("nobody") is None
+            assert cache.get_member("nobody") is None
+            assert len([c for c in load.call_args_list if c.args[0] is cache]) == 1
+        # A remembered miss isn't a cached value
+        assert cache.get_fronters() is None
+        assert cache.get_fronters_timestamp() is None
+        cache.set_member("nobody", {"id": "nobody"})
+        assert cache.get_member("nobody") == {"id": "nobody"}
+        cache.invalidate_member("nobody")
+        assert cache.get_member("nobody") is None
+
+    def test_clear_all_empties_directory(self, cache, tmp_cache_dir):
+        import threading
+        cache.set_members([{"id": "m1"}])
+        cache.set_fronters([])
+        cache.flush()
+        cache.clear_all()
+        for thread in threading.enumerate():
+            if thread.name == 'sp-cache-clear':
+                thread.join()
+        assert list(tmp_cache_dir.iterdir()) == []
+        assert [p.name for p in tmp_cache_dir.parent.iterdir()] == [tmp_cache_dir.name]
+        assert cache.get_members() is None
+        cache.set_members([])
+        cache.flush()
+        assert cache.peek('members') == []
+
+    def test_written_files_private_and_no_temp_left(self, cache, tmp_cache_dir):
+        import stat
+        cache.set_members([{"id": "m1"}])
+        cache.flush()
+        assert [p.name for p in tmp_cache_dir.iterdir()] == ["members.json"]
+        assert stat.S_IMODE(cache._get_cache_file('members').stat().st_mode) == 0o600
+
+    def test_etag_response_written_from_raw_body(self, cache):
+        body = b'[\n  {"id": "m1", "name": "Zo\xc3\xab"}\n]'
+        cache.set_etag_response('/members/s1', '"v1"', [{"id": "m1", "name": "Zoë"}], body)
+        cache.flush()
+        assert body in cache._get_cache_file(cache._etag_key('/members/s1')).read_bytes()
+        fresh = CacheManager(cache.cache_dir, cache.config)
+        assert fresh.get_etag_response('/members/s1') == ('"v1"', [{"id": "m1", "name": "Zoë"}])
+
+    def test_set_many_queues_one_batch(self, cache):
+        from unittest.mock import patch
+        with patch("simplyplural.cache_manager._write_queue") as write_queue:
+            cache.set_many({'members': [{"id": "m1"}], 'member_m1': {"id": "m1"}})
+        write_queue.put.assert_called_once_with(cache)
+        assert cache.get_member("m1") == {"id": "m1"}
+        cache.flush()
+        assert CacheManager(cache.cache_dir, cache.config).get_members() == [{"id": "m1"}]
+
+    def test_hits_and_misses_counted(self, cache):
+        assert cache.get_members() is None
+        cache.set_members([])
+        assert cache.get_members() == []
+        assert cache.get_members() == []
+        info = cache.get_cache_info()['members']
+        assert (info['hits'], info['misses']) == (2, 1)
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs os.fork")
+    def test_forked_child_can_write(self, cache):
+        cache.set_members([{"id": "m1"}])  # Writer thread running in the parent
+        pid = os.fork()
+        if pid == 0:
+            signal.alarm(5)  # A lock inherited held would hang here
+            try:
+                cache.set_fronters([{"name": "Alice"}])
+                cache.flush()
+                ok = cache.peek('fronters') == [{"name": "Alice"}]
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        assert cache.peek('members') == [{"id": "m1"}]  # Flushed before the fork
+        cache.set_members([])
+        cache.flush()
+        assert cache.peek('members') == []
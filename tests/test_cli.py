@@ -1,10 +1,13 @@
 """Tests for CLI argument parsing and command routing"""
 
+import os
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 from io import StringIO
 
-from simplyplural.cli import main, SimplyPluralCLI
+from simplyplural.cli import main, SimplyPluralCLI, _acquire_refresh_lock
 
 
 def run_cli(*args):
@@ -19,6 +22,39 @@ def run_cli(*args):
     return code, stdout.getvalue(), stderr.getvalue()
 
 
+def cache_home(tmp_path):
+    """Point the CLI's status and refresh lock files at tmp_path/.cache"""
+    cache_dir = tmp_path / '.cache'
+    return patch.multiple("simplyplural.cli",
+                          _STATUS_FILE=cache_dir / 'sp_status',
+                          _REFRESH_LOCK_FILE=cache_dir / 'sp_refresh.lock')
+
+
+class _StubbableCLI(SimplyPluralCLI):
+    """SimplyPluralCLI with an instance __dict__, so tests can replace methods"""
+
+
+def make_mock_cli():
+    """Create a SimplyPluralCLI with mocked internals (daemon not running)"""
+    cli = _StubbableCLI.__new__(_StubbableCLI)
+    cli.config = MagicMock()
+    cli.config.start_daemon = False
+    cli.config.show_custom_front_indicators = True
+    cli.config.custom_front_indicator_style = 'character'
+    cli.config.custom_front_indicator_character = '^'
+    cli.config.async_status_update = False
+    cli.daemon_client = MagicMock()
+    cli.daemon_client.is_running.return_value = False
+    cli.profile = "default"
+    cli.debug = False
+    cli.cache = MagicMock()
+    cli.cache.get_fronters_timestamp.return_value = None
+    cli.api = MagicMock()
+    cli.shell = MagicMock()
+    cli.cmd_internal_update_status = MagicMock()
+    return cli
+
+
 class TestCLIHelp:
     def test_no_args_shows_help(self):
         code, stdout, _ = run_cli()
@@ -97,6 +133,80 @@ class TestCLIArgParsing:
             run_cli("--profile", "alt", "fronting")
             MockCLI.assert_called_once_with("alt", False)
 
+    def test_status_default_prompt_format(self):
+        with patch("simplyplural.cli.SimplyPluralCLI") as MockCLI:
+            instance = MockCLI.return_value
+            instance.cmd_fronting.return_value = 0
+            run_cli("status")
+            MockCLI.assert_called_once_with("default", False)
+            instance.cmd_fronting.assert_called_once_with("prompt")
+
+    def test_fronting_separate_format_value(self):
+        with patch("simplyplural.cli.SimplyPluralCLI") as MockCLI:
+            instance = MockCLI.return_value
+            instance.cmd_fronting.return_value = 0
+            run_cli("who", "--format", "simple")
+            instance.cmd_fronting.assert_called_once_with("simple")
+
+    def test_fronting_invalid_format_rejected(self):
+        with patch("simplyplural.cli.SimplyPluralCLI") as MockCLI:
+            code, _, stderr = run_cli("fronting", "--format=bogus")
+            assert code != 0
+            assert "invalid choice" in stderr
+            MockCLI.assert_not_called()
+
+    @pytest.mark.parametrize("args,profile", [
+        (("_internal_update_status",), "default"),
+        (("--profile=alt", "_internal_update_status"), "alt"),
+        (("--profile", "alt", "_internal_update_status"), "alt"),
+    ])
+    def test_internal_update_status_fast_path(self, args, profile):
+        with patch("simplyplural.cli.SimplyPluralCLI") as MockCLI:
+            instance = MockCLI.return_value
+            instance.cmd_internal_update_status.return_value = 0
+            code, _, _ = run_cli(*args)
+            assert code == 0
+            MockCLI.assert_called_once_with(profile, False)
+            instance.cmd_internal_update_status.assert_called_once_with()
+
+    def test_history_parsed_with_single_subparser(self):
+        with patch("simplyplural.cli.SimplyPluralCLI") as MockCLI:
+            instance = MockCLI.return_value
+            instance.cmd_history.return_value = 0
+            run_cli("--profile", "alt", "--debug", "history", "--week", "--count", "5")
+            MockCLI.assert_called_once_with("alt", True)
+            instance.cmd_history.assert_called_once_with("week", 5)
+
+    @pytest.mark.parametrize("argv,expected", [
+        (["history", "--today"], "history"),
+        (["--profile", "alt", "--debug", "members"], "members"),
+        (["--profile=alt", "backup"], "backup"),
+        (["--help", "members"], None),
+        (["--profile"], None),
+        ([], None),
+    ])
+    def test_find_subcommand(self, argv, expected):
+        from simplyplural.cli import _find_subcommand
+        assert _find_subcommand(argv) == expected
+
+    @pytest.mark.parametrize("args,method,expected", [
+        (("members", "--include-custom"), "cmd_members", (False, True)),
+        (("custom-fronts",), "cmd_custom_fronts", ()),
+        (("history",), "cmd_history", ("recent", 10)),
+        (("backup", "--output", "out.json"), "cmd_backup", ("out.json",)),
+        (("config", "--show"), "cmd_config", (False, True, False, False, False, None, None)),
+        (("help", "cache"), "cmd_help", ("cache",)),
+        (("shell", "generate"), "cmd_shell", ("generate",)),
+        (("cache", "clear", "--all"), "cmd_cache_clear", (True,)),
+        (("debug", "config"), "cmd_debug", ("config",)),
+        (("--debug", "status", "--format=json"), "cmd_fronting", ("json",)),
+    ])
+    def test_command_routing(self, args, method, expected):
+        with patch("simplyplural.cli.SimplyPluralCLI") as MockCLI:
+            instance = MockCLI.return_value
+            run_cli(*args)
+            getattr(instance, method).assert_called_once_with(*expected)
+
     def test_debug_flag(self):
         with patch("simplyplural.cli.SimplyPluralCLI") as MockCLI:
             instance = MockCLI.return_value
@@ -146,6 +256,7 @@ class TestCoFronting:
         cli.config = MagicMock()
         cli.config.start_daemon = False
         cli.config.show_custom_front_indicators = False
+        cli.config.async_status_update = False
         cli.daemon_client = MagicMock()
         cli.daemon_client.is_running.return_value = False
         cli.profile = "default"
@@ -200,3 +311,477 @@ class TestCoFronting:
         cli.cmd_switch(['Bob'], note=None, co=True)
         # Unknown should be filtered out
         cli.api.register_switch.assert_called_once_with(['Alice', 'Bob'], None)
+
+
+class TestStatusFileUpdate:
+    def _make_cli(self, async_update):
+        cli = make_mock_cli()
+        cli.config.async_status_update = async_update
+        cli.api.get_fronters.return_value = []
+        return cli
+
+    def test_sync_update_by_default(self):
+        cli = self._make_cli(False)
+        cli.cmd_switch(['Alice'])
+        cli.cmd_internal_update_status.assert_called_once()
+
+    @patch("simplyplural.cli.subprocess.Popen")
+    def test_async_update_spawns_detached_process(self, mock_popen):
+        cli = self._make_cli(True)
+        cli.profile = "work"
+        cli.cmd_switch(['Alice'])
+        cli.cmd_internal_update_status.assert_not_called()
+        argv = mock_popen.call_args[0][0]
+        assert argv[-3:] == ['--profile', 'work', '_internal_update_status']
+        assert mock_popen.call_args[1]['start_new_session'] is True
+
+
+class TestHistory:
+    def _make_cli(self):
+        """Create a SimplyPluralCLI with mocked internals"""
+        with patch.object(SimplyPluralCLI, '__init__', lambda self, *a, **k: None):
+            cli = SimplyPluralCLI.__new__(SimplyPluralCLI)
+        cli.config = MagicMock()
+        cli.config.start_daemon = False
+        cli.config.show_custom_front_indicators = False
+        cli.daemon_client = MagicMock()
+        cli.daemon_client.is_running.return_value = False
+        cli.profile = "default"
+        cli.debug = False
+        cli.cache = MagicMock()
+        cli.api = MagicMock()
+        cli.shell = MagicMock()
+        cli.api.get_members.return_value = [
+            {'id': 'member001', 'content': {'name': 'Alice'}},
+        ]
+        cli.api.get_custom_fronts.return_value = []
+        return cli
+
+    @staticmethod
+    def _switch(member_id, custom=False):
+        return {'content': {'member': member_id, 'custom': custom,
+                            'startTime': 1700000000000, 'endTime': 1700003600000}}
+
+    def test_names_resolved_from_bulk_fetch(self, capsys):
+        cli = self._make_cli()
+        cli.api.get_switches.return_value = [self._switch('member001')] * 3
+        assert cli.cmd_history() == 0
+        assert capsys.readouterr().out.count('Alice') == 3
+        cli.api.get_member.assert_not_called()
+
+    def test_missing_ids_looked_up_once(self, capsys):
+        cli = self._make_cli()
+        cli.api.get_switches.return_value = [self._switch('member002')] * 3
+        cli.api.get_member.return_value = {'id': 'member002', 'content': {'name': 'Bob'}}
+        assert cli.cmd_history() == 0
+        assert capsys.readouterr().out.count('Bob') == 3
+        cli.api.get_member.assert_called_once_with('member002')
+
+    def test_deleted_member_falls_back_to_id(self, capsys):
+        from simplyplural.api_client import APIError
+        cli = self._make_cli()
+        cli.api.get_switches.return_value = [self._switch('deleted123456')]
+        cli.api.get_member.side_effect = APIError("404")
+        assert cli.cmd_history() == 0
+        assert 'ID-deleted1' in capsys.readouterr().out
+
+    def test_several_missing_ids_resolved(self, capsys):
+        cli = self._make_cli()
+        cli.api.get_switches.return_value = [
+            self._switch('member002'), self._switch('member003'), self._switch('cf002', custom=True),
+        ]
+        names = {'member002': 'Bob', 'member003': 'Carol'}
+        cli.api.get_member.side_effect = lambda i: {'content': {'name': names[i]}}
+        cli.api.get_custom_front.return_value = {'content': {'name': 'Tired'}}
+        assert cli.cmd_history() == 0
+        out = capsys.readouterr().out
+        assert 'Bob' in out and 'Carol' in out and 'Tired' in out
+        assert cli.api.get_member.call_count == 2
+
+    def test_durations_and_times(self, capsys):
+        cli = self._make_cli()
+        start = 1700000000000
+        cli.api.get_switches.return_value = [
+            {'content': {'member': 'member001', 'startTime': start, 'endTime': start + 7_100_000}},
+            {'content': {'member': 'member001', 'startTime': start + 1000, 'endTime': start + 1_550_000}},
+            {'content': {'member': 'member001', 'startTime': start + 120_000, 'live': True}},
+        ]
+        assert cli.cmd_history() == 0
+        lines = capsys.readouterr().out.splitlines()[1:]
+        expected_time = time.strftime("%m/%d %H:%M", time.localtime(start / 1000))
+        assert lines[0] == f"  {expected_time} - Alice (2.0h)"
+        assert lines[1] == f"  {expected_time} - Alice (26m)"
+        assert lines[2].endswith("Alice (ongoing)") and not lines[2].startswith(f"  {expected_time}")
+
+
+class TestLazyAPI:
+    def _make_cli(self, token):
+        with patch.object(SimplyPluralCLI, '__init__', lambda self, *a, **k: None):
+            cli = SimplyPluralCLI.__new__(SimplyPluralCLI)
+        cli.config = MagicMock()
+        cli.config.api_token = token
+        cli.config.api_timeout = 10
+        cli.config.max_retries = 3
+        cli.debug = False
+        cli.cache = MagicMock()
+        return cli
+
+    def test_api_built_on_first_access(self):
+        from simplyplural.api_client import SimplyPluralAPI
+        cli = self._make_cli("tok")
+        api = cli.api
+        assert isinstance(api, SimplyPluralAPI)
+        assert cli.api is api
+
+    def test_no_token_means_no_api(self):
+        cli = self._make_cli(None)
+        assert cli.api is None
+
+    def test_api_stored_in_slot(self):
+        cli = self._make_cli(None)
+        cli.api = "client"
+        assert cli.api == "client"
+        assert not hasattr(cli, '__dict__')
+
+
+class TestFrontingFormats:
+    FRONTERS = [
+        {'name': 'Alice', 'type': 'member'},
+        {'name': 'Tired', 'type': 'custom_front'},
+    ]
+
+    def _make_cli(self):
+        cli = make_mock_cli()
+        cli.cache.get_fronters.return_value = self.FRONTERS
+        return cli
+
+    def test_prompt(self, capsys):
+        assert self._make_cli().cmd_fronting('prompt') == 0
+        assert capsys.readouterr().out == "[Alice, Tired] \n"
+
+    def test_simple(self, capsys):
+        assert self._make_cli().cmd_fronting('simple') == 0
+        assert capsys.readouterr().out == "Alice, Tired\n"
+
+    def test_text_shows_type_indicators(self, capsys):
+        assert self._make_cli().cmd_fronting('text') == 0
+        assert capsys.readouterr().out == "Currently fronting: Alice, ^Tired\n"
+
+    def test_dict_response(self, capsys):
+        cli = self._make_cli()
+        cli.cache.get_fronters.return_value = {'fronters': self.FRONTERS}
+        assert cli.cmd_fronting('json') == 0
+        assert capsys.readouterr().out == '{"fronters": ["Alice", "Tired"]}\n'
+
+
+class TestBackup:
+    def test_writes_backup_atomically(self, tmp_path, capsys):
+        cli = make_mock_cli()
+        cli.api.export_data.return_value = {'members': [{'name': 'Zoë'}], 'switches': []}
+        out = tmp_path / "backup.json"
+        assert cli.cmd_backup(str(out)) == 0
+        import json
+        assert json.loads(out.read_text(encoding='utf-8')) == {'members': [{'name': 'Zoë'}], 'switches': []}
+        assert list(tmp_path.iterdir()) == [out]
+
+    def test_write_error_leaves_no_temp_file(self, tmp_path, capsys):
+        cli = make_mock_cli()
+        cli.api.export_data.return_value = {}
+        out = tmp_path / "missing-dir" / "backup.json"
+        assert cli.cmd_backup(str(out)) == 1
+        assert "Error writing backup" in capsys.readouterr().err
+
+
+class TestListings:
+    def _make_cli(self):
+        cli = make_mock_cli()
+        cli.cache.get_members.return_value = [
+            {'content': {'name': 'Alice', 'pronouns': 'she/her', 'desc': 'x' * 60}},
+            {'content': {'name': 'Bob'}},
+        ]
+        cli.cache.get_custom_fronts.return_value = [
+            {'content': {'name': 'Tired', 'desc': 'low spoons'}},
+        ]
+        return cli
+
+    def test_members(self, capsys):
+        assert self._make_cli().cmd_members() == 0
+        assert capsys.readouterr().out == (
+            "Members:\n"
+            f"  Alice (she/her) - {'x' * 50}...\n"
+            "  Bob\n"
+        )
+
+    def test_members_include_custom(self, capsys):
+        assert self._make_cli().cmd_members(include_custom=True) == 0
+        assert capsys.readouterr().out.endswith("\nCustom fronts:\n  ^Tired - low spoons\n")
+
+    def test_members_include_custom_cold_cache(self, capsys):
+        cli = self._make_cli()
+        members = cli.cache.get_members.return_value
+        custom_fronts = cli.cache.get_custom_fronts.return_value
+        cli.cache.get_members.return_value = None
+        cli.cache.get_custom_fronts.return_value = None
+        cli.api.get_members.return_value = members
+        cli.api.get_custom_fronts.return_value = custom_fronts
+
+        assert cli.cmd_members(include_custom=True) == 0
+        cli.api.get_members.assert_called_once_with()
+        cli.api.get_custom_fronts.assert_called_once_with()
+        cli.cache.set_members.assert_called_once_with(members)
+        cli.cache.set_custom_fronts.assert_called_once_with(custom_fronts)
+        assert capsys.readouterr().out.endswith("\nCustom fronts:\n  ^Tired - low spoons\n")
+
+    def test_custom_fronts(self, capsys):
+        assert self._make_cli().cmd_custom_fronts() == 0
+        assert capsys.readouterr().out == "Custom fronts:\n  ^Tired - low spoons\n"
+
+
+class TestEntityNameFormatter:
+    def test_character_style(self):
+        fmt = make_mock_cli()._entity_name_formatter()
+        assert fmt('Tired', 'custom_front') == '^Tired'
+        assert fmt('Alice', 'member') == 'Alice'
+
+    def test_text_style(self):
+        cli = make_mock_cli()
+        cli.config.custom_front_indicator_style = 'text'
+        assert cli._format_entity_name('Tired', 'custom_front') == 'Tired (custom front)'
+
+    def test_indicators_disabled(self):
+        cli = make_mock_cli()
+        cli.config.show_custom_front_indicators = False
+        assert cli._format_entity_name('Tired', 'custom_front') == 'Tired'
+
+
+class TestInternalUpdateStatus:
+    def _make_cli(self, tmp_path, cache_age=0):
+        cli = make_mock_cli()
+        cli.cache.default_ttl = {'fronters': 900}
+        cli.cache.get_fronters.return_value = [{'name': 'Alice'}]
+        cli.cache.peek.return_value = [{'name': 'Alice'}]
+        cli.cache.fronters_path = tmp_path / 'fronters.json'
+        cli.cache.fronters_path.write_text('{}')
+        mtime = time.time() - cache_age
+        os.utime(cli.cache.fronters_path, (mtime, mtime))
+        return cli
+
+    def test_writes_status_file(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        with cache_home(tmp_path):
+            assert SimplyPluralCLI.cmd_internal_update_status(cli) == 0
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "[Alice] "
+
+    def test_other_profile_writes_its_own_status_file(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        cli.profile = "work"
+        with cache_home(tmp_path):
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        # The default profile's file (served by the launcher) is untouched
+        assert os.listdir(tmp_path / '.cache') == ['sp_status.work']
+
+    def test_recent_identical_write_skipped(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        with cache_home(tmp_path):
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+            with patch("simplyplural.cli.Path.replace") as replace:
+                SimplyPluralCLI.cmd_internal_update_status(cli)
+                replace.assert_not_called()
+                cli.cache.get_fronters.return_value = [{'name': 'Bob'}]
+                SimplyPluralCLI.cmd_internal_update_status(cli)
+                replace.assert_called_once()
+
+    def test_stale_identical_content_only_touched(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        status_file = tmp_path / '.cache' / 'sp_status'
+        status_file.parent.mkdir()
+        status_file.write_text("[Alice] ")
+        os.utime(status_file, (0, 0))
+        with cache_home(tmp_path), \
+             patch("simplyplural.cli.Path.replace") as replace:
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        replace.assert_not_called()
+        assert time.time() - status_file.stat().st_mtime < 5
+        assert status_file.read_text() == "[Alice] "
+
+    def test_refresh_fronters_updates_cache_and_status(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        cli.api.get_fronters.return_value = [{'name': 'Bob'}, {'name': 'Unknown'}]
+        with cache_home(tmp_path):
+            cli._refresh_fronters()
+        cli.cache.set_fronters.assert_called_once_with([{'name': 'Bob'}, {'name': 'Unknown'}])
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "[Bob] "
+
+    def test_background_refresh_parent_returns(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        (tmp_path / '.cache').mkdir()
+        with cache_home(tmp_path), \
+             patch("simplyplural.cli.os.fork", return_value=1234) as fork:
+            cli._start_background_refresh()
+        fork.assert_called_once()
+        cli.daemon_client.close.assert_called_once()
+        cli.api.get_fronters.assert_not_called()
+
+    def test_background_refresh_skipped_while_locked(self, tmp_path):
+        import fcntl
+        cli = self._make_cli(tmp_path)
+        (tmp_path / '.cache').mkdir()
+        with open(tmp_path / '.cache' / 'sp_refresh.lock', 'w') as held:
+            fcntl.flock(held, fcntl.LOCK_EX)
+            with cache_home(tmp_path), \
+                 patch("simplyplural.cli.os.fork") as fork:
+                cli._start_background_refresh()
+        fork.assert_not_called()
+
+    def test_leftover_lock_file_does_not_block_refresh(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        (tmp_path / '.cache').mkdir()
+        (tmp_path / '.cache' / 'sp_refresh.lock').write_text("1")
+        with cache_home(tmp_path), \
+             patch("simplyplural.cli.os.fork", return_value=1234) as fork:
+            cli._start_background_refresh()
+        fork.assert_called_once()
+
+    def test_profiles_refresh_independently(self, tmp_path):
+        default, work = self._make_cli(tmp_path), self._make_cli(tmp_path)
+        work.profile = "work"
+        (tmp_path / '.cache').mkdir()
+        with cache_home(tmp_path):
+            held = _acquire_refresh_lock(default._refresh_lock_path())
+            other = _acquire_refresh_lock(work._refresh_lock_path())
+            again = _acquire_refresh_lock(work._refresh_lock_path())
+        try:
+            assert held is not None and other is not None
+            assert again is None
+        finally:
+            os.close(held)
+            os.close(other)
+        assert sorted(os.listdir(tmp_path / '.cache')) == ['sp_refresh.lock', 'sp_refresh.work.lock']
+
+    def test_stale_cache_marked_and_refreshed(self, tmp_path):
+        cli = self._make_cli(tmp_path, cache_age=1000)
+        with cache_home(tmp_path), \
+             patch.object(SimplyPluralCLI, '_start_background_refresh') as refresh:
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        refresh.assert_called_once()
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "~[Alice] "
+
+    def test_stale_cache_not_parsed_as_fresh(self, tmp_path):
+        cli = self._make_cli(tmp_path, cache_age=1000)
+        with cache_home(tmp_path), \
+             patch.object(SimplyPluralCLI, '_start_background_refresh'):
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        cli.cache.get_fronters.assert_not_called()
+        cli.cache.get_fronters_timestamp.assert_not_called()
+
+    def test_status_sees_fronters_set_just_before(self, tmp_path):
+        from simplyplural.cache_manager import CacheManager
+        cli = make_mock_cli()
+        cli.cache = CacheManager(tmp_path / 'cache')
+        cli.cache.set_fronters([{'name': 'Alice'}])  # Only queued for writing
+        status_text, refresh = cli._current_status()
+        assert (status_text, refresh) == ("[Alice] ", False)
+
+    def test_missing_cache_shows_updating(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        cli.cache.fronters_path.unlink()
+        with cache_home(tmp_path), \
+             patch.object(SimplyPluralCLI, '_start_background_refresh') as refresh:
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        refresh.assert_called_once()
+        cli.cache.peek.assert_not_called()
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "(updating) "
+
+
+    @pytest.mark.parametrize("tmpfile_supported", [True, False])
+    def test_write_leaves_no_temp_files(self, tmp_path, tmpfile_supported):
+        from simplyplural.cli import _link_tmpfile
+        cli = self._make_cli(tmp_path)
+        cli.cache.get_fronters.return_value = [{'name': 'Bob'}]
+        link = _link_tmpfile if tmpfile_supported else (lambda *args: False)
+        with cache_home(tmp_path), \
+             patch("simplyplural.cli._link_tmpfile", side_effect=link) as linker:
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        linker.assert_called_once()
+        assert os.listdir(tmp_path / '.cache') == ['sp_status']
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "[Bob] "
+
+    def test_daemon_reporting_no_fronters_wins_over_cache(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        cli.daemon_client.is_running.return_value = True
+        cli.daemon_client.get_fronters.return_value = {'fronters': []}
+        with cache_home(tmp_path), \
+             patch.object(SimplyPluralCLI, '_start_background_refresh') as refresh:
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        refresh.assert_not_called()
+        cli.cache.get_fronters.assert_not_called()
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == ""
+
+    def test_error_written_as_status(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        cli.cache.get_fronters.side_effect = RuntimeError("boom")
+        with cache_home(tmp_path):
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "(error) "
+
+    def test_fork_failure_spawns_refresh_command(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        (tmp_path / '.cache').mkdir()
+        with cache_home(tmp_path), \
+             patch("simplyplural.cli.os.fork", side_effect=OSError), \
+             patch("simplyplural.cli.subprocess.Popen") as popen:
+            cli._start_background_refresh()
+        argv = popen.call_args[0][0]
+        assert argv[-3:] == ['--profile', 'default', '_internal_refresh']
+
+    def test_internal_refresh_command(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        (tmp_path / '.cache').mkdir()
+        cli.api.get_fronters.return_value = [{'name': 'Bob'}]
+        with cache_home(tmp_path):
+            assert cli.cmd_internal_refresh() == 0
+            # The lock is released afterwards
+            assert cli.cmd_internal_refresh() == 0
+        assert cli.api.get_fronters.call_count == 2
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "[Bob] "
+
+    def test_unresolved_names_left_out(self, tmp_path):
+        cli = self._make_cli(tmp_path)
+        cli.cache.get_fronters.return_value = [
+            {'name': 'Alice'}, {'name': 'Unknown'}, {'name': None}, {'name': ''}, {},
+        ]
+        with cache_home(tmp_path):
+            SimplyPluralCLI.cmd_internal_update_status(cli)
+        assert (tmp_path / '.cache' / 'sp_status').read_text() == "[Alice] "
+
+class TestConfigEdit:
+    def _make_cli(self, tmp_path):
+        cli = make_mock_cli()
+        cli.config.config_file = tmp_path / "simplyplural.conf"
+        cli.config.config_file.write_text("[default]\n")
+        return cli
+
+    def test_uses_visual_before_editor(self, tmp_path, capsys):
+        cli = self._make_cli(tmp_path)
+        env = {'VISUAL': 'code -w', 'EDITOR': 'vi'}
+        with patch.dict(os.environ, env), \
+             patch("simplyplural.cli.subprocess.call") as call, \
+             patch("shutil.which") as which:
+            cli.cmd_config(edit=True)
+        call.assert_called_once_with(['code', '-w', str(cli.config.config_file)])
+        which.assert_not_called()
+
+    def test_falls_back_to_path_search(self, tmp_path, capsys):
+        cli = self._make_cli(tmp_path)
+        with patch.dict(os.environ, {'VISUAL': '', 'EDITOR': ''}), \
+             patch("simplyplural.cli.subprocess.call") as call, \
+             patch("shutil.which", side_effect=lambda e: e == 'vim'):
+            cli.cmd_config(edit=True)
+        call.assert_called_once_with(['vim', str(cli.config.config_file)])
+
+    def test_example_config(self, tmp_path, capsys):
+        cli = self._make_cli(tmp_path)
+        assert cli.cmd_config(example=True) == 0
+        out = capsys.readouterr().out
+        assert out.startswith("# Simply Plural CLI - Example Configuration File\n")
+        assert "\n[default]\n" in out and out.endswith("# Cache longer for stability\n")
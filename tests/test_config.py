@@ -94,5 +94,15 @@ class TestConfigManager:
         assert config_with_dir.cache_fronters_ttl == 900
         assert config_with_dir.cache_members_ttl == 3600
 
+    def test_default_retry_backoff(self, config_with_dir):
+        assert config_with_dir.retry_base_delay == 1.0
+        assert config_with_dir.retry_max_delay == 30
+
+    def test_cache_fsync_defaults_off(self, config_with_dir):
+        assert config_with_dir.cache_fsync is False
+
+    def test_cache_memory_max_default(self, config_with_dir):
+        assert config_with_dir.cache_memory_max == 512
+
     def test_start_daemon_defaults_true(self, config_with_dir):
         assert config_with_dir.start_daemon is True
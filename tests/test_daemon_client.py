@@ -0,0 +1,158 @@
+"""Tests for DaemonClient against a live UnixSocketServer"""
+
+import asyncio
+import json
+import os
+import socket
+import pytest
+from unittest.mock import MagicMock, patch
+
+from simplyplural.daemon import DaemonState, UnixSocketServer
+from simplyplural.daemon_client import DaemonClient, DaemonClientSync, _PRESERIALIZED, _fast_status_and_data
+from simplyplural.daemon_protocol import FRAME_HEADER_SIZE, PING_FRAME, CommandType, Request, Response, ResponseStatus
+from tests.conftest import MOCK_FRONTERS
+
+
+@pytest.fixture
+async def server():
+    profile = f"pytest-{os.getpid()}"
+    state = DaemonState(debug=False)
+    state.current_fronters = MOCK_FRONTERS
+    ws = MagicMock()
+    ws.get_status.return_value = {"connected": True}
+    srv = UnixSocketServer(f"/tmp/sp-daemon-{profile}.sock", state, ws)
+    await srv.start()
+    yield srv, profile
+    await srv.stop()
+
+
+class TestPreserialized:
+    def test_frames_decode_to_requests(self):
+        for command, frame in _PRESERIALIZED.items():
+            body = frame[FRAME_HEADER_SIZE:]
+            assert int.from_bytes(frame[:FRAME_HEADER_SIZE], "big") == len(body)
+            request = Request.from_dict(json.loads(body))
+            assert request.command == command
+            assert request.args == {}
+
+
+class TestFastParse:
+    def test_ok_response(self):
+        raw = Response.success("r1", {"fronters": MOCK_FRONTERS}).to_json_bytes()
+        assert _fast_status_and_data(raw) == (True, {"fronters": MOCK_FRONTERS}, None)
+
+    def test_error_response(self):
+        raw = Response.error("r1", "boom").to_json_bytes()
+        assert _fast_status_and_data(raw) == (False, None, "boom")
+
+    def test_rejects_non_object(self):
+        with pytest.raises(ValueError):
+            _fast_status_and_data(b"[]")
+
+
+class TestPersistentConnection:
+    async def test_requests_share_connection(self, server):
+        srv, profile = server
+        async with DaemonClient(profile) as client:
+            assert await client.ping()
+            writer = client._writer
+            fronters = await client.get_fronters()
+            assert fronters["fronters"] == MOCK_FRONTERS
+            assert client._writer is writer
+        assert srv.client_count == 1
+
+    async def test_reconnects_after_server_drops_connection(self, server):
+        srv, profile = server
+        async with DaemonClient(profile) as client:
+            assert await client.ping()
+            # Simulate the connection dropping between requests
+            client._writer.transport.abort()
+            assert await client.ping()
+        assert srv.client_count == 2
+
+    async def test_close_is_idempotent(self, server):
+        _, profile = server
+        client = DaemonClient(profile)
+        assert await client.ping()
+        await client.close()
+        await client.close()
+        assert client._writer is None
+
+
+class TestPing:
+    async def test_daemon_answers_empty_frame(self, server):
+        _, profile = server
+        async with DaemonClient(profile) as client:
+            assert await client._roundtrip(PING_FRAME) == [b""]
+            # JSON requests still work on the same connection afterwards
+            assert (await client.get_fronters())["fronters"] == MOCK_FRONTERS
+
+
+class TestBulk:
+    async def test_bulk_returns_responses_by_command(self, server):
+        srv, profile = server
+        async with DaemonClient(profile) as client:
+            results = await client.get_bulk([CommandType.FRONTING, CommandType.STATUS, CommandType.PING])
+        assert list(results) == [CommandType.FRONTING, CommandType.STATUS, CommandType.PING]
+        assert all(r.status == ResponseStatus.OK for r in results.values())
+        assert results[CommandType.FRONTING].data["fronters"] == MOCK_FRONTERS
+        assert results[CommandType.STATUS].data["websocket"] == {"connected": True}
+        assert srv.client_count == 1
+
+
+class TestDaemonClientSync:
+    async def test_reuses_loop_and_connection(self, server):
+        srv, profile = server
+        client = DaemonClientSync(profile)
+        try:
+            # Blocking calls from inside a running loop must not deadlock;
+            # run them in a worker thread so the server can respond
+            assert await asyncio.to_thread(client.ping)
+            loop = client._loop
+            status = await asyncio.to_thread(client.get_status)
+            assert status["websocket"] == {"connected": True}
+            assert client._loop is loop
+        finally:
+            await asyncio.to_thread(client.close)
+        assert client._loop is None
+        assert srv.client_count == 1
+
+
+class TestNoDaemon:
+    async def test_missing_socket_raises_connection_error(self):
+        client = DaemonClient(f"pytest-missing-{os.getpid()}")
+        with pytest.raises(ConnectionError, match="Daemon not running"):
+            await client.ping()
+
+
+class TestIsRunning:
+    async def test_probe_connection_is_reused(self, server):
+        srv, profile = server
+        async with DaemonClient(profile) as client:
+            assert client.is_running()
+            assert await client.ping()
+            assert client._probe_sock is None
+        assert srv.client_count == 1
+
+    def test_stale_socket_is_not_running(self, tmp_path):
+        client = DaemonClient(f"pytest-stale-{os.getpid()}")
+        # A socket file nobody is listening on, as left by a crashed daemon
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(client.socket_path)
+        stale.close()
+        try:
+            assert os.path.exists(client.socket_path)
+            assert not client.is_running()
+        finally:
+            os.unlink(client.socket_path)
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="SO_PEERCRED is Linux-only")
+class TestPeerCheck:
+    async def test_rejects_socket_owned_by_other_user(self, server):
+        _, profile = server
+        client = DaemonClient(profile)
+        with patch("simplyplural.daemon_client.os.getuid", return_value=os.getuid() + 1):
+            with pytest.raises(ConnectionError, match="owned by another user"):
+                await client.ping()
+        assert client._writer is None
@@ -34,6 +34,41 @@ class TestDaemonStateInit:
         assert "front001" in state_with_mock_api.front_history
         assert state_with_mock_api.last_update_times["front_history"] > 0
 
+    async def test_initialize_fetches_lists_concurrently_then_fronters(self, state_with_mock_api, mock_api):
+        import threading
+        barrier = threading.Barrier(2, timeout=5)
+        cache = state_with_mock_api.cache
+
+        def wait_for_other(result):
+            def fetch():
+                barrier.wait()  # Only passes if both lists are fetched at once
+                return result
+            return fetch
+
+        def get_fronters():
+            # Both lists are cached by now, so fronter names resolve from them
+            cache.set.assert_any_call('members', MOCK_MEMBERS)
+            cache.set.assert_any_call('custom_fronts', MOCK_CUSTOM_FRONTS)
+            return MOCK_FRONTERS
+
+        mock_api.get_members.side_effect = wait_for_other(MOCK_MEMBERS)
+        mock_api.get_custom_fronts.side_effect = wait_for_other(MOCK_CUSTOM_FRONTS)
+        mock_api.get_fronters.side_effect = get_fronters
+        await state_with_mock_api.initialize()
+        assert state_with_mock_api.current_fronters == MOCK_FRONTERS
+        assert len(state_with_mock_api.members) == 2
+
+    async def test_one_failed_fetch_keeps_the_others(self, state_with_mock_api, mock_api):
+        cached_custom_fronts = [{"id": "cf-cached", "content": {"name": "Cached"}}]
+        state_with_mock_api.cache.get.side_effect = (
+            lambda kind: cached_custom_fronts if kind == 'custom_fronts' else None)
+        mock_api.get_custom_fronts.side_effect = RuntimeError("boom")
+        await state_with_mock_api.initialize()
+        assert state_with_mock_api.current_fronters == MOCK_FRONTERS
+        assert len(state_with_mock_api.members) == 2
+        assert list(state_with_mock_api.custom_fronts) == ["cf-cached"]
+        state_with_mock_api.cache.get.assert_called_once_with('custom_fronts')
+
     async def test_initialize_no_api_no_cache(self, state):
         await state.initialize()
         assert state.current_fronters is None
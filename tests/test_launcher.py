@@ -0,0 +1,66 @@
+"""Tests for the sp entry point's prompt fast path"""
+
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+from simplyplural import launcher
+
+
+@pytest.fixture
+def status_file(tmp_path, monkeypatch):
+    path = tmp_path / "sp_status"
+    monkeypatch.setattr(launcher, "STATUS_FILE", str(path))
+    return path
+
+
+class TestReadPromptStatus:
+    def test_fresh_status_served(self, status_file):
+        status_file.write_text("[Alice, Bob] ")
+        assert launcher.read_prompt_status(["fronting", "--format=prompt"]) == "[Alice, Bob] "
+        assert launcher.read_prompt_status(["status"]) == "[Alice, Bob] "
+        assert launcher.read_prompt_status(["who", "--format", "prompt"]) == "[Alice, Bob] "
+
+    def test_other_commands_fall_back(self, status_file):
+        status_file.write_text("[Alice] ")
+        assert launcher.read_prompt_status(["fronting"]) == ""
+        assert launcher.read_prompt_status(["--profile", "other", "status"]) == ""
+
+    def test_stale_status_falls_back(self, status_file):
+        status_file.write_text("[Alice] ")
+        old = time.time() - launcher.PROMPT_STATUS_MAX_AGE - 10
+        os.utime(status_file, (old, old))
+        assert launcher.read_prompt_status(["status"]) == ""
+
+    def test_placeholder_falls_back(self, status_file):
+        status_file.write_text("(updating) ")
+        assert launcher.read_prompt_status(["status"]) == ""
+
+    def test_status_file_per_profile(self):
+        assert launcher.status_file_name("default") == "sp_status"
+        assert launcher.status_file_name("work") == "sp_status.work"
+        assert launcher.status_file_name("my/system") == "sp_status.my_system"
+
+    def test_refresh_lock_per_profile(self):
+        assert launcher.refresh_lock_name("default") == "sp_refresh.lock"
+        assert launcher.refresh_lock_name("my/system") == "sp_refresh.my_system.lock"
+
+    def test_missing_file_falls_back(self, status_file):
+        assert launcher.read_prompt_status(["status"]) == ""
+
+
+class TestMain:
+    def test_fast_path_skips_cli(self, status_file, capsys):
+        status_file.write_text("[Alice] ")
+        with patch("sys.argv", ["sp", "status"]), \
+             patch("simplyplural.cli.main") as cli_main:
+            assert launcher.main() == 0
+        cli_main.assert_not_called()
+        assert capsys.readouterr().out == "[Alice] \n"
+
+    def test_falls_back_to_cli(self, status_file):
+        with patch("sys.argv", ["sp", "members"]), \
+             patch("simplyplural.cli.main", return_value=0) as cli_main:
+            assert launcher.main() == 0
+        cli_main.assert_called_once()
@@ -1,6 +1,8 @@
 """Tests for daemon protocol serialization and data classes"""
 
+import asyncio
 import json
+import pytest
 from simplyplural.daemon_protocol import (
     Request,
     Response,
@@ -11,6 +13,9 @@ from simplyplural.daemon_protocol import (
     PROTOCOL_VERSION,
     WS_KEEPALIVE_INTERVAL,
     WS_KEEPALIVE_MESSAGE,
+    MAX_FRAME_SIZE,
+    encode_frame,
+    read_frame,
 )
 
 
@@ -37,6 +42,11 @@ class TestRequest:
         req = Request.create(CommandType.PING)
         assert req.args == {}
 
+    def test_json_bytes_matches_json(self):
+        req = Request.create(CommandType.SWITCH, args={"entities": ["Alice"]})
+        assert isinstance(req.to_json_bytes(), bytes)
+        assert json.loads(req.to_json_bytes()) == json.loads(req.to_json())
+
 
 class TestResponse:
     def test_success_response(self):
@@ -60,6 +70,33 @@ class TestResponse:
         assert restored.request_id == "req-456"
 
 
+class TestFraming:
+    def test_encode_frame_prefixes_length(self):
+        frame = encode_frame(b'{"a":1}')
+        assert frame[:4] == (7).to_bytes(4, 'big')
+        assert frame[4:] == b'{"a":1}'
+
+    async def test_read_frame_round_trip(self):
+        reader = asyncio.StreamReader()
+        payload = Response.success("req-1", {"big": "x" * 2_000_000}).to_json_bytes()
+        reader.feed_data(encode_frame(payload) + encode_frame(b'{}'))
+        assert await read_frame(reader) == payload
+        assert await read_frame(reader) == b'{}'
+
+    async def test_read_frame_eof_mid_frame(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data((10).to_bytes(4, 'big') + b'abc')
+        reader.feed_eof()
+        with pytest.raises(asyncio.IncompleteReadError):
+            await read_frame(reader)
+
+    async def test_read_frame_rejects_oversized(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data((MAX_FRAME_SIZE + 1).to_bytes(4, 'big'))
+        with pytest.raises(ValueError):
+            await read_frame(reader)
+
+
 class TestWSUpdateMessage:
     def test_parse_update_message(self):
         data = {
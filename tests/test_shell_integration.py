@@ -0,0 +1,79 @@
+"""Tests for ShellIntegrationManager"""
+
+import os
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+
+from simplyplural.shell_integration import (
+    ShellIntegrationManager, _detect_shell, _FALLBACK_SHELL_SCRIPT,
+)
+
+
+@pytest.fixture
+def shell(tmp_path):
+    return ShellIntegrationManager(SimpleNamespace(
+        config_dir=tmp_path, profile="default", shell_update_interval=60,
+    ))
+
+
+class TestGenerateIntegrationScript:
+    def test_writes_script(self, shell):
+        path = shell.generate_integration_script()
+        assert path == shell.get_script_path()
+        assert "_sp_prompt" in path.read_text()
+
+    def test_unchanged_script_not_rewritten(self, shell):
+        path = shell.generate_integration_script()
+        os.utime(path, (0, 0))
+        shell.generate_integration_script()
+        assert path.stat().st_mtime == 0
+
+    def test_changed_script_rewritten(self, shell):
+        path = shell.generate_integration_script()
+        path.write_text("stale")
+        shell.generate_integration_script()
+        assert "_sp_prompt" in path.read_text()
+
+    def test_fallback_matches_template(self):
+        template = Path(__file__).resolve().parents[1] / "shell_template.sh"
+        assert _FALLBACK_SHELL_SCRIPT == template.read_text()
+
+    def test_status_read_without_subshell(self, shell):
+        script = shell.generate_integration_script().read_text()
+        assert 'IFS= read -r SP_STATUS' in script
+        assert '$(cat' not in script
+
+    def test_interval_and_profile_filled_in(self, tmp_path):
+        shell = ShellIntegrationManager(SimpleNamespace(
+            config_dir=tmp_path, profile="my system", shell_update_interval=120,
+        ))
+        script = shell.generate_integration_script().read_text()
+        assert "SP_REFRESH_INTERVAL=${SP_REFRESH_INTERVAL:-120}" in script
+        assert "_SP_PROFILE='my system'" in script
+        assert '_SP_STATUS_FILE="$HOME/.cache/"sp_status.my_system' in script
+        assert "@" not in script
+
+
+class TestInstallationInstructions:
+    @pytest.fixture(autouse=True)
+    def _reset_shell_cache(self):
+        _detect_shell.cache_clear()
+        yield
+        _detect_shell.cache_clear()
+
+    def test_bash(self, shell, monkeypatch):
+        monkeypatch.setenv("SHELL", "/bin/bash")
+        text = shell.get_installation_instructions(shell.get_script_path())
+        assert f"echo 'source {shell.get_script_path()}' >> ~/.bashrc" in text
+        assert "older than 60s" in text
+
+    def test_unknown_shell(self, shell, monkeypatch):
+        monkeypatch.setenv("SHELL", "/bin/tcsh")
+        text = shell.get_installation_instructions(shell.get_script_path())
+        assert "your shell config file" in text
+
+    def test_fish(self, shell, monkeypatch):
+        monkeypatch.setenv("SHELL", "/usr/bin/fish")
+        text = shell.get_installation_instructions(shell.get_script_path())
+        assert text.startswith("Fish shell detected")